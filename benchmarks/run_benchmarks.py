@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Generator Benchmarks
+Runs MultiSpecWireMockGenerator end to end and stage by stage over synthetic specs, reports
+specs/sec, mappings/sec, bytes written and peak RSS, and saves the results as JSON so runs can
+be compared across versions
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Add the project root to the path so the benchmarks run from a checkout
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_specs import write_specs
+from src.core.multi_spec_wiremock_generator import MultiSpecWireMockGenerator, GENERATOR_VERSION
+
+# Named workloads: spec shape plus generator options
+SCENARIOS = {
+    'small': {
+        'specs': 3, 'shape': {'paths': 10, 'operations_per_path': 3, 'schema_depth': 2, 'fan_out': 4},
+        'options': {}
+    },
+    'many-specs': {
+        'specs': 16, 'shape': {'paths': 10, 'operations_per_path': 4, 'schema_depth': 2, 'fan_out': 5},
+        'options': {'workers': 4}
+    },
+    'large-spec': {
+        'specs': 1, 'shape': {'paths': 150, 'operations_per_path': 5, 'schema_depth': 3, 'fan_out': 6,
+                              'target_bytes': 2 * 1024 * 1024},
+        'options': {}
+    },
+    'deep-refs': {
+        'specs': 2, 'shape': {'paths': 40, 'operations_per_path': 3, 'schema_depth': 6, 'fan_out': 6,
+                              'ref_density': 0.6, 'shared_schemas': 40},
+        'options': {}
+    },
+    'lean-output': {
+        'specs': 6, 'shape': {'paths': 30, 'operations_per_path': 4, 'schema_depth': 3, 'fan_out': 5},
+        'options': {'status_policy': 'declared', 'dedupe_bodies': True, 'output_profile': 'compact',
+                    'streaming': True}
+    }
+}
+
+# Throughput metrics compared against a baseline (higher is better)
+COMPARED_METRICS = ['specs_per_sec', 'mappings_per_sec']
+
+
+def peak_rss_kb(who: int = resource.RUSAGE_SELF) -> int:
+    """Peak resident set size in KiB (ru_maxrss is bytes on macOS, KiB elsewhere)"""
+    peak = resource.getrusage(who).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def directory_size(directory: str) -> Dict[str, int]:
+    """Number of files and total bytes below a directory"""
+    files = 0
+    total = 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            files += 1
+            total += os.path.getsize(os.path.join(root, name))
+    return {'files': files, 'bytes': total}
+
+
+def run_stages(spec_dir: str, output_dir: str, options: Dict[str, Any]) -> Dict[str, float]:
+    """Time discovery, parsing, mapping construction and writing separately on a fresh generator"""
+    generator = MultiSpecWireMockGenerator(spec_dir, output_dir, **options)
+    stages = {}
+
+    started = time.perf_counter()
+    specs = generator.discover_specs()
+    stages['discover'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for spec_info in specs:
+        generator.registry.document(spec_info['file'])
+    stages['parse'] = time.perf_counter() - started
+
+    build_time = 0.0
+    write_time = 0.0
+    for spec_info in specs:
+        started = time.perf_counter()
+        method_mappings = generator.process_api_spec(spec_info)
+        build_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        generator.write_consolidated_mappings(spec_info['api_name'], method_mappings)
+        generator.writer.flush()
+        write_time += time.perf_counter() - started
+
+    generator.writer.close()
+    # Building includes queueing response bodies; writing covers mapping files and draining the queue
+    stages['build'] = build_time
+    stages['write'] = write_time
+    return stages
+
+
+def run_scenario(name: str, scenario: Dict[str, Any], work_dir: str, seed: int) -> Dict[str, Any]:
+    """Generate the scenario's specs and benchmark the generator over them"""
+    spec_dir = os.path.join(work_dir, 'specs')
+    spec_files = write_specs(spec_dir, scenario['specs'], seed=seed, **scenario['shape'])
+    spec_bytes = sum(os.path.getsize(spec_file) for spec_file in spec_files)
+
+    options = dict(scenario['options'])
+    # Byte-identical output across runs keeps bytes_written comparable
+    options.setdefault('deterministic', True)
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        end_to_end_dir = os.path.join(work_dir, 'output')
+        started = time.perf_counter()
+        summary = MultiSpecWireMockGenerator(spec_dir, end_to_end_dir, **options).generate_all_mappings()
+        elapsed = time.perf_counter() - started
+        written = directory_size(end_to_end_dir)
+
+        stage_options = {key: value for key, value in options.items() if key not in ('workers', 'streaming')}
+        stages = run_stages(spec_dir, os.path.join(work_dir, 'stages'), stage_options)
+
+    errors = [spec['error'] for spec in summary['specs'] if spec['error']]
+    return {
+        'name': name,
+        'shape': scenario['shape'],
+        'options': options,
+        'specs': len(spec_files),
+        'spec_bytes': spec_bytes,
+        'mappings': summary['total_mappings'],
+        'errors': errors,
+        'seconds': round(elapsed, 4),
+        'specs_per_sec': round(len(spec_files) / elapsed, 2) if elapsed else None,
+        'mappings_per_sec': round(summary['total_mappings'] / elapsed, 1) if elapsed else None,
+        'bytes_written': written['bytes'],
+        'files_written': written['files'],
+        'peak_rss_kb': peak_rss_kb(),
+        'peak_worker_rss_kb': peak_rss_kb(resource.RUSAGE_CHILDREN),
+        'stages': {stage: round(seconds, 4) for stage, seconds in stages.items()}
+    }
+
+
+def _scenario_process(name: str, scenario: Dict[str, Any], seed: int, results):
+    work_dir = tempfile.mkdtemp(prefix=f"wiremock-bench-{name}-")
+    try:
+        results.put(run_scenario(name, scenario, work_dir, seed))
+    except Exception as e:
+        results.put({'name': name, 'error': str(e)})
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def run_isolated(name: str, scenario: Dict[str, Any], seed: int) -> Dict[str, Any]:
+    """Run a scenario in a fresh process so peak RSS belongs to that scenario alone"""
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=_scenario_process, args=(name, scenario, seed, results))
+    process.start()
+    try:
+        while True:
+            try:
+                return results.get(timeout=1)
+            except queue.Empty:
+                if not process.is_alive():
+                    # Killed before reporting, e.g. by the OOM killer
+                    return {'name': name, 'error': f"benchmark process exited with code {process.exitcode}"}
+    finally:
+        process.join()
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """Print throughput changes against a baseline and return the regressions beyond the threshold"""
+    baseline_scenarios = {scenario['name']: scenario for scenario in baseline.get('scenarios', [])}
+    regressions = []
+
+    print(f"\n📈 Compared to baseline ({baseline.get('generator_version')}, {baseline.get('timestamp')})")
+    for result in results:
+        previous = baseline_scenarios.get(result['name'])
+        if not previous or 'error' in result or 'error' in previous:
+            continue
+        for metric in COMPARED_METRICS:
+            if not previous.get(metric) or not result.get(metric):
+                continue
+            change = result[metric] / previous[metric] - 1
+            print(f"  {result['name']:<12} {metric:<17} {previous[metric]:>10} -> {result[metric]:>10} ({change:+.1%})")
+            if change < -max_regression:
+                regressions.append(f"{result['name']} {metric} {change:+.1%}")
+
+    return regressions
+
+
+def print_result(result: Dict[str, Any]):
+    if 'error' in result:
+        print(f"❌ {result['name']}: {result['error']}")
+        return
+    stages = ', '.join(f"{stage} {seconds:.3f}s" for stage, seconds in result['stages'].items())
+    print(f"✓ {result['name']:<12} {result['specs']:>3} specs, {result['mappings']:>6} mappings in {result['seconds']:.3f}s "
+          f"| {result['specs_per_sec']} specs/s, {result['mappings_per_sec']} mappings/s "
+          f"| {result['bytes_written']:,} bytes | peak RSS {result['peak_rss_kb'] // 1024} MiB")
+    print(f"  stages: {stages}")
+    for error in result['errors']:
+        print(f"  ❌ {error}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the WireMock mapping generator')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='Scenario to run (repeatable; default: all)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic specs')
+    parser.add_argument('--output', metavar='FILE', help='Write the results as JSON')
+    parser.add_argument('--baseline', metavar='FILE', help='Compare with the results of an earlier run')
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help='Fail when throughput drops by more than this fraction of the baseline')
+    args = parser.parse_args(argv)
+
+    print("⏱️  WireMock Generator Benchmarks")
+    print("=" * 60)
+
+    results = []
+    for name in args.scenario or list(SCENARIOS):
+        result = run_isolated(name, SCENARIOS[name], args.seed)
+        print_result(result)
+        results.append(result)
+
+    report = {
+        'generator_version': GENERATOR_VERSION,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': args.seed,
+        'scenarios': results
+    }
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📁 Results saved to {args.output}")
+
+    failed = any('error' in result or result['errors'] for result in results)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print(f"\n❌ Throughput regressions beyond {args.max_regression:.0%}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
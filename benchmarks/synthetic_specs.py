@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Synthetic OpenAPI Spec Generator
+Builds reproducible OpenAPI 3 specs of tunable size and shape for benchmarking the mapping
+generator: number of paths, operations per path, schema depth, object fan-out, $ref density
+and padding towards a target file size
+"""
+
+import argparse
+import json
+import os
+import random
+from typing import Any, Dict, List
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+# Methods assigned to a path, in this order, up to operations_per_path
+METHODS = ['get', 'post', 'put', 'patch', 'delete']
+
+# Status codes a synthetic operation declares, by method
+DECLARED_RESPONSES = {
+    'get': ['200', '404'],
+    'post': ['201', '400'],
+    'put': ['200', '404'],
+    'patch': ['200', '404'],
+    'delete': ['204', '404']
+}
+
+# Chance that a property which isn't a $ref is a nested object (or array of objects)
+NESTED_OBJECT_PROBABILITY = 0.2
+
+LEAF_SCHEMAS = [
+    {'type': 'string'},
+    {'type': 'string', 'format': 'uuid'},
+    {'type': 'string', 'format': 'date-time'},
+    {'type': 'string', 'format': 'email'},
+    {'type': 'string', 'enum': ['ACTIVE', 'INACTIVE', 'PENDING']},
+    {'type': 'integer', 'minimum': 0, 'maximum': 500},
+    {'type': 'number'},
+    {'type': 'boolean'}
+]
+
+
+class SyntheticSpecBuilder:
+    """Build one synthetic spec from shape parameters; the same seed always yields the same spec"""
+
+    def __init__(self, paths: int = 20, operations_per_path: int = 3, schema_depth: int = 3,
+                 fan_out: int = 5, ref_density: float = 0.3, shared_schemas: int = 10,
+                 target_bytes: int = 0, seed: int = 0):
+        self.paths = paths
+        self.operations_per_path = max(1, min(operations_per_path, len(METHODS)))
+        self.schema_depth = schema_depth
+        self.fan_out = fan_out
+        self.ref_density = ref_density
+        self.shared_schemas = shared_schemas
+        self.target_bytes = target_bytes
+        self.random = random.Random(seed)
+
+    def build(self, title: str) -> Dict[str, Any]:
+        """Build a complete OpenAPI document"""
+        schemas = {}
+        # Shared components are built first so operations can reference them. The first half are
+        # self-contained and the second half may reference the first, which bounds how deep a
+        # chain of $refs gets (as in real specs, where examples stay a manageable size)
+        base_schemas = (self.shared_schemas + 1) // 2
+        for index in range(self.shared_schemas):
+            available_refs = 0 if index < base_schemas else base_schemas
+            schemas[f"Model{index}"] = self._object_schema(self.schema_depth, available_refs)
+
+        paths = {}
+        for index in range(self.paths):
+            resource = f"resource{index}"
+            methods = METHODS[:self.operations_per_path]
+            collection_methods = [method for method in methods if method in ('get', 'post')]
+            item_methods = [method for method in methods if method not in ('get', 'post')]
+
+            if collection_methods:
+                paths[f"/{resource}"] = {
+                    method: self._operation(resource, method, item=False) for method in collection_methods
+                }
+            if item_methods:
+                paths[f"/{resource}/{{{resource}Id}}"] = {
+                    method: self._operation(resource, method, item=True) for method in item_methods
+                }
+
+        spec = {
+            'openapi': '3.0.0',
+            'info': {'title': title, 'version': '1.0.0', 'description': 'Synthetic benchmark specification'},
+            'paths': paths,
+            'components': {'schemas': schemas}
+        }
+        self._pad(spec)
+        return spec
+
+    def _schema_ref(self, available_refs: int) -> Dict[str, Any]:
+        return {'$ref': f"#/components/schemas/Model{self.random.randrange(available_refs)}"}
+
+    def _object_schema(self, depth: int, available_refs: int) -> Dict[str, Any]:
+        properties = {}
+        for index in range(self.fan_out):
+            name = f"field{index}"
+            if available_refs and self.random.random() < self.ref_density:
+                properties[name] = self._schema_ref(available_refs)
+            elif depth > 0 and self.random.random() < NESTED_OBJECT_PROBABILITY:
+                nested = self._object_schema(depth - 1, available_refs)
+                properties[name] = {'type': 'array', 'items': nested} if self.random.random() < 0.3 else nested
+            else:
+                properties[name] = dict(self.random.choice(LEAF_SCHEMAS))
+        properties['id'] = {'type': 'string'}
+        return {'type': 'object', 'properties': properties}
+
+    def _body_schema(self) -> Dict[str, Any]:
+        if self.shared_schemas and self.random.random() < max(self.ref_density, 0.5):
+            return self._schema_ref(self.shared_schemas)
+        return self._object_schema(self.schema_depth, self.shared_schemas)
+
+    def _operation(self, resource: str, method: str, item: bool) -> Dict[str, Any]:
+        operation = {
+            'operationId': f"{method}{resource.capitalize()}{'ById' if item else ''}",
+            'summary': f"{method.upper()} {resource}",
+            'tags': [resource],
+            'responses': {}
+        }
+
+        if item:
+            operation['parameters'] = [{
+                'name': f"{resource}Id", 'in': 'path', 'required': True,
+                'schema': {'type': 'string', 'format': 'uuid'}
+            }]
+        if method in ('post', 'put', 'patch'):
+            operation['requestBody'] = {'content': {'application/json': {'schema': self._body_schema()}}}
+
+        for status in DECLARED_RESPONSES[method]:
+            response = {'description': f"Status {status}"}
+            if status.startswith('2') and status != '204':
+                schema = self._body_schema()
+                if method == 'get' and not item:
+                    schema = {'type': 'array', 'items': schema}
+                response['content'] = {'application/json': {'schema': schema}}
+            operation['responses'][status] = response
+
+        return operation
+
+    def _pad(self, spec: Dict[str, Any]):
+        """Grow the spec with operation descriptions until it reaches the target size"""
+        if not self.target_bytes:
+            return
+        missing = self.target_bytes - len(json.dumps(spec))
+        operations = [operation for path_item in spec['paths'].values() for operation in path_item.values()]
+        if missing <= 0 or not operations:
+            return
+        per_operation = missing // len(operations) + 1
+        for operation in operations:
+            operation['description'] = ('Lorem ipsum dolor sit amet. ' * (per_operation // 28 + 1))[:per_operation]
+
+
+def write_specs(output_dir: str, count: int = 1, file_format: str = 'yaml', **shape) -> List[str]:
+    """Write count synthetic specs to output_dir and return their paths"""
+    if file_format == 'yaml' and not HAS_YAML:
+        file_format = 'json'
+
+    os.makedirs(output_dir, exist_ok=True)
+    seed = shape.pop('seed', 0)
+    spec_files = []
+
+    for index in range(count):
+        builder = SyntheticSpecBuilder(seed=seed + index, **shape)
+        spec = builder.build(f"Synthetic Service {index}")
+        spec_file = os.path.join(output_dir, f"synthetic-{index:03d}-api.{file_format}")
+        with open(spec_file, 'w') as f:
+            if file_format == 'yaml':
+                yaml.safe_dump(spec, f, sort_keys=False)
+            else:
+                json.dump(spec, f, indent=2)
+        spec_files.append(spec_file)
+
+    return spec_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic OpenAPI specs for benchmarking')
+    parser.add_argument('output_dir', help='Directory to write the specs to')
+    parser.add_argument('--specs', type=int, default=1, help='Number of specs')
+    parser.add_argument('--paths', type=int, default=20, help='Resources per spec')
+    parser.add_argument('--operations-per-path', type=int, default=3, help='Operations per resource (1-5)')
+    parser.add_argument('--schema-depth', type=int, default=3, help='Nesting depth of object schemas')
+    parser.add_argument('--fan-out', type=int, default=5, help='Properties per object schema')
+    parser.add_argument('--ref-density', type=float, default=0.3, help='Share of properties that are $refs (0-1)')
+    parser.add_argument('--shared-schemas', type=int, default=10, help='Reusable component schemas per spec')
+    parser.add_argument('--target-bytes', type=int, default=0, help='Pad each spec to about this many bytes')
+    parser.add_argument('--format', choices=['yaml', 'json'], default='yaml', help='Spec file format')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    spec_files = write_specs(args.output_dir, args.specs, args.format, paths=args.paths,
+                             operations_per_path=args.operations_per_path, schema_depth=args.schema_depth,
+                             fan_out=args.fan_out, ref_density=args.ref_density,
+                             shared_schemas=args.shared_schemas, target_bytes=args.target_bytes, seed=args.seed)
+    print(f"✓ Wrote {len(spec_files)} synthetic specs to {args.output_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,5 +6,19 @@ and Java code from OpenAPI specifications.
 """
 
 from .multi_spec_wiremock_generator import MultiSpecWireMockGenerator, JavaWireMockGenerator
+from .json_serializer import JsonSerializer
+from .output_writer import OutputWriter, OutputWriteError
+from .output_backend import DiskBackend, MemoryBackend
+from .spec_loader import SpecCache, load_spec
+from .spec_registry import SpecRegistry
+from .status_policy import StatusPolicy
+from .profiling import Profiler
+from .wiremock_admin import WireMockAdminClient, WireMockAdminError, CircuitBreaker
+from .wiremock_push import MappingPusher, push_output
+from .spec_watcher import SpecWatcher
 
-__all__ = ['MultiSpecWireMockGenerator', 'JavaWireMockGenerator']
+__all__ = ['MultiSpecWireMockGenerator', 'JavaWireMockGenerator', 'OutputWriter', 'OutputWriteError',
+           'DiskBackend', 'MemoryBackend',
+           'SpecCache', 'load_spec', 'SpecRegistry', 'JsonSerializer',
+           'StatusPolicy', 'Profiler', 'WireMockAdminClient', 'WireMockAdminError', 'CircuitBreaker',
+           'MappingPusher', 'push_output', 'SpecWatcher']
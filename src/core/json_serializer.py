@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+JSON Serializer
+Pluggable serializer for generated mappings and response files: pretty (indent=2, the default)
+or compact output, optionally backed by orjson when it is installed
+"""
+
+import json
+from typing import Any
+
+# Try to import orjson, but make it optional
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Output profiles
+OUTPUT_PROFILES = ['pretty', 'compact']
+
+
+class JsonSerializer:
+    """Serialize generated documents according to an output profile"""
+
+    def __init__(self, profile: str = 'pretty', fast: bool = False):
+        if profile not in OUTPUT_PROFILES:
+            raise ValueError(f"Unknown output profile '{profile}', expected one of {OUTPUT_PROFILES}")
+        self.profile = profile
+        self.compact = profile == 'compact'
+        # Fall back to the stdlib encoder when orjson is not available
+        self.fast = fast and HAS_ORJSON
+
+        if self.fast:
+            options = orjson.OPT_NON_STR_KEYS
+            if not self.compact:
+                options |= orjson.OPT_INDENT_2
+            self._orjson_options = options
+
+    @property
+    def backend(self) -> str:
+        """Name of the encoder in use"""
+        return 'orjson' if self.fast else 'json'
+
+    def dumps(self, obj: Any) -> str:
+        """Serialize a document to text"""
+        if self.fast:
+            return orjson.dumps(obj, option=self._orjson_options).decode('utf-8')
+        if self.compact:
+            return json.dumps(obj, separators=(',', ':'))
+        return json.dumps(obj, indent=2)
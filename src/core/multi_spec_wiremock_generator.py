@@ -5,32 +5,160 @@ Converts multiple OpenAPI specifications to consolidated WireMock stub mappings
 Includes Java code generation for Spring Boot and JUnit integration
 """
 
+import io
 import json
+import hashlib
 import sys
 import os
 import re
 import uuid
+import random
 import argparse
+import http
+import contextlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-import glob
+from typing import Callable, Dict, Any, List, Optional, Iterator, Tuple
 from datetime import datetime
 
-# Try to import yaml, but make it optional
 try:
-    import yaml
-    HAS_YAML = True
+    from src import __version__ as GENERATOR_VERSION
 except ImportError:
-    HAS_YAML = False
+    GENERATOR_VERSION = "unknown"
+
+try:
+    from .output_backend import DiskBackend
+    from .output_writer import OutputWriter
+    from .spec_loader import SpecCache, load_spec, HAS_YAML
+    from .spec_registry import SpecRegistry, build_component_index
+    from .json_serializer import JsonSerializer, OUTPUT_PROFILES
+    from .status_policy import StatusPolicy, STATUS_POLICIES, parse_status_codes
+    from .profiling import Profiler
+    from .spec_watcher import watch_specs, default_wiremock_url
+except ImportError:
+    # Executed as a standalone script
+    from output_backend import DiskBackend
+    from output_writer import OutputWriter
+    from spec_loader import SpecCache, load_spec, HAS_YAML
+    from spec_registry import SpecRegistry, build_component_index
+    from json_serializer import JsonSerializer, OUTPUT_PROFILES
+    from status_policy import StatusPolicy, STATUS_POLICIES, parse_status_codes
+    from profiling import Profiler
+    from spec_watcher import watch_specs, default_wiremock_url
+
+# Incremental-mode manifest, stored at the root of the output directory
+MANIFEST_FILENAME = '.wiremock-manifest.json'
+
+# URL matcher strategies:
+#   regex    - urlPathPattern with [^/]+ for every path parameter (legacy behaviour)
+#   template - urlPath for static paths, urlPathTemplate (+ typed pathParameters) otherwise
+#   typed    - urlPath for static paths, urlPathPattern built from the parameter schemas otherwise
+MATCHER_STRATEGIES = ['regex', 'template', 'typed']
+
+# Default pattern for a path segment WireMock has to match with a regex
+ANY_SEGMENT_PATTERN = '[^/]+'
+
+# How a request selects a non-default scenario:
+#   body-deep  - regex over every body value for POST/PUT/PATCH, header otherwise (legacy behaviour)
+#   header     - X-Test-Scenario header only
+#   query      - ?scenario=<id> query parameter
+#   body-field - top-level testScenario body field for POST/PUT/PATCH, header otherwise
+SCENARIO_SELECTIONS = ['body-deep', 'header', 'query', 'body-field']
+SCENARIO_HEADER = 'X-Test-Scenario'
+SCENARIO_QUERY_PARAM = 'scenario'
+SCENARIO_BODY_FIELD = 'testScenario'
+
+class GenerationCancelled(Exception):
+    """Raised when a generation run is cancelled through its cancel event"""
+
+
+# Namespace of the name-based (uuid5) mapping ids emitted in deterministic mode
+MAPPING_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'https://github.com/jshubham1/wiremock-mapping-generator')
+
+
+def _generate_spec_in_worker(generator: 'MultiSpecWireMockGenerator', spec_info: Dict[str, str]) -> Dict[str, Any]:
+    """Process pool entry point: generate one spec and capture its console output"""
+    buffer = io.StringIO()
+    # Record only this spec; the parent merges the snapshot into its own profile
+    generator.profiler.reset()
+    with contextlib.redirect_stdout(buffer):
+        result = generator.generate_spec_mappings(spec_info)
+    result['output'] = buffer.getvalue()
+    result['profile'] = generator.profiler.snapshot() if generator.profiler.enabled else None
+    return result
 
 
 class MultiSpecWireMockGenerator:
-    def __init__(self, spec_dir: str, output_dir: str):
+    def __init__(self, spec_dir: str, output_dir: str, workers: int = 1, incremental: bool = False,
+                 dedupe_bodies: bool = False, writer_threads: int = 4, streaming: bool = False,
+                 spec_cache_dir: Optional[str] = None, matcher_strategy: str = 'regex',
+                 scenario_selection: str = 'body-deep', match_accept_header: bool = True,
+                 output_profile: str = 'pretty', fast_json: bool = False, deterministic: bool = False,
+                 seed: int = 0, status_policy: str = 'full', status_extras: Optional[List[int]] = None,
+                 status_config: Optional[str] = None, profiler: Optional[Profiler] = None,
+                 output_backend: Optional[DiskBackend] = None):
         self.spec_dir = spec_dir
         self.output_dir = output_dir
         self.mappings_dir = os.path.join(output_dir, 'mappings')
         self.files_dir = os.path.join(output_dir, '__files')
         
+        # Where generated files go: disk, or a MemoryBackend rooted at output_dir
+        self.output = output_backend or DiskBackend(output_dir)
+        
+        # Number of worker processes for multi-spec generation (0 or less = all CPUs)
+        self.workers = workers if workers and workers > 0 else (os.cpu_count() or 1)
+        if not self.output.on_disk:
+            # Worker processes couldn't write into this process's memory
+            self.workers = 1
+        
+        # Skip specs whose content and generation options are unchanged since the last run
+        if incremental and not self.output.on_disk:
+            raise ValueError("Incremental mode needs an on-disk output (it keeps a manifest next to the files)")
+        self.incremental = incremental
+        self.manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+        self._emitted_files = []
+        
+        # File writes are queued to a bounded writer pool (0 threads = write synchronously)
+        self.writer = OutputWriter(threads=writer_threads, backend=self.output)
+        
+        # Pretty (indent=2) or compact JSON output, optionally encoded with orjson
+        self.serializer = JsonSerializer(output_profile, fast=fast_json)
+        
+        # Persistent cache of parsed specs (falls back to the WIREMOCK_SPEC_CACHE_DIR environment variable)
+        spec_cache_dir = spec_cache_dir or os.environ.get('WIREMOCK_SPEC_CACHE_DIR')
+        self.spec_cache = SpecCache(spec_cache_dir) if spec_cache_dir else None
+        
+        # How request URLs are matched (see MATCHER_STRATEGIES)
+        if matcher_strategy not in MATCHER_STRATEGIES:
+            raise ValueError(f"Unknown matcher strategy '{matcher_strategy}', expected one of {MATCHER_STRATEGIES}")
+        self.matcher_strategy = matcher_strategy
+        
+        # How requests select a scenario (see SCENARIO_SELECTIONS) and whether to require Accept: json
+        if scenario_selection not in SCENARIO_SELECTIONS:
+            raise ValueError(f"Unknown scenario selection '{scenario_selection}', expected one of {SCENARIO_SELECTIONS}")
+        self.scenario_selection = scenario_selection
+        self.match_accept_header = match_accept_header
+        
+        # Deterministic mode: stable mapping ids and seeded example values, so unchanged
+        # inputs always produce byte-identical output
+        self.deterministic = deterministic
+        self.seed = seed
+        self._random = random.Random(seed)
+        
+        # Discovers specs once and parses each file at most once per run
+        self.registry = SpecRegistry(spec_dir, self.load_spec_file)
+        
+        # Stream mappings to disk as operations are processed instead of building them all in memory
+        self.streaming = streaming
+        
+        # Write identical response bodies once under a content-addressed __files name
+        self.dedupe_bodies = dedupe_bodies
+        self._written_bodies = set()
+        self.dedupe_stats = self._empty_dedupe_stats()
+        # Status matrix entries the status policy left out, counted per operation
+        self._stubs_saved = 0
+        
         # Define comprehensive status codes with scenarios
         self.status_codes = {
             200: {"name": "Success", "scenario": "success"},
@@ -55,27 +183,42 @@ class MultiSpecWireMockGenerator:
             503: "service_unavailable"
         }
         
-    def discover_specs(self) -> List[Dict[str, str]]:
-        """Discover all OpenAPI spec files in the spec directory"""
-        specs = []
+        # Which of the status codes above get a mapping for each operation (see STATUS_POLICIES)
+        if status_config:
+            self.status_policy = StatusPolicy.from_file(status_config, status_policy, status_extras)
+        else:
+            self.status_policy = StatusPolicy(status_policy, status_extras)
         
-        # Look for common spec file patterns
-        patterns = ['*.yaml', '*.yml', '*.json']
+        # Stage timers and counters (disabled unless a profiler is passed in)
+        self.profiler = profiler or Profiler()
         
-        for pattern in patterns:
-            for spec_file in glob.glob(os.path.join(self.spec_dir, pattern)):
-                api_name = self.extract_api_name(spec_file)
-                specs.append({
-                    'file': spec_file,
-                    'api_name': api_name,
-                    'filename': os.path.basename(spec_file)
-                })
-                
-        print(f"✓ Discovered {len(specs)} API specifications")
-        for spec in specs:
-            print(f"  - {spec['api_name']}: {spec['filename']}")
-            
-        return specs
+        # Per-spec schema resolution state (rebuilt whenever a spec is loaded)
+        self.current_spec = None
+        self.component_index = {}
+        self._example_cache = {}
+        self._active_refs = {}
+        self._lowest_cycle_cut = float('inf')
+        
+        # Safety net for pathologically deep inline schemas; $ref cycles are detected explicitly
+        self.max_schema_depth = 64
+        
+        # Set for the duration of a cancellable run (see generate_all_mappings)
+        self._cancel_event = None
+    
+    def __getstate__(self):
+        # Events hold locks and can't be sent to worker processes; workers are cancelled by the parent
+        state = self.__dict__.copy()
+        state['_cancel_event'] = None
+        return state
+    
+    def check_cancelled(self):
+        """Abort the current run if its cancel event was set"""
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            raise GenerationCancelled("Generation cancelled")
+        
+    def discover_specs(self, refresh: bool = False) -> List[Dict[str, str]]:
+        """Discover all OpenAPI spec files in the spec directory (cached until refreshed)"""
+        return self.registry.discover(self.extract_api_name, refresh=refresh)
     
     def extract_api_name(self, spec_file: str) -> str:
         """Extract API name from spec file name or content"""
@@ -92,7 +235,7 @@ class MultiSpecWireMockGenerator:
         # If still generic, try to extract from file content
         if api_name in ['api', 'spec', 'openapi', 'swagger', '']:
             try:
-                spec_content = self.load_spec_file(spec_file)
+                spec_content = self.registry.document(spec_file)
                 if 'info' in spec_content and 'title' in spec_content['info']:
                     title = spec_content['info']['title']
                     api_name = self.sanitize_filename(title).lower()
@@ -104,16 +247,9 @@ class MultiSpecWireMockGenerator:
     def load_spec_file(self, spec_file: str) -> Dict[str, Any]:
         """Load OpenAPI specification from file"""
         try:
-            with open(spec_file, 'r') as f:
-                content = f.read()
-                # Try JSON first, then YAML if available
-                try:
-                    return json.loads(content)
-                except json.JSONDecodeError:
-                    if HAS_YAML:
-                        return yaml.safe_load(content)
-                    else:
-                        raise Exception("File is not valid JSON and YAML module is not available")
+            # Parser is picked from the file extension; cached parses skip parsing entirely
+            with self.profiler.stage('load_spec'):
+                return load_spec(spec_file, self.spec_cache)
         except Exception as e:
             raise Exception(f"Failed to load OpenAPI spec {spec_file}: {e}")
     
@@ -121,19 +257,47 @@ class MultiSpecWireMockGenerator:
         """Convert text to valid filename"""
         return re.sub(r'[^a-zA-Z0-9_]', '_', text).strip('_')
     
+    def build_component_index(self, spec: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Index every reusable component of a spec by its local $ref pointer"""
+        return build_component_index(spec)
+    
+    def set_current_spec(self, spec: Optional[Dict[str, Any]], component_index: Optional[Dict[str, Any]] = None):
+        """Make a spec current for schema resolution and reset per-spec caches"""
+        self.current_spec = spec
+        if component_index is None:
+            component_index = self.build_component_index(spec) if spec else {}
+        self.component_index = component_index
+        self._example_cache = {}
+        self._active_refs = {}
+        self._lowest_cycle_cut = float('inf')
+    
+    def reset_value_generator(self, api_name: str):
+        """Reseed example values per API so results don't depend on which specs ran before"""
+        self._random.seed(f"{self.seed}:{api_name}")
+    
+    def new_uuid(self) -> uuid.UUID:
+        """Random UUID for example data, drawn from the seeded generator in deterministic mode"""
+        if self.deterministic:
+            return uuid.UUID(int=self._random.getrandbits(128), version=4)
+        return uuid.uuid4()
+    
+    def mapping_id(self, api_name: str, operation_id: str, method: str, path: str, status_code: int) -> str:
+        """Mapping id: name-based and stable across runs in deterministic mode, random otherwise"""
+        if self.deterministic:
+            return str(uuid.uuid5(MAPPING_ID_NAMESPACE, f"{api_name}:{operation_id}:{method}:{path}:{status_code}"))
+        return str(uuid.uuid4())
+    
     def generate_from_schema(self, schema: Dict[str, Any], depth: int = 0, property_name: str = None) -> Any:
         """Generate example data from JSON schema with enhanced spec awareness"""
-        if depth > 5:  # Prevent infinite recursion
+        if depth > self.max_schema_depth:
             return {}
             
         # Handle references first
         if '$ref' in schema:
             ref_path = schema['$ref']
-            if ref_path.startswith('#/components/schemas/'):
-                schema_name = ref_path.split('/')[-1]
-                referenced_schema = self.get_schema_definition(schema_name)
-                if referenced_schema:
-                    return self.generate_from_schema(referenced_schema, depth + 1, property_name)
+            referenced_schema = self.component_index.get(ref_path)
+            if referenced_schema:
+                return self._generate_from_ref(ref_path, referenced_schema, depth, property_name)
             
         schema_type = schema.get('type', 'object')
         
@@ -146,9 +310,9 @@ class MultiSpecWireMockGenerator:
         # Property-specific examples for common API patterns
         if property_name:
             if property_name in ['id', 'creditTransferOrderRequestId']:
-                return f"EPT{str(uuid.uuid4()).replace('-', '')[:12].upper()}"
+                return f"EPT{str(self.new_uuid()).replace('-', '')[:12].upper()}"
             elif property_name == 'signObjectId':
-                return str(uuid.uuid4()).replace('-', '')
+                return str(self.new_uuid()).replace('-', '')
             elif property_name == 'transactionType':
                 return "SCT"
             elif property_name == 'extraVerificationAction':
@@ -160,7 +324,7 @@ class MultiSpecWireMockGenerator:
             elif property_name in ['messageText', 'message']:
                 return f"Example message for {property_name}"
             elif property_name in ['traceId', 'trackingId']:
-                return str(uuid.uuid4())
+                return str(self.new_uuid())
             elif property_name == 'timestamp':
                 return "2024-01-01T12:00:00Z"
             elif property_name in ['email']:
@@ -194,7 +358,7 @@ class MultiSpecWireMockGenerator:
             elif format_type == 'date':
                 return "2024-01-01"
             elif format_type == 'uuid':
-                return str(uuid.uuid4())
+                return str(self.new_uuid())
             return f"example_{format_type}"
         elif schema_type == 'integer':
             minimum = schema.get('minimum', 1)
@@ -209,13 +373,42 @@ class MultiSpecWireMockGenerator:
         else:
             return None
     
+    def _generate_from_ref(self, ref_path: str, schema: Dict[str, Any], depth: int, property_name: str) -> Any:
+        """Generate (or reuse) the example for a referenced schema, cutting $ref cycles"""
+        if ref_path in self._active_refs:
+            # Recursive schema: stop here and remember how far up the stack the cycle reaches
+            self._lowest_cycle_cut = min(self._lowest_cycle_cut, self._active_refs[ref_path])
+            self.profiler.count('ref_cycles_cut')
+            return {}
+        
+        cache_key = (ref_path, property_name)
+        if cache_key in self._example_cache:
+            self.profiler.count('ref_cache_hits')
+            return self._example_cache[cache_key]
+        
+        self.profiler.count('ref_resolutions')
+        position = len(self._active_refs)
+        outer_cycle_cut = self._lowest_cycle_cut
+        self._lowest_cycle_cut = float('inf')
+        self._active_refs[ref_path] = position
+        
+        try:
+            example = self.generate_from_schema(schema, depth + 1, property_name)
+        finally:
+            del self._active_refs[ref_path]
+            inner_cycle_cut = self._lowest_cycle_cut
+            self._lowest_cycle_cut = min(outer_cycle_cut, inner_cycle_cut)
+        
+        # Only memoize examples that don't depend on where they were reached from,
+        # i.e. no cycle inside them was cut against a schema further up the stack
+        if inner_cycle_cut >= position:
+            self._example_cache[cache_key] = example
+        
+        return example
+    
     def get_schema_definition(self, schema_name: str) -> Dict[str, Any]:
         """Get schema definition from current OpenAPI spec"""
-        if hasattr(self, 'current_spec') and self.current_spec:
-            components = self.current_spec.get('components', {})
-            schemas = components.get('schemas', {})
-            return schemas.get(schema_name, {})
-        return {}
+        return self.component_index.get(f"#/components/schemas/{schema_name}", {})
     
     def extract_response_example(self, operation: Dict[str, Any], status_code: int) -> Optional[Dict[str, Any]]:
         """Extract response example from OpenAPI spec with enhanced logic"""
@@ -246,9 +439,6 @@ class MultiSpecWireMockGenerator:
         
         # Try to get from global responses
         if hasattr(self, 'current_spec') and self.current_spec:
-            components = self.current_spec.get('components', {})
-            responses_comp = components.get('responses', {})
-            
             # Look for common response patterns
             status_name_map = {
                 401: ['Unauthorized', 'unauthorized'],
@@ -259,8 +449,8 @@ class MultiSpecWireMockGenerator:
             
             if status_code in status_name_map:
                 for response_name in status_name_map[status_code]:
-                    if response_name in responses_comp:
-                        response_def = responses_comp[response_name]
+                    response_def = self.component_index.get(f"#/components/responses/{response_name}")
+                    if response_def:
                         content = response_def.get('content', {})
                         json_content = content.get('application/json', {})
                         if 'example' in json_content:
@@ -271,47 +461,157 @@ class MultiSpecWireMockGenerator:
                             
         return None
     
-    def create_scenario_request_matcher(self, method: str, path: str, status_code: int, scenario_id: str) -> Dict[str, Any]:
-        """Create request matcher for specific scenario"""
-        # Convert OpenAPI path parameters to WireMock regex patterns
-        # {paramName} -> [^/]+
-        wiremock_path = re.sub(r'\{[^}]+\}', '[^/]+', path)
+    def resolve_parameters(self, path_item: Dict[str, Any], operation: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Path-level and operation-level parameters with $refs resolved; operation entries win"""
+        parameters = {}
         
-        matcher = {
-            "method": method.upper(),
-            "urlPathPattern": wiremock_path
+        for parameter in (path_item.get('parameters') or []) + (operation.get('parameters') or []):
+            if '$ref' in parameter:
+                parameter = self.component_index.get(parameter['$ref'], {})
+            if parameter.get('name'):
+                parameters[(parameter['name'], parameter.get('in'))] = parameter
+        
+        return list(parameters.values())
+    
+    def parameter_pattern(self, parameter: Dict[str, Any]) -> str:
+        """Tightest regex for a path parameter that its OpenAPI schema allows"""
+        # OpenAPI 3 nests the schema; Swagger 2 puts type/format/enum on the parameter itself
+        schema = parameter.get('schema') or parameter
+        if '$ref' in schema:
+            schema = self.component_index.get(schema['$ref'], {})
+        
+        if schema.get('enum'):
+            return '(?:' + '|'.join(re.escape(str(value)) for value in schema['enum']) + ')'
+        
+        if schema.get('pattern'):
+            # WireMock anchors the whole path itself, so drop the pattern's own anchors
+            pattern = schema['pattern']
+            if pattern.startswith('^'):
+                pattern = pattern[1:]
+            if pattern.endswith('$') and not pattern.endswith('\\$'):
+                pattern = pattern[:-1]
+            return f'(?:{pattern})'
+        
+        schema_type = schema.get('type')
+        format_type = schema.get('format')
+        
+        if schema_type == 'integer':
+            minimum = schema.get('minimum')
+            return '[0-9]+' if minimum is not None and minimum >= 0 else '-?[0-9]+'
+        elif schema_type == 'number':
+            return '-?[0-9]+(?:\\.[0-9]+)?'
+        elif schema_type == 'boolean':
+            return '(?:true|false)'
+        elif format_type == 'uuid':
+            return '[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+        elif format_type == 'date':
+            return '[0-9]{4}-[0-9]{2}-[0-9]{2}'
+        
+        return ANY_SEGMENT_PATTERN
+    
+    def build_url_matcher(self, path: str, parameters: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """WireMock URL matcher for an OpenAPI path according to the matcher strategy"""
+        if self.matcher_strategy == 'regex':
+            # Convert OpenAPI path parameters to WireMock regex patterns
+            # {paramName} -> [^/]+
+            return {"urlPathPattern": re.sub(r'\{[^}]+\}', ANY_SEGMENT_PATTERN, path)}
+        
+        # Static paths need no regex at all
+        if not re.search(r'\{[^}]+\}', path):
+            return {"urlPath": path}
+        
+        path_parameters = {
+            parameter['name']: parameter
+            for parameter in (parameters or [])
+            if parameter.get('in') == 'path'
         }
         
+        def segment_pattern(name: str) -> str:
+            parameter = path_parameters.get(name)
+            return self.parameter_pattern(parameter) if parameter else ANY_SEGMENT_PATTERN
+        
+        if self.matcher_strategy == 'template':
+            matcher = {"urlPathTemplate": path}
+            constraints = {}
+            for name in re.findall(r'\{([^}]+)\}', path):
+                pattern = segment_pattern(name)
+                if pattern != ANY_SEGMENT_PATTERN:
+                    constraints[name] = {"matches": pattern}
+            if constraints:
+                matcher["pathParameters"] = constraints
+            return matcher
+        
+        # typed: escape the literal parts and use a schema-derived pattern per parameter
+        url_pattern = ''.join(
+            segment_pattern(part[1:-1]) if part.startswith('{') and part.endswith('}') else re.escape(part)
+            for part in re.split(r'(\{[^}]+\})', path)
+        )
+        return {"urlPathPattern": url_pattern}
+    
+    def create_scenario_request_matcher(self, method: str, path: str, status_code: int, scenario_id: str,
+                                        url_matcher: Optional[Dict[str, Any]] = None,
+                                        default_status: Optional[int] = 200) -> Dict[str, Any]:
+        """Create request matcher for specific scenario"""
+        matcher = {"method": method.upper()}
+        matcher.update(url_matcher or self.build_url_matcher(path))
+        
         # Add headers for scenario identification
-        headers = {
-            "Accept": {"contains": "json"}
-        }
+        headers = {}
+        if self.match_accept_header:
+            headers["Accept"] = {"contains": "json"}
+        
+        scenario = self.scenario_identifier(status_code)
+        has_body = method.upper() in ['POST', 'PUT', 'PATCH']
         
         # Add scenario-specific matchers based on status code
-        if method.upper() in ['POST', 'PUT', 'PATCH']:
-            # Use body patterns for request differentiation
-            body_patterns = []
-            
-            if status_code == 200 or status_code == 201:
-                body_patterns.append({
-                    "matchesJsonPath": f"$[?(@..* =~ /.*{self.scenario_identifiers[status_code]}.*/i)]"
-                })
-            else:
-                # For error scenarios, use specific field matching
-                body_patterns.append({
-                    "matchesJsonPath": f"$[?(@..* =~ /.*{self.scenario_identifiers[status_code]}.*/i)]"
-                })
-            
-            if body_patterns:
-                matcher["bodyPatterns"] = body_patterns
+        if self.scenario_selection == 'body-deep' and has_body:
+            # Legacy: case-insensitive regex over a recursive descent of the whole body
+            matcher["bodyPatterns"] = [{
+                "matchesJsonPath": f"$[?(@..* =~ /.*{scenario}.*/i)]"
+            }]
+        elif self.is_default_scenario(status_code, default_status):
+            # The default scenario matches requests that don't select any scenario
+            pass
+        elif self.scenario_selection == 'query':
+            matcher["queryParameters"] = {SCENARIO_QUERY_PARAM: {"equalTo": scenario}}
+        elif self.scenario_selection == 'body-field' and has_body:
+            # Single top-level field lookup, no deep scan or regex
+            matcher["bodyPatterns"] = [{
+                "matchesJsonPath": {"expression": f"$.{SCENARIO_BODY_FIELD}", "equalTo": scenario}
+            }]
         else:
-            # For GET requests, use query parameters or headers
-            if status_code != 200:
-                headers[f"X-Test-Scenario"] = {"equalTo": self.scenario_identifiers[status_code]}
+            # Header selection (also used for body-less requests)
+            headers[SCENARIO_HEADER] = {"equalTo": scenario}
         
-        matcher["headers"] = headers
+        if headers:
+            matcher["headers"] = headers
         return matcher
     
+    def is_default_scenario(self, status_code: int, default_status: Optional[int] = 200) -> bool:
+        """Whether a status code is served when the request selects no scenario"""
+        return status_code == default_status
+    
+    def default_status(self, status_codes: List[int]) -> Optional[int]:
+        """Status served without a scenario: 200, or else the operation's lowest success status"""
+        if 200 in status_codes:
+            return 200
+        success_codes = [code for code in status_codes if 200 <= code < 300]
+        return min(success_codes) if success_codes else None
+    
+    def status_info(self, status_code: int) -> Dict[str, str]:
+        """Name and scenario of a status code, derived from the HTTP reason phrase if it isn't preconfigured"""
+        if status_code in self.status_codes:
+            return self.status_codes[status_code]
+        try:
+            name = http.HTTPStatus(status_code).phrase
+        except ValueError:
+            name = f"Status {status_code}"
+        return {"name": name, "scenario": self.sanitize_filename(name).lower() or f"status_{status_code}"}
+    
+    def scenario_identifier(self, status_code: int) -> str:
+        """Value a request uses to select the scenario of a status code"""
+        return self.scenario_identifiers.get(status_code) or f"{self.status_info(status_code)['scenario']}_{status_code}"
+    
     def generate_error_response(self, status_code: int, operation: Dict[str, Any]) -> Dict[str, Any]:
         """Generate error response based on status code with enhanced logic"""
         
@@ -357,7 +657,7 @@ class MultiSpecWireMockGenerator:
         
         error_info = error_details.get(status_code, {
             "code": f"ERROR_{status_code}",
-            "message": self.status_codes[status_code]["name"],
+            "message": self.status_info(status_code)["name"],
             "details": f"Test scenario for {status_code} status code"
         })
         
@@ -365,19 +665,65 @@ class MultiSpecWireMockGenerator:
         error_response = {
             "errors": [error_info],
             "timestamp": "2024-01-01T12:00:00Z",
-            "traceId": str(uuid.uuid4()),
+            "traceId": None,
             "status": status_code,
             "path": operation.get('summary', 'Unknown operation')
         }
         
+        if self.dedupe_bodies or self.deterministic:
+            # Derive the trace id from the body itself so identical boilerplate stays byte-identical
+            body_json = json.dumps(error_response, sort_keys=True)
+            error_response["traceId"] = str(uuid.uuid5(uuid.NAMESPACE_URL, body_json))
+        else:
+            error_response["traceId"] = str(uuid.uuid4())
+        
         return error_response
     
-    def create_mapping_entry(self, operation_id: str, method: str, path: str, operation: Dict[str, Any], status_code: int, api_name: str) -> Dict[str, Any]:
+    def _empty_dedupe_stats(self) -> Dict[str, int]:
+        """Counters for content-addressed response body deduplication"""
+        return {'bodies': 0, 'unique_bodies': 0, 'bytes_total': 0, 'bytes_written': 0}
+    
+    def write_response_file(self, api_name: str, filename: str, body: Any) -> str:
+        """Write a response body under __files and return its bodyFileName"""
+        with self.profiler.stage('serialize'):
+            content = self.serializer.dumps(body)
+        self.profiler.count('response_bodies')
+        
+        if self.dedupe_bodies:
+            # Content-addressed name: every mapping with this body shares one file
+            digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:20]
+            response_filename = f"{api_name}/bodies/{digest}.json"
+            content_size = len(content.encode('utf-8'))
+            
+            self.dedupe_stats['bodies'] += 1
+            self.dedupe_stats['bytes_total'] += content_size
+            if response_filename in self._written_bodies:
+                return response_filename
+            
+            self._written_bodies.add(response_filename)
+            self.dedupe_stats['unique_bodies'] += 1
+            self.dedupe_stats['bytes_written'] += content_size
+        else:
+            response_filename = f"{api_name}/{filename}"
+        
+        response_file_path = os.path.join(self.files_dir, response_filename)
+        with self.profiler.stage('write_files'):
+            self.writer.write(response_file_path, content)
+        self._record_output(response_file_path)
+        
+        return response_filename
+    
+    def create_mapping_entry(self, operation_id: str, method: str, path: str, operation: Dict[str, Any], status_code: int, api_name: str,
+                             url_matcher: Optional[Dict[str, Any]] = None, default_status: Optional[int] = 200) -> Dict[str, Any]:
         """Create a single mapping entry for a specific scenario"""
         scenario_id = f"{operation_id}_{status_code}"
         
         # Create request matcher
-        request_matcher = self.create_scenario_request_matcher(method, path, status_code, scenario_id)
+        with self.profiler.stage('build_matcher'):
+            if url_matcher is None:
+                url_matcher = self.build_url_matcher(path, self.resolve_parameters({}, operation))
+            request_matcher = self.create_scenario_request_matcher(method, path, status_code, scenario_id, url_matcher,
+                                                                   default_status)
         
         # Create response
         response = {
@@ -388,105 +734,119 @@ class MultiSpecWireMockGenerator:
         }
         
         # Generate response body
-        if status_code in [200, 201]:
+        if status_code == 204:
+            # No Content - nothing to return
+            pass
+        elif 200 <= status_code < 300:
             # Success response - use spec example or generate
-            response_example = self.extract_response_example(operation, status_code)
+            with self.profiler.stage('build_example'):
+                response_example = self.extract_response_example(operation, status_code)
             if response_example:
                 # Save to file
-                response_filename = f"{api_name}/{method.lower()}_{operation_id}_{status_code}_response.json"
-                response_file_path = os.path.join(self.files_dir, response_filename)
-                
-                # Ensure directory exists
-                os.makedirs(os.path.dirname(response_file_path), exist_ok=True)
-                
-                with open(response_file_path, 'w') as f:
-                    json.dump(response_example, f, indent=2)
-                
-                response["bodyFileName"] = response_filename
+                response["bodyFileName"] = self.write_response_file(
+                    api_name, f"{method.lower()}_{operation_id}_{status_code}_response.json", response_example
+                )
             else:
                 response["body"] = json.dumps({"message": "Success"})
         else:
             # Error response
-            error_response = self.generate_error_response(status_code, operation)
-            response_filename = f"{api_name}/{method.lower()}_{operation_id}_{status_code}_error.json"
-            response_file_path = os.path.join(self.files_dir, response_filename)
-            
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(response_file_path), exist_ok=True)
-            
-            with open(response_file_path, 'w') as f:
-                json.dump(error_response, f, indent=2)
-            
-            response["bodyFileName"] = response_filename
+            with self.profiler.stage('build_example'):
+                error_response = self.generate_error_response(status_code, operation)
+            response["bodyFileName"] = self.write_response_file(
+                api_name, f"{method.lower()}_{operation_id}_{status_code}_error.json", error_response
+            )
         
         return {
-            "id": str(uuid.uuid4()),
+            "id": self.mapping_id(api_name, operation_id, method, path, status_code),
             "request": request_matcher,
             "response": response,
             "metadata": {
-                "scenario": self.status_codes[status_code]["scenario"],
+                "scenario": self.status_info(status_code)["scenario"],
                 "operation_id": operation_id,
                 "api_name": api_name
             }
         }
     
-    def process_api_spec(self, spec_info: Dict[str, str]) -> Dict[str, List[Dict[str, Any]]]:
-        """Process a single API spec and return mappings grouped by method"""
-        spec = self.load_spec_file(spec_info['file'])
+    def iter_api_mappings(self, spec_info: Dict[str, str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Lazily yield (HTTP method, mapping entry) pairs for a single API spec"""
+        spec = self.registry.document(spec_info['file'])
         api_name = spec_info['api_name']
+        # Capture metadata while the document is loaded (it is released afterwards)
+        self.registry.metadata(spec_info)
         
-        # Store current spec for schema resolution
-        self.current_spec = spec
+        # Store current spec and its component index for schema resolution
+        self.set_current_spec(spec, self.registry.component_index(spec_info['file']))
+        self.reset_value_generator(api_name)
         
+        try:
+            paths = spec.get('paths', {})
+            
+            for path, path_item in paths.items():
+                for method, operation in path_item.items():
+                    if method.upper() not in ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']:
+                        continue
+                        
+                    self.check_cancelled()
+                    
+                    operation_id = operation.get('operationId', f"{method}_{path.replace('/', '_').strip('_')}")
+                    operation_id = self.sanitize_filename(operation_id)
+                    
+                    method_upper = method.upper()
+                    
+                    # The URL matcher only depends on the path, so build it once per operation
+                    with self.profiler.stage('build_matcher'):
+                        url_matcher = self.build_url_matcher(path, self.resolve_parameters(path_item, operation))
+                    
+                    # Generate mappings for the status codes selected by the status policy
+                    status_codes = self.status_policy.select(api_name, operation, self.status_codes.keys())
+                    self._stubs_saved += len(set(self.status_codes) - set(status_codes))
+                    default_status = self.default_status(status_codes)
+                    for status_code in status_codes:
+                        with self.profiler.operation(api_name, f"{method_upper} {path}"):
+                            mapping_entry = self.create_mapping_entry(
+                                operation_id, method_upper, path, operation, status_code, api_name, url_matcher,
+                                default_status
+                            )
+                        self.profiler.count('mappings')
+                        yield method_upper, mapping_entry
+        finally:
+            # Clear current spec reference
+            self.set_current_spec(None)
+            # Keep memory bounded: don't hold on to documents that were already processed
+            self.registry.release(spec_info['file'])
+    
+    def process_api_spec(self, spec_info: Dict[str, str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Process a single API spec and return mappings grouped by method"""
         # Group mappings by HTTP method
         method_mappings = {}
         
-        paths = spec.get('paths', {})
-        
-        for path, path_item in paths.items():
-            for method, operation in path_item.items():
-                if method.upper() not in ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']:
-                    continue
-                    
-                operation_id = operation.get('operationId', f"{method}_{path.replace('/', '_').strip('_')}")
-                operation_id = self.sanitize_filename(operation_id)
-                
-                method_upper = method.upper()
-                if method_upper not in method_mappings:
-                    method_mappings[method_upper] = []
-                
-                # Generate mappings for all status codes
-                for status_code in self.status_codes.keys():
-                    mapping_entry = self.create_mapping_entry(
-                        operation_id, method_upper, path, operation, status_code, api_name
-                    )
-                    method_mappings[method_upper].append(mapping_entry)
-        
-        # Clear current spec reference
-        self.current_spec = None
+        for method, mapping_entry in self.iter_api_mappings(spec_info):
+            method_mappings.setdefault(method, []).append(mapping_entry)
         
         return method_mappings
     
+    def mapping_filename(self, api_name: str, method: str) -> str:
+        """Consolidated mapping filename for an API and HTTP method"""
+        if method == 'GET':
+            return f"get_{api_name}_mappings.json"
+        elif method == 'POST':
+            return f"create_{api_name}_mappings.json"
+        elif method == 'PUT':
+            return f"update_{api_name}_mappings.json"
+        elif method == 'PATCH':
+            return f"patch_{api_name}_mappings.json"
+        elif method == 'DELETE':
+            return f"delete_{api_name}_mappings.json"
+        else:
+            return f"{method.lower()}_{api_name}_mappings.json"
+    
     def write_consolidated_mappings(self, api_name: str, method_mappings: Dict[str, List[Dict[str, Any]]]):
         """Write consolidated mapping files for each HTTP method"""
         api_mappings_dir = os.path.join(self.mappings_dir, api_name)
-        os.makedirs(api_mappings_dir, exist_ok=True)
+        self.writer.ensure_dir(api_mappings_dir)
         
         for method, mappings in method_mappings.items():
-            # Determine filename based on method
-            if method == 'GET':
-                filename = f"get_{api_name}_mappings.json"
-            elif method == 'POST':
-                filename = f"create_{api_name}_mappings.json"
-            elif method == 'PUT':
-                filename = f"update_{api_name}_mappings.json"
-            elif method == 'PATCH':
-                filename = f"patch_{api_name}_mappings.json"
-            elif method == 'DELETE':
-                filename = f"delete_{api_name}_mappings.json"
-            else:
-                filename = f"{method.lower()}_{api_name}_mappings.json"
-            
+            filename = self.mapping_filename(api_name, method)
             mapping_file = os.path.join(api_mappings_dir, filename)
             
             # Create consolidated mapping structure
@@ -494,62 +854,387 @@ class MultiSpecWireMockGenerator:
                 "mappings": mappings
             }
             
-            with open(mapping_file, 'w') as f:
-                json.dump(consolidated_mapping, f, indent=2)
+            with self.profiler.stage('serialize'):
+                content = self.serializer.dumps(consolidated_mapping)
+            with self.profiler.stage('write_files'):
+                self.writer.write(mapping_file, content)
+            self._record_output(mapping_file)
             
             print(f"✓ Generated {len(mappings)} {method} mappings for {api_name}: {filename}")
     
-    def generate_all_mappings(self):
-        """Generate mappings for all discovered API specs"""
+    def write_streaming_mappings(self, spec_info: Dict[str, str]) -> Dict[str, int]:
+        """Stream mappings into their consolidated files as they are generated, returning counts per method"""
+        api_name = spec_info['api_name']
+        api_mappings_dir = os.path.join(self.mappings_dir, api_name)
+        self.writer.ensure_dir(api_mappings_dir)
+        
+        streams = {}
+        try:
+            for method, mapping_entry in self.iter_api_mappings(spec_info):
+                if method not in streams:
+                    mapping_file = os.path.join(api_mappings_dir, self.mapping_filename(api_name, method))
+                    streams[method] = self.writer.open_array_stream(mapping_file, 'mappings', self.serializer.compact)
+                with self.profiler.stage('serialize'):
+                    content = self.serializer.dumps(mapping_entry)
+                with self.profiler.stage('write_files'):
+                    streams[method].append(content)
+        except Exception:
+            for stream in streams.values():
+                stream.abort()
+            raise
+        
+        for method, stream in streams.items():
+            stream.close()
+            self._record_output(stream.file_path)
+            print(f"✓ Generated {stream.count} {method} mappings for {api_name}: {os.path.basename(stream.file_path)}")
+        
+        return {method: stream.count for method, stream in streams.items()}
+    
+    def _record_output(self, file_path: str):
+        """Remember a file emitted for the spec currently being generated"""
+        self._emitted_files.append(os.path.relpath(file_path, self.output_dir).replace(os.sep, '/'))
+    
+    def generate_spec_mappings(self, spec_info: Dict[str, str]) -> Dict[str, Any]:
+        """Process and write a single API spec, isolating any failure to that spec"""
+        result = {'api_name': spec_info['api_name'], 'mappings': 0, 'error': None, 'files': [], 'stubs_saved': 0}
+        self._emitted_files = []
+        self._written_bodies = set()
+        self.dedupe_stats = self._empty_dedupe_stats()
+        self._stubs_saved = 0
+        self.profiler.begin_spec(spec_info['api_name'])
+        
+        try:
+            if self.streaming:
+                method_counts = self.write_streaming_mappings(spec_info)
+            else:
+                method_mappings = self.process_api_spec(spec_info)
+                self.write_consolidated_mappings(spec_info['api_name'], method_mappings)
+                method_counts = {method: len(mappings) for method, mappings in method_mappings.items()}
+            # Surface queued write failures as a failure of this spec
+            with self.profiler.stage('flush'):
+                self.writer.flush()
+            result['mappings'] = sum(method_counts.values())
+            result['metadata'] = self.registry.metadata(spec_info)
+            # Stubs of the full status matrix the status policy left out; codes generated beyond the
+            # matrix (declared extras) don't offset it, so this is never negative
+            result['stubs_saved'] = self._stubs_saved
+        except GenerationCancelled:
+            self.writer.flush(raise_errors=False)
+            self.profiler.end_spec()
+            raise
+        except Exception as e:
+            self.writer.flush(raise_errors=False)
+            result['error'] = str(e)
+        
+        self.profiler.end_spec(result['mappings'])
+        result['files'] = sorted(set(self._emitted_files))
+        result['dedupe'] = dict(self.dedupe_stats)
+        return result
+    
+    def generation_options(self) -> Dict[str, Any]:
+        """Options that influence generated output; a change invalidates incremental results"""
+        return {
+            'status_codes': self.status_codes,
+            'scenario_identifiers': self.scenario_identifiers,
+            'dedupe_bodies': self.dedupe_bodies,
+            'matcher_strategy': self.matcher_strategy,
+            'scenario_selection': self.scenario_selection,
+            'match_accept_header': self.match_accept_header,
+            'output_profile': self.serializer.profile,
+            'json_backend': self.serializer.backend,
+            'deterministic': self.deterministic,
+            'seed': self.seed if self.deterministic else None,
+            'status_policy': self.status_policy.describe()
+        }
+    
+    def options_hash(self) -> str:
+        """Stable hash of the generation options"""
+        options_json = json.dumps(self.generation_options(), sort_keys=True, default=str)
+        return hashlib.sha256(options_json.encode('utf-8')).hexdigest()
+    
+    def spec_hash(self, spec_file: str) -> str:
+        """Content hash of a spec file"""
+        digest = hashlib.sha256()
+        with open(spec_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _spec_key(self, spec_info: Dict[str, str]) -> str:
+        """Manifest key of a spec: its path relative to the spec directory"""
+        return os.path.relpath(spec_info['file'], self.spec_dir).replace(os.sep, '/')
+    
+    def load_manifest(self) -> Dict[str, Any]:
+        """Load the incremental-mode manifest, or an empty one if missing or unreadable"""
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if isinstance(manifest.get('specs'), dict):
+                return manifest
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {'specs': {}}
+    
+    def save_manifest(self, spec_entries: Dict[str, Dict[str, Any]]):
+        """Atomically write the incremental-mode manifest"""
+        manifest = {
+            'generator_version': GENERATOR_VERSION,
+            'options_hash': self.options_hash(),
+            'specs': spec_entries
+        }
+        
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            # default=str: spec metadata may hold YAML dates (e.g. an unquoted info.version)
+            json.dump(manifest, f, indent=2, sort_keys=True, default=str)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def remove_outputs(self, relative_paths: List[str]):
+        """Delete previously emitted files and any directories left empty"""
+        output_root = os.path.abspath(self.output_dir)
+        
+        for relative_path in relative_paths:
+            file_path = os.path.abspath(os.path.join(output_root, relative_path))
+            if not file_path.startswith(output_root + os.sep):
+                continue
+            
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+            
+            # Prune empty per-API directories, but keep mappings/ and __files/ themselves
+            parent = os.path.dirname(file_path)
+            while parent not in (output_root, os.path.abspath(self.mappings_dir), os.path.abspath(self.files_dir)):
+                try:
+                    os.rmdir(parent)
+                except OSError:
+                    break
+                self.writer.forget_dir(parent)
+                parent = os.path.dirname(parent)
+    
+    def _generate_specs_in_pool(self, specs: List[Dict[str, str]]):
+        """Fan specs out to a process pool, yielding results in spec order"""
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(specs))) as executor:
+            futures = [executor.submit(_generate_spec_in_worker, self, spec_info) for spec_info in specs]
+            
+            try:
+                for spec_info, future in zip(specs, futures):
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        # Worker crashed or the spec could not be sent to it
+                        yield {'api_name': spec_info['api_name'], 'mappings': 0, 'error': str(e), 'files': [],
+                               'dedupe': self._empty_dedupe_stats(), 'stubs_saved': 0, 'output': '', 'profile': None}
+            except GeneratorExit:
+                # Abandoned mid-run (cancelled): don't start the specs still waiting for a worker
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+    
+    def print_dedupe_report(self, stats: Dict[str, int]):
+        """Print how many response files and bytes deduplication saved"""
+        files_saved = stats['bodies'] - stats['unique_bodies']
+        bytes_saved = stats['bytes_total'] - stats['bytes_written']
+        print(f"♻️  Response bodies: {stats['bodies']} referenced, {stats['unique_bodies']} unique files written")
+        print(f"♻️  Deduplication saved {files_saved} files and {bytes_saved:,} bytes")
+    
+    def generate_all_mappings(self, progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                              cancel_event: Optional[threading.Event] = None):
+        """Generate mappings for all discovered API specs.
+        
+        progress_callback receives an event dict as each spec starts and finishes; setting
+        cancel_event stops the run at the next operation and raises GenerationCancelled.
+        """
+        def report(event: str, **details):
+            if progress_callback is not None:
+                progress_callback({'event': event, **details})
+        
         print("🚀 Starting Multi-Spec WireMock Mapping Generation")
         print("=" * 60)
+        self.profiler.start_run()
         
         # Discover all specs
-        specs = self.discover_specs()
+        specs = self.discover_specs(refresh=True)
         
         if not specs:
             print("❌ No API specifications found in the spec directory")
-            return
+            self.profiler.end_run()
+            return {'total_mappings': 0, 'stubs_saved': 0, 'specs': []}
         
         # Ensure output directories exist
-        os.makedirs(self.mappings_dir, exist_ok=True)
-        os.makedirs(self.files_dir, exist_ok=True)
+        self.output.ensure_dir(self.mappings_dir)
+        self.output.ensure_dir(self.files_dir)
         
         total_mappings = 0
-        
-        # Process each spec
-        for spec_info in specs:
-            print(f"\n📋 Processing API: {spec_info['api_name']}")
-            print("-" * 40)
+        total_stubs_saved = 0
+        total_dedupe = self._empty_dedupe_stats()
+        spec_results = []
+        
+        # In incremental mode, only regenerate specs whose content or options changed
+        previous_entries = {}
+        spec_entries = {}
+        pending_specs = specs
+        
+        if self.incremental:
+            manifest = self.load_manifest()
+            previous_entries = manifest['specs']
+            manifest_current = (manifest.get('generator_version') == GENERATOR_VERSION and
+                                manifest.get('options_hash') == self.options_hash())
+            pending_specs = []
             
-            try:
-                method_mappings = self.process_api_spec(spec_info)
-                self.write_consolidated_mappings(spec_info['api_name'], method_mappings)
+            for spec_info in specs:
+                key = self._spec_key(spec_info)
+                spec_info['spec_hash'] = self.spec_hash(spec_info['file'])
+                previous = previous_entries.get(key)
+                
+                if (manifest_current and previous and
+                        previous.get('spec_hash') == spec_info['spec_hash'] and
+                        previous.get('api_name') == spec_info['api_name']):
+                    spec_entries[key] = previous
+                    if previous.get('metadata'):
+                        # Lets the Java README describe the spec without parsing it
+                        self.registry.record_metadata(spec_info['file'], previous['metadata'])
+                else:
+                    pending_specs.append(spec_info)
+            
+            skipped = len(specs) - len(pending_specs)
+            if skipped:
+                print(f"⏭️  Skipping {skipped} unchanged specifications")
+        
+        parallel = self.workers > 1 and len(pending_specs) > 1
+        pending_files = {spec_info['file'] for spec_info in pending_specs}
+        report('started', specs=len(specs), pending=len(pending_specs),
+               skipped=[spec_info['filename'] for spec_info in specs if spec_info['file'] not in pending_files])
+        
+        self._cancel_event = cancel_event
+        if parallel:
+            print(f"⚙️  Using {min(self.workers, len(pending_specs))} worker processes")
+            results = self._generate_specs_in_pool(pending_specs)
+        else:
+            results = None
+        
+        try:
+            # Process each spec; parallel results arrive in the same order as the specs
+            for index, spec_info in enumerate(pending_specs):
+                self.check_cancelled()
+                print(f"\n📋 Processing API: {spec_info['api_name']}")
+                print("-" * 40)
+                report('spec_started', api_name=spec_info['api_name'], filename=spec_info['filename'],
+                       index=index, total=len(pending_specs))
+                
+                if parallel:
+                    result = next(results)
+                    print(result['output'], end='')
+                    self.profiler.merge(result['profile'])
+                else:
+                    result = self.generate_spec_mappings(spec_info)
+                # Documents parsed here for naming aren't needed anymore
+                self.registry.release(spec_info['file'])
                 
-                spec_total = sum(len(mappings) for mappings in method_mappings.values())
-                total_mappings += spec_total
+                for counter, value in result['dedupe'].items():
+                    total_dedupe[counter] += value
+                spec_results.append({
+                    'api_name': spec_info['api_name'],
+                    'filename': spec_info['filename'],
+                    'mappings': result['mappings'],
+                    'stubs_saved': result['stubs_saved'],
+                    'files': result['files'],
+                    'error': result['error']
+                })
+                
+                if result['error'] is None:
+                    self.registry.record_metadata(spec_info['file'], result['metadata'])
+                    total_mappings += result['mappings']
+                    total_stubs_saved += result['stubs_saved']
+                    print(f"✅ Completed {spec_info['api_name']}: {result['mappings']} total mappings")
                 
-                print(f"✅ Completed {spec_info['api_name']}: {spec_total} total mappings")
+                    if self.incremental:
+                        key = self._spec_key(spec_info)
+                        previous = previous_entries.get(key, {})
+                        # Drop outputs this spec no longer produces (e.g. removed operations)
+                        self.remove_outputs(sorted(set(previous.get('files', [])) - set(result['files'])))
+                        spec_entries[key] = {
+                            'api_name': spec_info['api_name'],
+                            'spec_hash': spec_info['spec_hash'],
+                            'mappings': result['mappings'],
+                            'files': result['files'],
+                            'metadata': result['metadata']
+                        }
+                else:
+                    print(f"❌ Error processing {spec_info['api_name']}: {result['error']}")
+                    
+                    if self.incremental:
+                        key = self._spec_key(spec_info)
+                        previous = previous_entries.get(key, {})
+                        # Keep tracking the earlier outputs and whatever this attempt wrote, so a later
+                        # successful run prunes them; without a spec hash that run regenerates the spec
+                        spec_entries[key] = {
+                            'api_name': spec_info['api_name'],
+                            'spec_hash': None,
+                            'mappings': previous.get('mappings', 0),
+                            'files': sorted(set(previous.get('files', [])) | set(result['files']))
+                        }
                 
-            except Exception as e:
-                print(f"❌ Error processing {spec_info['api_name']}: {e}")
+                report('spec_finished', api_name=spec_info['api_name'], filename=spec_info['filename'],
+                       index=index, total=len(pending_specs), mappings=result['mappings'], error=result['error'])
+        except GenerationCancelled:
+            if results is not None:
+                results.close()
+            self.writer.flush(raise_errors=False)
+            self.writer.close()
+            self.profiler.end_run()
+            print("\n🛑 Generation cancelled")
+            raise
+        finally:
+            self._cancel_event = None
+        
+        with self.profiler.stage('flush'):
+            self.writer.close()
+        
+        if self.incremental:
+            # Prune outputs of specs that were deleted or renamed since the last run
+            discovered_keys = {self._spec_key(spec_info) for spec_info in specs}
+            kept_files = {path for entry in spec_entries.values() for path in entry.get('files', [])}
+            for key in sorted(set(previous_entries) - discovered_keys):
+                self.remove_outputs(sorted(set(previous_entries[key].get('files', [])) - kept_files))
+                print(f"🗑️  Pruned outputs of removed spec: {key}")
+            
+            self.save_manifest(spec_entries)
         
         print("\n" + "=" * 60)
         print(f"🎉 Generation Complete!")
         print(f"📊 Total mappings generated: {total_mappings}")
+        if self.incremental:
+            print(f"⏭️  Unchanged specs skipped: {len(specs) - len(pending_specs)}")
+        if total_stubs_saved:
+            print(f"✂️  Status policy saved {total_stubs_saved} stubs compared to the full status matrix")
+        if self.dedupe_bodies:
+            self.print_dedupe_report(total_dedupe)
         print(f"📁 Mappings directory: {self.mappings_dir}")
         print(f"📁 Response files directory: {self.files_dir}")
+        
+        self.profiler.end_run()
+        self.profiler.print_summary()
+        
+        return {'total_mappings': total_mappings, 'stubs_saved': total_stubs_saved, 'specs': spec_results}
 
 
 class JavaWireMockGenerator:
     """Generate Java WireMock configuration classes for Spring Boot and JUnit integration"""
     
-    def __init__(self, package_name: str = "com.example.wiremock"):
+    def __init__(self, package_name: str = "com.example.wiremock", output_backend: Optional[DiskBackend] = None):
         self.package_name = package_name
+        # Same backend as the mappings when generating into memory; plain disk writes otherwise
+        self.output = output_backend
+        self.registry = None
         self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    def generate_java_code_for_apis(self, specs: List[Dict[str, str]], output_dir: str):
+    def generate_java_code_for_apis(self, specs: List[Dict[str, str]], output_dir: str,
+                                    registry: Optional[SpecRegistry] = None):
         """Generate comprehensive Java code for all APIs"""
+        self.registry = registry
+        if self.output is None:
+            self.output = DiskBackend(output_dir)
         java_base_dir = os.path.join(output_dir, 'java')
         
         # Create directory structure
@@ -558,9 +1243,9 @@ class JavaWireMockGenerator:
         java_test_dir = os.path.join(java_base_dir, 'src', 'test', 'java', *package_dirs)
         java_resources_dir = os.path.join(java_base_dir, 'src', 'test', 'resources')
         
-        os.makedirs(java_src_dir, exist_ok=True)
-        os.makedirs(java_test_dir, exist_ok=True)
-        os.makedirs(java_resources_dir, exist_ok=True)
+        self.output.ensure_dir(java_src_dir)
+        self.output.ensure_dir(java_test_dir)
+        self.output.ensure_dir(java_resources_dir)
         
         print(f"\n🔧 Generating Java WireMock Code")
         print("-" * 40)
@@ -662,8 +1347,7 @@ public class MultiApiWireMockServer {{
     }}
 }}'''
         
-        with open(os.path.join(output_dir, 'MultiApiWireMockServer.java'), 'w') as f:
-            f.write(class_content)
+        self.output.write(os.path.join(output_dir, 'MultiApiWireMockServer.java'), class_content)
         
         print(f"✓ Generated MultiApiWireMockServer.java")
     
@@ -798,10 +1482,9 @@ public class {class_name}WireMockConfig {{
         
         # Create config directory
         config_dir = os.path.join(src_dir, 'config')
-        os.makedirs(config_dir, exist_ok=True)
+        self.output.ensure_dir(config_dir)
         
-        with open(os.path.join(config_dir, f'{class_name}WireMockConfig.java'), 'w') as f:
-            f.write(config_content)
+        self.output.write(os.path.join(config_dir, f'{class_name}WireMockConfig.java'), config_content)
         
         # Generate test base class
         test_content = f'''package {self.package_name}.test;
@@ -870,10 +1553,9 @@ public abstract class {class_name}WireMockTest {{
         
         # Create test directory
         test_package_dir = os.path.join(test_dir, 'test')
-        os.makedirs(test_package_dir, exist_ok=True)
+        self.output.ensure_dir(test_package_dir)
         
-        with open(os.path.join(test_package_dir, f'{class_name}WireMockTest.java'), 'w') as f:
-            f.write(test_content)
+        self.output.write(os.path.join(test_package_dir, f'{class_name}WireMockTest.java'), test_content)
         
         print(f"✓ Generated {class_name} configuration and test classes")
     
@@ -927,10 +1609,9 @@ public class WireMockTestConfig {{
 }}'''
         
         config_dir = os.path.join(output_dir, 'config')
-        os.makedirs(config_dir, exist_ok=True)
+        self.output.ensure_dir(config_dir)
         
-        with open(os.path.join(config_dir, 'WireMockTestConfig.java'), 'w') as f:
-            f.write(config_content)
+        self.output.write(os.path.join(config_dir, 'WireMockTestConfig.java'), config_content)
         
         print(f"✓ Generated WireMockTestConfig.java")
     
@@ -1011,10 +1692,9 @@ public abstract class BaseWireMockIntegrationTest {{
 }}'''
         
         test_dir = os.path.join(output_dir, 'test')
-        os.makedirs(test_dir, exist_ok=True)
+        self.output.ensure_dir(test_dir)
         
-        with open(os.path.join(test_dir, 'BaseWireMockIntegrationTest.java'), 'w') as f:
-            f.write(test_content)
+        self.output.write(os.path.join(test_dir, 'BaseWireMockIntegrationTest.java'), test_content)
         
         print(f"✓ Generated BaseWireMockIntegrationTest.java")
     
@@ -1099,8 +1779,7 @@ public abstract class BaseWireMockIntegrationTest {{
     </build>
 </project>'''
         
-        with open(os.path.join(output_dir, 'pom.xml'), 'w') as f:
-            f.write(pom_content)
+        self.output.write(os.path.join(output_dir, 'pom.xml'), pom_content)
         
         # Gradle build.gradle
         gradle_content = '''plugins {
@@ -1134,14 +1813,13 @@ jar {
     archiveClassifier = ''
 }'''
         
-        with open(os.path.join(output_dir, 'build.gradle'), 'w') as f:
-            f.write(gradle_content)
+        self.output.write(os.path.join(output_dir, 'build.gradle'), gradle_content)
         
         print(f"✓ Generated pom.xml and build.gradle")
     
     def generate_java_readme(self, specs: List[Dict[str, str]], output_dir: str):
         """Generate comprehensive README for Java code"""
-        api_list = '\n'.join([f"- {spec['api_name']}: {spec['filename']}" for spec in specs])
+        api_list = '\n'.join([self._describe_api(spec) for spec in specs])
         
         readme_content = f'''# WireMock Java Integration
 
@@ -1347,11 +2025,19 @@ void testWithWebTestClient() {{
 **Generated by Multi-Spec WireMock Mapping Generator**
 '''
         
-        with open(os.path.join(output_dir, 'README.md'), 'w') as f:
-            f.write(readme_content)
+        self.output.write(os.path.join(output_dir, 'README.md'), readme_content)
         
         print(f"✓ Generated Java README.md")
     
+    def _describe_api(self, spec_info: Dict[str, str]) -> str:
+        """README line for an API, with its operation count when the run recorded its metadata"""
+        line = f"- {spec_info['api_name']}: {spec_info['filename']}"
+        # Never parse here: specs skipped by incremental mode only have metadata from the manifest
+        metadata = self.registry.recorded_metadata(spec_info['file']) if self.registry is not None else None
+        if metadata:
+            line += f" ({metadata['operation_count']} operations)"
+        return line
+    
     def _to_class_name(self, api_name: str) -> str:
         """Convert API name to Java class name"""
         # Split by underscores and capitalize each part
@@ -1359,6 +2045,25 @@ void testWithWebTestClient() {{
         return ''.join(part.capitalize() for part in parts)
 
 
+def create_profiler(report_file: Optional[str], track_memory: bool = False, capture_cpu: bool = False) -> Profiler:
+    """Profiler for a --profile run; raw cProfile data goes to <report>-cprofile/"""
+    cpu_profile_dir = f"{os.path.splitext(report_file)[0]}-cprofile" if report_file and capture_cpu else None
+    return Profiler(enabled=bool(report_file), track_memory=track_memory, cpu_profile_dir=cpu_profile_dir)
+
+
+def write_profile_report(generator: MultiSpecWireMockGenerator, report_file: str):
+    """Write the profile of a generation run along with the options it ran with"""
+    generator.profiler.write_report(report_file, {
+        'generator_version': GENERATOR_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'spec_dir': generator.spec_dir,
+        'workers': generator.workers,
+        'streaming': generator.streaming,
+        'options': generator.generation_options()
+    })
+    print(f"📈 Profile report: {report_file}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Multi-Spec WireMock Mapping Generator with Java Code Generation',
@@ -1382,6 +2087,52 @@ Examples:
                        help='Generate Java WireMock configuration classes')
     parser.add_argument('--package', default='com.example.wiremock',
                        help='Java package name for generated classes (default: com.example.wiremock)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of worker processes for multi-spec generation (0 = all CPUs, default: 1)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Skip specs unchanged since the last run and prune outputs of removed specs')
+    parser.add_argument('--dedupe-bodies', action='store_true',
+                       help='Write identical response bodies once under content-addressed __files names')
+    parser.add_argument('--writer-threads', type=int, default=4,
+                       help='Background threads writing output files (0 = write synchronously, default: 4)')
+    parser.add_argument('--streaming', action='store_true',
+                       help='Stream mappings to disk per operation to keep memory bounded on huge specs')
+    parser.add_argument('--spec-cache', metavar='DIR',
+                       help='Directory for a persistent cache of parsed specs')
+    parser.add_argument('--matcher-strategy', choices=MATCHER_STRATEGIES, default='regex',
+                       help='URL matching: regex (legacy), template (urlPath/urlPathTemplate) or typed (schema-derived regex)')
+    parser.add_argument('--scenario-selection', choices=SCENARIO_SELECTIONS, default='body-deep',
+                       help='How requests select a scenario: body-deep (legacy), header, query or body-field')
+    parser.add_argument('--no-accept-matcher', action='store_true',
+                       help='Do not require an Accept header containing json')
+    parser.add_argument('--output-profile', choices=OUTPUT_PROFILES, default='pretty',
+                       help='pretty (indent=2) or compact (minified) JSON output')
+    parser.add_argument('--fast-json', action='store_true',
+                       help='Serialize with orjson when it is installed')
+    parser.add_argument('--deterministic', action='store_true',
+                       help='Stable mapping ids and seeded example data (byte-identical output for unchanged specs)')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Seed for example data in deterministic mode')
+    parser.add_argument('--status-policy', choices=STATUS_POLICIES, default='full',
+                       help='Status codes per operation: full (legacy), declared, or declared-extras')
+    parser.add_argument('--status-extras', type=parse_status_codes, metavar='CODES',
+                       help='Comma-separated extra status codes for declared-extras (default: 401,500)')
+    parser.add_argument('--status-config', metavar='FILE',
+                       help='JSON/YAML file with per-API and per-tag status policies')
+    parser.add_argument('--profile', metavar='FILE',
+                       help='Time each generation stage, spec and operation and write a JSON report')
+    parser.add_argument('--profile-memory', action='store_true',
+                       help='With --profile: track peak Python memory per spec (tracemalloc, slower)')
+    parser.add_argument('--profile-cpu', action='store_true',
+                       help='With --profile: capture cProfile data per spec next to the report')
+    parser.add_argument('--watch', action='store_true',
+                       help='Keep running: regenerate changed specs and push the differences to WireMock')
+    parser.add_argument('--watch-interval', type=float, default=0.5,
+                       help='Seconds between spec directory polls in watch mode')
+    parser.add_argument('--wiremock-url', default=default_wiremock_url(),
+                       help='WireMock server to push to in watch mode (default: $WIREMOCK_URL or http://localhost:8080)')
+    parser.add_argument('--no-push', action='store_true',
+                       help='In watch mode, only regenerate files without pushing to WireMock')
     
     # Support legacy command line arguments
     if len(sys.argv) >= 3 and not sys.argv[1].startswith('-'):
@@ -1394,16 +2145,37 @@ Examples:
         print(f"❌ Spec directory not found: {args.spec_dir}")
         sys.exit(1)
     
+    profiler = create_profiler(args.profile, args.profile_memory, args.profile_cpu)
+    
+    # Watch mode diffs mappings by id, which only works when ids are stable across regenerations
+    deterministic = args.deterministic or args.watch
+    
     # Generate JSON mappings
-    generator = MultiSpecWireMockGenerator(args.spec_dir, args.output_dir)
-    generator.generate_all_mappings()
+    generator = MultiSpecWireMockGenerator(args.spec_dir, args.output_dir, workers=args.workers,
+                                           incremental=args.incremental, dedupe_bodies=args.dedupe_bodies,
+                                           writer_threads=args.writer_threads, streaming=args.streaming,
+                                           spec_cache_dir=args.spec_cache, matcher_strategy=args.matcher_strategy,
+                                           scenario_selection=args.scenario_selection,
+                                           match_accept_header=not args.no_accept_matcher,
+                                           output_profile=args.output_profile, fast_json=args.fast_json,
+                                           deterministic=deterministic, seed=args.seed,
+                                           status_policy=args.status_policy, status_extras=args.status_extras,
+                                           status_config=args.status_config, profiler=profiler)
+    summary = generator.generate_all_mappings()
+    
+    if args.profile:
+        write_profile_report(generator, args.profile)
     
     # Generate Java code if requested
     if args.java:
         print(f"\n🔧 Generating Java WireMock integration code...")
         java_generator = JavaWireMockGenerator(args.package)
-        specs = generator.discover_specs()
-        java_generator.generate_java_code_for_apis(specs, args.output_dir)
+        # Reuse the specs discovered and parsed during mapping generation
+        java_generator.generate_java_code_for_apis(generator.registry.specs, args.output_dir,
+                                                   registry=generator.registry)
+    
+    if args.watch:
+        watch_specs(generator, summary, None if args.no_push else args.wiremock_url, args.watch_interval)
 
 
 if __name__ == "__main__":
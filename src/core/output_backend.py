@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Output Backends
+Where generated files go: straight to disk, or into an in-memory tree that spills to disk once
+it grows past a size threshold. Both expose the same read side (relative names below the output
+root), so packaging, pushing and serving mappings don't care where a file lives
+"""
+
+import io
+import os
+import threading
+from typing import BinaryIO, List, Optional, Tuple, Union
+
+
+class DiskBackend:
+    """Files written to (and read from) the filesystem below root"""
+
+    on_disk = True
+
+    def __init__(self, root: str):
+        self.root = root
+
+    # Writing (absolute paths, as built by the generators)
+
+    def ensure_dir(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, file_path: str, content: Union[str, bytes]):
+        with open(file_path, 'wb') as f:
+            f.write(content.encode('utf-8') if isinstance(content, str) else content)
+
+    def open_text(self, file_path: str) -> 'AtomicTextFile':
+        """Text file that only becomes visible at file_path once closed"""
+        return AtomicTextFile(file_path)
+
+    # Reading (names relative to root, '/'-separated)
+
+    def _path(self, name: str) -> str:
+        parts = name.split('/')
+        if not name or name.startswith('/') or any(part in ('', '.', '..') for part in parts):
+            raise FileNotFoundError(name)
+        return os.path.join(self.root, *parts)
+
+    def files(self, prefix: str = '') -> List[str]:
+        """Sorted names of all files below root, or below the prefix directory"""
+        base = self._path(prefix) if prefix else self.root
+        names = []
+        for directory, _, filenames in os.walk(base):
+            for filename in filenames:
+                names.append(os.path.relpath(os.path.join(directory, filename), self.root).replace(os.sep, '/'))
+        return sorted(names)
+
+    def exists(self, name: str = '') -> bool:
+        try:
+            return os.path.exists(self._path(name) if name else self.root)
+        except FileNotFoundError:
+            return False
+
+    def open(self, name: str) -> BinaryIO:
+        return open(self._path(name), 'rb')
+
+    def read(self, name: str) -> bytes:
+        with self.open(name) as f:
+            return f.read()
+
+    def fingerprint(self) -> Tuple[Tuple[str, int, int], ...]:
+        """Name, size and mtime of every file, in name order; changes whenever the output does"""
+        entries = []
+        for name in self.files():
+            try:
+                stat = os.stat(self._path(name))
+            except OSError:
+                continue
+            entries.append((name, stat.st_size, stat.st_mtime_ns))
+        return tuple(entries)
+
+
+class AtomicTextFile:
+    """Write to a temporary file and move it into place on close, so readers never see half a file"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._tmp_path = f"{file_path}.tmp"
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+
+    def write(self, text: str):
+        self._file.write(text)
+
+    def close(self):
+        self._file.close()
+        os.replace(self._tmp_path, self.file_path)
+
+    def discard(self):
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
+
+
+class MemoryTextFile:
+    """Collect text in memory and store it in a MemoryBackend on close"""
+
+    def __init__(self, backend: 'MemoryBackend', file_path: str):
+        self.backend = backend
+        self.file_path = file_path
+        self._buffer = io.StringIO()
+
+    def write(self, text: str):
+        self._buffer.write(text)
+
+    def close(self):
+        self.backend.write(self.file_path, self._buffer.getvalue())
+
+    def discard(self):
+        self._buffer = io.StringIO()
+
+
+class MemoryBackend(DiskBackend):
+    """Files kept in memory under a virtual root.
+
+    Once the stored bytes exceed spill_threshold (or spill() is called), every file is written out
+    below root and the backend behaves like a DiskBackend from then on.
+    """
+
+    def __init__(self, root: str, spill_threshold: Optional[int] = None):
+        super().__init__(root)
+        self.spill_threshold = spill_threshold
+        self.spilled = False
+        self._files = {}
+        self._size = 0
+        # Bumped on every write, so fingerprints of in-memory trees change with their content
+        self.version = 0
+        self._lock = threading.RLock()
+
+    @property
+    def on_disk(self) -> bool:
+        return self.spilled
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held in memory (0 once spilled)"""
+        return self._size
+
+    def _name(self, file_path: str) -> str:
+        return os.path.relpath(file_path, self.root).replace(os.sep, '/')
+
+    def ensure_dir(self, directory: str):
+        with self._lock:
+            if self.spilled:
+                super().ensure_dir(directory)
+
+    def write(self, file_path: str, content: Union[str, bytes]):
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        with self._lock:
+            self.version += 1
+            if self.spilled:
+                super().ensure_dir(os.path.dirname(file_path))
+                super().write(file_path, data)
+                return
+            name = self._name(file_path)
+            self._size += len(data) - len(self._files.get(name, b''))
+            self._files[name] = data
+            if self.spill_threshold is not None and self._size > self.spill_threshold:
+                self.spill()
+
+    def open_text(self, file_path: str):
+        with self._lock:
+            if self.spilled:
+                return super().open_text(file_path)
+        return MemoryTextFile(self, file_path)
+
+    def spill(self):
+        """Write everything held in memory below root and keep writing there"""
+        with self._lock:
+            if self.spilled:
+                return
+            for name, data in self._files.items():
+                file_path = self._path(name)
+                super().ensure_dir(os.path.dirname(file_path))
+                super().write(file_path, data)
+            self.spilled = True
+            self._files = {}
+            self._size = 0
+
+    def files(self, prefix: str = '') -> List[str]:
+        with self._lock:
+            if self.spilled:
+                return super().files(prefix)
+            if not prefix:
+                return sorted(self._files)
+            return sorted(name for name in self._files if name.startswith(prefix.rstrip('/') + '/'))
+
+    def exists(self, name: str = '') -> bool:
+        with self._lock:
+            if self.spilled:
+                return super().exists(name)
+            if not name:
+                return True
+            return name in self._files or any(other.startswith(name.rstrip('/') + '/') for other in self._files)
+
+    def open(self, name: str) -> BinaryIO:
+        with self._lock:
+            if self.spilled:
+                return super().open(name)
+            if name not in self._files:
+                raise FileNotFoundError(name)
+            return io.BytesIO(self._files[name])
+
+    def fingerprint(self) -> Tuple[Tuple[str, int, int], ...]:
+        with self._lock:
+            if self.spilled:
+                return super().fingerprint()
+            return tuple((name, len(self._files[name]), self.version) for name in sorted(self._files))
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Output Writer
+Batches generated mapping and response files and flushes them from a bounded thread pool,
+so CPU-bound example synthesis never waits on filesystem latency
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple, Union
+
+try:
+    from .output_backend import DiskBackend
+except ImportError:
+    from output_backend import DiskBackend
+
+
+class OutputWriteError(Exception):
+    """Raised when one or more queued files could not be written"""
+
+    def __init__(self, failures: List[Tuple[str, Exception]]):
+        self.failures = failures
+        first_path, first_error = failures[0]
+        super().__init__(f"{len(failures)} file(s) failed to write, first: {first_path}: {first_error}")
+
+
+class JsonArrayStream:
+    """Incrementally write a {"<key>": [...]} document, one serialized item at a time"""
+
+    def __init__(self, file_path: str, key: str, compact: bool = False, backend: Optional[DiskBackend] = None):
+        self.file_path = file_path
+        self.compact = compact
+        self.count = 0
+        self.bytes_written = 0
+        # Readers never see a half-written document: it only appears at file_path once closed
+        self._file = (backend or DiskBackend('.')).open_text(file_path)
+        if compact:
+            self._write('{%s:[' % json.dumps(key))
+        else:
+            self._write('{\n  %s: [' % json.dumps(key))
+
+    def _write(self, text: str):
+        self._file.write(text)
+        self.bytes_written += len(text)
+
+    def append(self, serialized_item: str):
+        """Append one serialized item; output matches serializing the whole document at once"""
+        if self.compact:
+            self._write(',' + serialized_item if self.count else serialized_item)
+        else:
+            # Items are serialized with indent=2 and nested two levels deep
+            self._write(',\n    ' if self.count else '\n    ')
+            self._write(serialized_item.replace('\n', '\n    '))
+        self.count += 1
+
+    def close(self):
+        """Finish the document and move it into place"""
+        if self.compact:
+            self._write(']}')
+        else:
+            self._write('\n  ]\n}' if self.count else ']\n}')
+        self._file.close()
+
+    def abort(self):
+        """Discard a partially written document"""
+        self._file.discard()
+
+
+class OutputWriter:
+    """Write serialized payloads to an output backend (disk by default), creating each directory only once"""
+
+    def __init__(self, threads: int = 4, max_pending: int = 256, backend: Optional[DiskBackend] = None):
+        self.threads = max(0, threads)
+        self.max_pending = max(1, max_pending)
+        self.backend = backend or DiskBackend('.')
+        self._init_state()
+
+    def _init_state(self):
+        self._created_dirs = set()
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._failures = []
+        self.files_written = 0
+        self.bytes_written = 0
+
+    def __getstate__(self):
+        # Thread pools and locks can't cross process boundaries; workers start fresh
+        return {'threads': self.threads, 'max_pending': self.max_pending, 'backend': self.backend}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_state()
+
+    def ensure_dir(self, directory: str):
+        """Create a directory (and parents) the first time it is seen"""
+        if directory and directory not in self._created_dirs:
+            self.backend.ensure_dir(directory)
+            self._created_dirs.add(directory)
+
+    def forget_dir(self, directory: str):
+        """A directory was removed behind the writer's back; create it again on the next write"""
+        removed = os.path.abspath(directory)
+        self._created_dirs = {known for known in self._created_dirs if os.path.abspath(known) != removed}
+
+    def write(self, file_path: str, content: Union[str, bytes]):
+        """Queue a serialized payload for writing"""
+        self.ensure_dir(os.path.dirname(file_path))
+        data = content.encode('utf-8') if isinstance(content, str) else content
+
+        # In-memory writes are cheaper than handing them to a thread
+        if self.threads == 0 or not self.backend.on_disk:
+            self._write_file(file_path, data)
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='output-writer')
+
+        # Bound the number of in-flight payloads so memory stays flat on slow filesystems
+        self._slots.acquire()
+        try:
+            self._executor.submit(self._write_queued_file, file_path, data)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def open_array_stream(self, file_path: str, key: str, compact: bool = False) -> JsonArrayStream:
+        """Open a document whose array items are written as they are produced"""
+        self.ensure_dir(os.path.dirname(file_path))
+        return JsonArrayStream(file_path, key, compact, self.backend)
+
+    def _write_queued_file(self, file_path: str, data: bytes):
+        try:
+            self._write_file(file_path, data)
+        finally:
+            self._slots.release()
+
+    def _write_file(self, file_path: str, data: bytes):
+        try:
+            self.backend.write(file_path, data)
+        except Exception as e:
+            with self._lock:
+                self._failures.append((file_path, e))
+            return
+
+        with self._lock:
+            self.files_written += 1
+            self.bytes_written += len(data)
+
+    def flush(self, raise_errors: bool = True):
+        """Wait for all queued writes; raise OutputWriteError if any of them failed"""
+        if self._executor is not None:
+            # Holding every slot means no write is still in flight
+            for _ in range(self.max_pending):
+                self._slots.acquire()
+            for _ in range(self.max_pending):
+                self._slots.release()
+
+        with self._lock:
+            failures, self._failures = self._failures, []
+
+        if failures and raise_errors:
+            raise OutputWriteError(failures)
+
+    def close(self):
+        """Flush outstanding writes and stop the thread pool"""
+        try:
+            self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
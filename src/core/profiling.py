@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Generation Profiler
+Lightweight stage timers and counters for a generation run, attributed per spec and per
+operation, with optional tracemalloc peak tracking and cProfile capture; profiles recorded
+in worker processes are merged into the parent's report
+"""
+
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+# Shared no-op context returned while profiling is disabled
+_DISABLED = contextlib.nullcontext()
+
+
+class Profiler:
+    """Collect timings and counters; every method is a cheap no-op unless enabled.
+
+    With detailed=False only run and stage timings are kept: per-spec, per-operation and counter
+    bookkeeping (and memory or CPU profiling) stay off, for always-on use such as the web metrics.
+    """
+
+    def __init__(self, enabled: bool = False, track_memory: bool = False,
+                 cpu_profile_dir: Optional[str] = None, top: int = 10, detailed: bool = True):
+        self.enabled = enabled
+        self.detailed = enabled and detailed
+        self.track_memory = self.detailed and track_memory
+        self.cpu_profile_dir = cpu_profile_dir if self.detailed else None
+        self.top = top
+        self.reset()
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        self.stages = {}
+        self.counters = {}
+        self.specs = {}
+        self.operations = {}
+        self.cpu_functions = {}
+        self.total_seconds = 0.0
+        self._spec = None
+        self._run_started = None
+        self._cpu_profile = None
+
+    def __getstate__(self):
+        # A profile in flight can't cross process boundaries; workers record into a fresh state
+        state = self.__dict__.copy()
+        state['_cpu_profile'] = None
+        return state
+
+    def stage(self, name: str):
+        """Context manager timing one stage (inclusive of any stage nested inside it)"""
+        if not self.enabled:
+            return _DISABLED
+        return self._timed(name)
+
+    @contextlib.contextmanager
+    def _timed(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._add(self.stages, name, elapsed)
+            if self._spec is not None:
+                self._add(self.specs[self._spec]['stages'], name, elapsed)
+
+    def operation(self, api_name: str, operation: str):
+        """Context manager attributing time to an operation of an API"""
+        if not self.detailed:
+            return _DISABLED
+        return self._timed_operation(f"{api_name} {operation}")
+
+    @contextlib.contextmanager
+    def _timed_operation(self, key: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(self.operations, key, time.perf_counter() - started)
+
+    def count(self, name: str, amount: int = 1):
+        """Increment a counter (also attributed to the current spec)"""
+        if not self.detailed:
+            return
+        self.counters[name] = self.counters.get(name, 0) + amount
+        if self._spec is not None:
+            spec_counters = self.specs[self._spec]['counters']
+            spec_counters[name] = spec_counters.get(name, 0) + amount
+
+    def _add(self, timings: Dict[str, List[float]], key: str, seconds: float):
+        entry = timings.get(key)
+        if entry is None:
+            timings[key] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def start_run(self):
+        """Mark the start of a generation run"""
+        if self.enabled:
+            self._run_started = time.perf_counter()
+
+    def end_run(self):
+        """Mark the end of a generation run"""
+        if self.enabled and self._run_started is not None:
+            self.total_seconds += time.perf_counter() - self._run_started
+            self._run_started = None
+
+    def begin_spec(self, api_name: str):
+        """Attribute subsequent stages and counters to a spec"""
+        if not self.detailed:
+            return
+        self._spec = api_name
+        self.specs.setdefault(api_name, {'seconds': 0.0, 'mappings': 0, 'peak_memory_bytes': None,
+                                         'stages': {}, 'counters': {}})
+        self.specs[api_name]['_started'] = time.perf_counter()
+
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+        if self.cpu_profile_dir:
+            self._cpu_profile = cProfile.Profile()
+            self._cpu_profile.enable()
+
+    def end_spec(self, mappings: int = 0):
+        """Close the current spec's scope"""
+        if not self.detailed or self._spec is None:
+            return
+        entry = self.specs[self._spec]
+        entry['seconds'] += time.perf_counter() - entry.pop('_started')
+        entry['mappings'] += mappings
+
+        if self.track_memory and tracemalloc.is_tracing():
+            entry['peak_memory_bytes'] = max(entry['peak_memory_bytes'] or 0, tracemalloc.get_traced_memory()[1])
+
+        if self._cpu_profile is not None:
+            self._cpu_profile.disable()
+            self._record_cpu_profile(self._spec, self._cpu_profile)
+            self._cpu_profile = None
+
+        self._spec = None
+
+    def _record_cpu_profile(self, api_name: str, profile: cProfile.Profile):
+        os.makedirs(self.cpu_profile_dir, exist_ok=True)
+        profile.dump_stats(os.path.join(self.cpu_profile_dir, f"{api_name}.prof"))
+
+        stats = pstats.Stats(profile, stream=io.StringIO())
+        for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+            key = f"{os.path.basename(filename)}:{line}({function})"
+            entry = self.cpu_functions.setdefault(key, [0, 0.0, 0.0])
+            entry[0] += calls
+            entry[1] += own
+            entry[2] += cumulative
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Raw recorded state, picklable, for merging into another profiler"""
+        return {
+            'stages': self.stages,
+            'counters': self.counters,
+            'specs': self.specs,
+            'operations': self.operations,
+            'cpu_functions': self.cpu_functions
+        }
+
+    def merge(self, snapshot: Optional[Dict[str, Any]]):
+        """Fold a snapshot recorded elsewhere (e.g. in a worker process) into this profiler"""
+        if not self.enabled or not snapshot:
+            return
+        for key, (calls, seconds) in snapshot['stages'].items():
+            self._merge_timing(self.stages, key, calls, seconds)
+        for key, (calls, seconds) in snapshot['operations'].items():
+            self._merge_timing(self.operations, key, calls, seconds)
+        for name, amount in snapshot['counters'].items():
+            self.counters[name] = self.counters.get(name, 0) + amount
+        for key, values in snapshot['cpu_functions'].items():
+            entry = self.cpu_functions.setdefault(key, [0, 0.0, 0.0])
+            for index, value in enumerate(values):
+                entry[index] += value
+        for api_name, spec in snapshot['specs'].items():
+            self.specs[api_name] = spec
+
+    def _merge_timing(self, timings: Dict[str, List[float]], key: str, calls: int, seconds: float):
+        entry = timings.setdefault(key, [0, 0.0])
+        entry[0] += calls
+        entry[1] += seconds
+
+    def report(self) -> Dict[str, Any]:
+        """Machine-readable report, slowest entries first"""
+        def timings(entries: Dict[str, List[float]]) -> Dict[str, Dict[str, Any]]:
+            return {
+                name: {'calls': calls, 'seconds': round(seconds, 6)}
+                for name, (calls, seconds) in sorted(entries.items(), key=lambda item: -item[1][1])
+            }
+
+        specs = [
+            {
+                'api_name': api_name,
+                'seconds': round(spec['seconds'], 6),
+                'mappings': spec['mappings'],
+                'peak_memory_bytes': spec['peak_memory_bytes'],
+                'stages': timings(spec['stages']),
+                'counters': spec['counters']
+            }
+            for api_name, spec in sorted(self.specs.items(), key=lambda item: -item[1]['seconds'])
+        ]
+
+        operations = [
+            {'operation': key, 'calls': calls, 'seconds': round(seconds, 6)}
+            for key, (calls, seconds) in sorted(self.operations.items(), key=lambda item: -item[1][1])
+        ]
+
+        report = {
+            'total_seconds': round(self.total_seconds, 6),
+            'stages': timings(self.stages),
+            'counters': dict(sorted(self.counters.items())),
+            'specs': specs,
+            'slowest_operations': operations[:self.top * 5],
+            'operation_count': len(operations)
+        }
+
+        if self.cpu_functions:
+            report['cpu_profile_dir'] = self.cpu_profile_dir
+            report['cpu_hotspots'] = [
+                {'function': key, 'calls': calls, 'own_seconds': round(own, 6), 'cumulative_seconds': round(cumulative, 6)}
+                for key, (calls, own, cumulative) in sorted(self.cpu_functions.items(), key=lambda item: -item[1][1])
+            ][:self.top * 5]
+
+        return report
+
+    def write_report(self, report_file: str, extra: Optional[Dict[str, Any]] = None):
+        """Write the JSON report"""
+        report = dict(extra or {})
+        report.update(self.report())
+        directory = os.path.dirname(os.path.abspath(report_file))
+        os.makedirs(directory, exist_ok=True)
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    def print_summary(self):
+        """Human-readable summary of the slowest stages, specs and operations"""
+        if not self.enabled:
+            return
+        report = self.report()
+        top = self.top
+
+        print(f"\n⏱️  Profile ({report['total_seconds']:.3f}s total, stage times are inclusive)")
+        print("  Stages:")
+        for name, timing in list(report['stages'].items())[:top]:
+            print(f"    {name:<24} {timing['seconds']:>9.3f}s  {timing['calls']:>8} calls")
+        print("  Slowest specs:")
+        for spec in report['specs'][:top]:
+            memory = f", peak {spec['peak_memory_bytes'] / (1024 * 1024):.1f} MiB" if spec['peak_memory_bytes'] else ''
+            print(f"    {spec['api_name']:<24} {spec['seconds']:>9.3f}s  {spec['mappings']:>8} mappings{memory}")
+        print("  Slowest operations:")
+        for operation in report['slowest_operations'][:top]:
+            print(f"    {operation['operation']:<48} {operation['seconds']:>9.3f}s")
+        if report.get('cpu_hotspots'):
+            print(f"  CPU hotspots (own time, raw profiles in {report['cpu_profile_dir']}):")
+            for hotspot in report['cpu_hotspots'][:top]:
+                print(f"    {hotspot['function']:<48} {hotspot['own_seconds']:>9.3f}s")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Spec Loader
+Parses OpenAPI specs with the fastest available parser and keeps an optional on-disk cache
+of parsed documents so repeat runs skip YAML parsing entirely
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from typing import Any, Dict, Optional
+
+# Try to import yaml, but make it optional
+try:
+    import yaml
+    HAS_YAML = True
+    # libyaml-backed loader is an order of magnitude faster than the pure-Python one
+    YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+except ImportError:
+    HAS_YAML = False
+    YAML_LOADER = None
+
+JSON_EXTENSIONS = {'.json'}
+YAML_EXTENSIONS = {'.yaml', '.yml'}
+
+# Bump when the cached representation changes
+CACHE_FORMAT_VERSION = 1
+
+
+def parser_name(spec_file: str) -> str:
+    """The parser parse_spec_content uses for a file; part of the cache key, as parsers may disagree"""
+    extension = os.path.splitext(spec_file)[1].lower()
+    yaml_parser = YAML_LOADER.__name__ if HAS_YAML else 'json'
+    if extension in JSON_EXTENSIONS:
+        return 'json'
+    if extension in YAML_EXTENSIONS:
+        return yaml_parser
+    return f"json+{yaml_parser}"
+
+
+def parse_spec_content(content: bytes, spec_file: str) -> Dict[str, Any]:
+    """Parse raw spec content, choosing the parser from the file extension"""
+    extension = os.path.splitext(spec_file)[1].lower()
+
+    if extension in JSON_EXTENSIONS:
+        return json.loads(content)
+
+    if extension in YAML_EXTENSIONS:
+        if not HAS_YAML:
+            # JSON is valid YAML, so a JSON document with a YAML extension still loads
+            return json.loads(content)
+        return yaml.load(content, Loader=YAML_LOADER)
+
+    # Unknown extension: try JSON first, then YAML if available
+    try:
+        return json.loads(content)
+    except ValueError:
+        if HAS_YAML:
+            return yaml.load(content, Loader=YAML_LOADER)
+        raise Exception("File is not valid JSON and YAML module is not available")
+
+
+class SpecCache:
+    """On-disk cache of parsed specs keyed by content hash and parser.
+
+    The key doesn't involve the file's path or mtime, so the same spec uploaded again into another
+    directory (as every web session does) still reuses the earlier parse.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 512):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def _cache_path(self, spec_file: str, content: bytes) -> str:
+        key = '|'.join([
+            str(CACHE_FORMAT_VERSION),
+            parser_name(spec_file),
+            hashlib.sha256(content).hexdigest()
+        ])
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.pickle')
+
+    def load(self, spec_file: str) -> Dict[str, Any]:
+        """Return the parsed spec, reusing a cached parse when the file is unchanged"""
+        with open(spec_file, 'rb') as f:
+            content = f.read()
+
+        cache_path = self._cache_path(spec_file, content)
+        try:
+            with open(cache_path, 'rb') as f:
+                spec = pickle.load(f)
+            self.hits += 1
+            self._touch(cache_path)
+            return spec
+        except FileNotFoundError:
+            pass
+        except Exception:
+            # Corrupt or incompatible entry: fall through and reparse
+            pass
+
+        self.misses += 1
+        spec = parse_spec_content(content, spec_file)
+        self._store(cache_path, spec)
+        return spec
+
+    def _store(self, cache_path: str, spec: Dict[str, Any]):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(spec, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+            self._prune()
+        except Exception as e:
+            print(f"Warning: Could not cache parsed spec: {e}")
+
+    def _touch(self, cache_path: str):
+        """Mark an entry as just used, so pruning keeps it"""
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+
+    def _prune(self):
+        """Keep only the most recently used entries"""
+        entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith('.pickle')]
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+def load_spec(spec_file: str, cache: Optional[SpecCache] = None) -> Dict[str, Any]:
+    """Load an OpenAPI spec from disk, through the parsed-spec cache when one is given"""
+    if cache is not None:
+        return cache.load(spec_file)
+
+    with open(spec_file, 'rb') as f:
+        return parse_spec_content(f.read(), spec_file)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Spec Registry
+Discovers OpenAPI spec files once per run and parses each of them at most once, sharing the
+parsed documents and derived metadata between discovery, naming, mapping and Java generation
+"""
+
+import glob
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+# Look for common spec file patterns
+SPEC_PATTERNS = ['*.yaml', '*.yml', '*.json']
+
+HTTP_METHODS = ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']
+
+
+def build_component_index(spec: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Index every reusable component of a spec by its local $ref pointer"""
+    index = {}
+
+    for kind, entries in (spec.get('components') or {}).items():
+        if isinstance(entries, dict):
+            for name, definition in entries.items():
+                index[f"#/components/{kind}/{name}"] = definition
+
+    # Swagger 2.0 keeps schemas under top-level definitions
+    for name, definition in (spec.get('definitions') or {}).items():
+        index[f"#/definitions/{name}"] = definition
+
+    return index
+
+
+def count_operations(spec: Dict[str, Any]) -> int:
+    """Number of operations with a supported HTTP method"""
+    return sum(
+        1
+        for path_item in (spec.get('paths') or {}).values()
+        if isinstance(path_item, dict)
+        for method in path_item
+        if method.upper() in HTTP_METHODS
+    )
+
+
+class SpecRegistry:
+    """Single source of discovered specs and their parsed documents for one generation run"""
+
+    def __init__(self, spec_dir: str, loader: Callable[[str], Dict[str, Any]]):
+        self.spec_dir = spec_dir
+        self.loader = loader
+        self._specs = None
+        self._documents = {}
+        self._component_indexes = {}
+        self._metadata = {}
+        self.parse_count = 0
+
+    def __getstate__(self):
+        # Parsed documents stay in the parent process; workers parse only the spec they are given
+        state = self.__dict__.copy()
+        state['_documents'] = {}
+        state['_component_indexes'] = {}
+        return state
+
+    def discover(self, api_namer: Callable[[str], str], refresh: bool = False) -> List[Dict[str, str]]:
+        """Glob the spec directory once and name every spec; later calls reuse the result"""
+        if self._specs is not None and not refresh:
+            return self._specs
+
+        if refresh:
+            # Drop documents of specs that disappeared or may have changed
+            self._documents.clear()
+            self._component_indexes.clear()
+            self._metadata.clear()
+
+        specs = []
+        for pattern in SPEC_PATTERNS:
+            for spec_file in sorted(glob.glob(os.path.join(self.spec_dir, pattern))):
+                specs.append({
+                    'file': spec_file,
+                    'api_name': api_namer(spec_file),
+                    'filename': os.path.basename(spec_file)
+                })
+
+        self._specs = specs
+
+        print(f"✓ Discovered {len(specs)} API specifications")
+        for spec in specs:
+            print(f"  - {spec['api_name']}: {spec['filename']}")
+
+        return specs
+
+    @property
+    def specs(self) -> List[Dict[str, str]]:
+        """Specs found by the last discovery (empty before discovery)"""
+        return self._specs or []
+
+    def document(self, spec_file: str) -> Dict[str, Any]:
+        """Parsed spec document, loaded on first use"""
+        if spec_file not in self._documents:
+            self._documents[spec_file] = self.loader(spec_file)
+            self.parse_count += 1
+        return self._documents[spec_file]
+
+    def component_index(self, spec_file: str) -> Dict[str, Dict[str, Any]]:
+        """$ref pointer index of a spec's components, built once"""
+        if spec_file not in self._component_indexes:
+            self._component_indexes[spec_file] = build_component_index(self.document(spec_file))
+        return self._component_indexes[spec_file]
+
+    def metadata(self, spec_info: Dict[str, str]) -> Dict[str, Any]:
+        """Descriptive metadata of a discovered spec, computed once"""
+        spec_file = spec_info['file']
+        if spec_file not in self._metadata:
+            spec = self.document(spec_file)
+            info = spec.get('info') or {}
+            self._metadata[spec_file] = {
+                'api_name': spec_info['api_name'],
+                'filename': spec_info['filename'],
+                'title': info.get('title'),
+                'version': info.get('version'),
+                'operation_count': count_operations(spec)
+            }
+        return self._metadata[spec_file]
+
+    def recorded_metadata(self, spec_file: str) -> Optional[Dict[str, Any]]:
+        """Metadata computed or recorded so far, without parsing the spec for it"""
+        return self._metadata.get(spec_file)
+
+    def record_metadata(self, spec_file: str, metadata: Dict[str, Any]):
+        """Adopt metadata computed elsewhere (e.g. by a worker process) without reparsing"""
+        self._metadata[spec_file] = metadata
+
+    def release(self, spec_file: str):
+        """Forget a parsed document to bound memory (metadata is kept)"""
+        self._documents.pop(spec_file, None)
+        self._component_indexes.pop(spec_file, None)
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Spec Watcher
+Polls the spec directory, regenerates only the specs that changed and pushes the resulting
+mapping and __files differences to a running WireMock through its admin API
+"""
+
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .spec_registry import SPEC_PATTERNS
+    from .wiremock_admin import WireMockAdminClient, WireMockAdminError, DEFAULT_WIREMOCK_URL
+except ImportError:
+    from spec_registry import SPEC_PATTERNS
+    from wiremock_admin import WireMockAdminClient, WireMockAdminError, DEFAULT_WIREMOCK_URL
+
+
+def _mapping_fingerprint(mapping: Dict[str, Any]) -> str:
+    return json.dumps(mapping, sort_keys=True)
+
+
+class SpecWatcher:
+    """Keep a generator's output (and optionally a WireMock server) in sync with a spec directory"""
+
+    def __init__(self, generator, admin_client: Optional[WireMockAdminClient] = None,
+                 interval: float = 0.5, debounce: float = 0.1):
+        if not generator.deterministic:
+            # Mapping ids must be stable across runs, otherwise every edit looks like remove-all/add-all
+            raise ValueError("Watch mode requires a generator in deterministic mode")
+        self.generator = generator
+        self.admin_client = admin_client
+        self.interval = interval
+        self.debounce = debounce
+        self._snapshot = {}
+        # Per spec file: api_name, output files, mappings by id and __files content hashes
+        self.state = {}
+        # Per spec file: the state WireMock last accepted; specs whose changes it hasn't taken yet
+        self.pushed = {}
+        self.unpushed = set()
+        self._failed = set()
+        # Set until a full sync succeeds (WireMock's contents are unknown until then), with the APIs
+        # removed meanwhile whose stubs the sync has to drop
+        self.needs_sync = False
+        self._removed_apis = set()
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Modification time and size of every spec file"""
+        snapshot = {}
+        for pattern in SPEC_PATTERNS:
+            for spec_file in glob.glob(os.path.join(self.generator.spec_dir, pattern)):
+                try:
+                    stat = os.stat(spec_file)
+                except OSError:
+                    continue
+                snapshot[spec_file] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def load_spec_state(self, api_name: str, output_files: List[str]) -> Dict[str, Any]:
+        """Read back the mappings and response files a spec produced"""
+        mappings = {}
+        files = {}
+        for relative_path in output_files:
+            path = os.path.join(self.generator.output_dir, relative_path)
+            try:
+                with open(path, 'rb') as f:
+                    content = f.read()
+            except OSError:
+                continue
+            if relative_path.startswith('mappings/'):
+                for mapping in json.loads(content).get('mappings', []):
+                    mappings[mapping['id']] = mapping
+            elif relative_path.startswith('__files/'):
+                files[relative_path[len('__files/'):]] = hashlib.sha256(content).hexdigest()
+        return {'api_name': api_name, 'outputs': list(output_files), 'mappings': mappings, 'files': files}
+
+    def start(self, summary: Dict[str, Any]):
+        """Adopt the result of an initial full generation as the watched state"""
+        self._snapshot = self.snapshot()
+        manifest_entries = self.generator.load_manifest()['specs'] if self.generator.incremental else {}
+        generated = {spec['filename']: spec for spec in summary.get('specs', [])}
+
+        for spec_info in self.generator.registry.specs:
+            spec_result = generated.get(spec_info['filename'])
+            if spec_result is not None:
+                if spec_result['error']:
+                    continue
+                output_files = spec_result['files']
+            else:
+                # Skipped as unchanged by incremental mode: its outputs are listed in the manifest
+                output_files = manifest_entries.get(self.generator._spec_key(spec_info), {}).get('files', [])
+            self.state[spec_info['file']] = self.load_spec_state(spec_info['api_name'], output_files)
+            if self._edited_after(spec_info['file'], output_files):
+                # Saved while the initial run was reading it: let the first poll regenerate it
+                self._snapshot.pop(spec_info['file'], None)
+
+        if self.admin_client is not None:
+            error = self.sync()
+            if error:
+                print(f"⚠️  Could not sync WireMock: {error}; retrying on each poll")
+
+    def _edited_after(self, spec_file: str, output_files: List[str]) -> bool:
+        output_mtimes = []
+        for relative_path in output_files:
+            try:
+                output_mtimes.append(os.stat(os.path.join(self.generator.output_dir, relative_path)).st_mtime_ns)
+            except OSError:
+                continue
+        return bool(output_mtimes) and spec_file in self._snapshot and self._snapshot[spec_file][0] > min(output_mtimes)
+
+    def sync(self) -> Optional[str]:
+        """Bring WireMock in line with the watched state: import every mapping, upload every response
+        file and drop stale stubs of the watched APIs (e.g. left over from a run with random ids).
+
+        Returns the error that stopped it, if any; the sync is then repeated by the next poll.
+        """
+        started = time.perf_counter()
+        self.needs_sync = True
+        mappings = [mapping for spec in self.state.values() for mapping in spec['mappings'].values()]
+        api_names = {spec['api_name'] for spec in self.state.values()} | self._removed_apis
+        local_ids = {mapping['id'] for mapping in mappings}
+
+        try:
+            stale = [
+                mapping['id'] for mapping in self.admin_client.list_mappings()
+                if (mapping.get('metadata') or {}).get('api_name') in api_names and mapping.get('id') not in local_ids
+            ]
+            self.admin_client.import_mappings(mappings)
+            for mapping_id in stale:
+                self.admin_client.delete_mapping(mapping_id)
+            for spec in self.state.values():
+                for name in spec['files']:
+                    self.admin_client.put_file(name, self._read_file(name))
+        except WireMockAdminError as e:
+            return str(e)
+
+        self.pushed = dict(self.state)
+        self.unpushed.clear()
+        self._failed.clear()
+        self.needs_sync = False
+        self._removed_apis.clear()
+        print(f"🔄 Synced {len(mappings)} mappings to WireMock ({len(stale)} stale removed) "
+              f"in {time.perf_counter() - started:.2f}s")
+
+    def _read_file(self, name: str) -> bytes:
+        with open(os.path.join(self.generator.files_dir, name), 'rb') as f:
+            return f.read()
+
+    def _wait_until_stable(self, snapshot: Dict[str, Tuple[int, int]]) -> Dict[str, Tuple[int, int]]:
+        """Editors save in several steps; wait until the directory stops changing"""
+        while True:
+            time.sleep(self.debounce)
+            current = self.snapshot()
+            if current == snapshot:
+                return current
+            snapshot = current
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Regenerate changed specs and push their differences; returns one diff per affected spec.
+
+        Changes WireMock didn't accept stay pending and are pushed again by the following polls.
+        """
+        current = self.snapshot()
+        diffs = self.regenerate(current) if current != self._snapshot else []
+
+        if self.admin_client is not None and (self.needs_sync or self.unpushed):
+            started = time.perf_counter()
+            # Specs left over from earlier polls, as opposed to the ones changed just now
+            retried = {self._api_name(spec_file) for spec_file in self.unpushed} - {diff['api_name'] for diff in diffs}
+            error = self.push_pending()
+            if retried and error is None and not self.needs_sync:
+                print(f"🔁 Pushed pending changes of {', '.join(sorted(retried))}")
+            for diff in diffs:
+                diff['pushed'] = not self.needs_sync and diff['spec_file'] not in self.unpushed
+                if diff['pushed']:
+                    diff['push_seconds'] = time.perf_counter() - started
+                else:
+                    diff['push_error'] = error
+
+        for diff in diffs:
+            self.report(diff)
+        return diffs
+
+    def regenerate(self, current: Dict[str, Tuple[int, int]]) -> List[Dict[str, Any]]:
+        """Regenerate the specs that changed since the last snapshot; returns their local diffs"""
+        current = self._wait_until_stable(current)
+        changed = [spec_file for spec_file in current if self._snapshot.get(spec_file) != current[spec_file]]
+        removed = [spec_file for spec_file in self._snapshot if spec_file not in current]
+        self._snapshot = current
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            specs = {spec_info['file']: spec_info for spec_info in self.generator.discover_specs(refresh=True)}
+
+        diffs = []
+        for spec_file in removed:
+            previous = self.state.pop(spec_file, None)
+            if previous is not None:
+                self.generator.remove_outputs(previous['outputs'])
+                if self.needs_sync:
+                    self._removed_apis.add(previous['api_name'])
+                diffs.append(self._local_diff(spec_file, previous, None))
+
+        for spec_file in changed:
+            spec_info = specs.get(spec_file)
+            if spec_info is None:
+                continue
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = self.generator.generate_spec_mappings(spec_info)
+            if result['error']:
+                # Keep serving the last good stubs until the spec is fixed
+                print(f"❌ {spec_info['api_name']}: {result['error']}")
+                continue
+
+            previous = self.state.get(spec_file)
+            current_state = self.load_spec_state(spec_info['api_name'], result['files'])
+            if previous is not None:
+                self.generator.remove_outputs(sorted(set(previous['outputs']) - set(result['files'])))
+                if previous['api_name'] != current_state['api_name']:
+                    diffs.append(self._local_diff(spec_file, previous, None))
+                    previous = None
+            self.state[spec_file] = current_state
+
+            diff = self._local_diff(spec_file, previous, current_state)
+            diff['generation_seconds'] = time.perf_counter() - started
+            diffs.append(diff)
+
+        if diffs and self.generator.incremental:
+            self.save_manifest()
+        return diffs
+
+    def _local_diff(self, spec_file: str, previous: Optional[Dict[str, Any]],
+                    current: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        diff = self.diff(previous, current)
+        diff['spec_file'] = spec_file
+        diff['pushed'] = False
+        if self.admin_client is not None:
+            self.unpushed.add(spec_file)
+        return diff
+
+    def _api_name(self, spec_file: str) -> str:
+        spec_state = self.state.get(spec_file) or self.pushed.get(spec_file)
+        return spec_state['api_name'] if spec_state else os.path.basename(spec_file)
+
+    def push_pending(self) -> Optional[str]:
+        """Push every spec whose current state WireMock doesn't have yet, diffed against the state it
+        last accepted; returns the error that stopped it, if any"""
+        if self.needs_sync:
+            return self.sync()
+        for spec_file in sorted(self.unpushed):
+            diff = self.diff(self.pushed.get(spec_file), self.state.get(spec_file))
+            # A failed push may have been applied in part, so added stubs could already exist
+            diff['retry'] = spec_file in self._failed
+            self.push(diff)
+            if not diff['pushed']:
+                # Most likely WireMock is down: leave the rest for the next poll
+                self._failed.add(spec_file)
+                return diff['push_error']
+            self._failed.discard(spec_file)
+            if spec_file in self.state:
+                self.pushed[spec_file] = self.state[spec_file]
+            else:
+                self.pushed.pop(spec_file, None)
+            self.unpushed.discard(spec_file)
+        return None
+
+    def save_manifest(self):
+        """Record the watched state so the next incremental run skips specs regenerated here"""
+        spec_entries = {}
+        previous_entries = self.generator.load_manifest()['specs']
+        for spec_info in self.generator.registry.specs:
+            spec_state = self.state.get(spec_info['file'])
+            if spec_state is None:
+                continue
+            key = self.generator._spec_key(spec_info)
+            spec_entries[key] = {
+                'api_name': spec_state['api_name'],
+                'spec_hash': self.generator.spec_hash(spec_info['file']),
+                'mappings': len(spec_state['mappings']),
+                'files': spec_state['outputs']
+            }
+            metadata = (self.generator.registry.recorded_metadata(spec_info['file']) or
+                        previous_entries.get(key, {}).get('metadata'))
+            if metadata:
+                spec_entries[key]['metadata'] = metadata
+        self.generator.save_manifest(spec_entries)
+
+    def diff(self, previous: Optional[Dict[str, Any]], current: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Mappings and response files that were added, changed or removed between two spec states"""
+        empty = {'api_name': None, 'mappings': {}, 'files': {}}
+        previous = previous or empty
+        current = current or empty
+        old_mappings, new_mappings = previous['mappings'], current['mappings']
+        old_files, new_files = previous['files'], current['files']
+
+        return {
+            'api_name': current['api_name'] or previous['api_name'],
+            'added': [mapping for mapping_id, mapping in new_mappings.items() if mapping_id not in old_mappings],
+            'changed': [
+                mapping for mapping_id, mapping in new_mappings.items()
+                if mapping_id in old_mappings and
+                _mapping_fingerprint(mapping) != _mapping_fingerprint(old_mappings[mapping_id])
+            ],
+            'removed': [mapping_id for mapping_id in old_mappings if mapping_id not in new_mappings],
+            'files_changed': [name for name, digest in new_files.items() if old_files.get(name) != digest],
+            'files_removed': [name for name in old_files if name not in new_files]
+        }
+
+    def push(self, diff: Dict[str, Any]):
+        """Apply a diff through the admin API: bodies first, so new stubs never point at missing files"""
+        diff['pushed'] = False
+        if self.admin_client is None:
+            return
+        started = time.perf_counter()
+        try:
+            for name in diff['files_changed']:
+                self.admin_client.put_file(name, self._read_file(name))
+            for mapping in diff['added']:
+                if diff.get('retry'):
+                    self.admin_client.update_mapping(mapping)
+                else:
+                    self.admin_client.create_mapping(mapping)
+            for mapping in diff['changed']:
+                self.admin_client.update_mapping(mapping)
+            for mapping_id in diff['removed']:
+                self.admin_client.delete_mapping(mapping_id)
+            for name in diff['files_removed']:
+                self.admin_client.delete_file(name)
+        except WireMockAdminError as e:
+            diff['push_error'] = str(e)
+            return
+        diff['pushed'] = True
+        diff['push_seconds'] = time.perf_counter() - started
+
+    def report(self, diff: Dict[str, Any]):
+        counts = (f"+{len(diff['added'])} ~{len(diff['changed'])} -{len(diff['removed'])} mappings, "
+                  f"{len(diff['files_changed'])} files updated, {len(diff['files_removed'])} removed")
+        timing = f"generated in {diff['generation_seconds']:.3f}s" if 'generation_seconds' in diff else 'spec removed'
+        if diff.get('push_error'):
+            print(f"⚠️  {diff['api_name']}: {counts} ({timing}); push failed: {diff['push_error']}")
+        elif diff['pushed']:
+            print(f"🔁 {diff['api_name']}: {counts} ({timing}, pushed in {diff['push_seconds']:.3f}s)")
+        else:
+            print(f"🔁 {diff['api_name']}: {counts} ({timing})")
+
+    def run(self, summary: Dict[str, Any]):
+        """Watch until interrupted"""
+        self.start(summary)
+        target = f" and pushing changes to {self.admin_client.base_url}" if self.admin_client else ''
+        print(f"👀 Watching {self.generator.spec_dir}{target} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(self.interval)
+                self.poll()
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+        finally:
+            self.generator.writer.close()
+            if self.admin_client is not None:
+                self.admin_client.close()
+
+
+def default_wiremock_url() -> str:
+    """WireMock server to push to: $WIREMOCK_URL or the local default"""
+    return os.environ.get('WIREMOCK_URL', DEFAULT_WIREMOCK_URL)
+
+
+def watch_specs(generator, summary: Dict[str, Any], wiremock_url: Optional[str] = None, interval: float = 0.5):
+    """Watch the generator's spec directory after an initial run; push to WireMock unless wiremock_url is None"""
+    admin_client = None
+    if wiremock_url:
+        try:
+            admin_client = WireMockAdminClient(wiremock_url)
+        except WireMockAdminError as e:
+            print(f"⚠️  {e}; watching without pushing")
+        else:
+            if not admin_client.health():
+                print(f"⚠️  WireMock is not reachable at {wiremock_url}; changes will be pushed once it is back")
+
+    SpecWatcher(generator, admin_client, interval=interval).run(summary)
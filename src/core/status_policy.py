@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Status Policy
+Decides which response status codes get a mapping for each operation: every known scenario
+(full), only the responses the operation declares (declared), or the declared responses
+plus a configurable set of extra scenarios (declared-extras), per API and per tag
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    from .spec_loader import parse_spec_content
+except ImportError:
+    from spec_loader import parse_spec_content
+
+# Status matrix policies:
+#   full            - a mapping for every known status code (legacy behaviour)
+#   declared        - only the status codes the operation declares in its responses
+#   declared-extras - declared status codes plus the configured extras
+STATUS_POLICIES = ['full', 'declared', 'declared-extras']
+
+# Scenarios every client should handle, added by declared-extras unless configured otherwise
+DEFAULT_EXTRA_STATUS_CODES = [401, 500]
+
+# Response keys such as 4XX cover a whole class of status codes
+STATUS_RANGE_PATTERN = re.compile(r'^([1-5])XX$', re.IGNORECASE)
+
+
+def parse_status_codes(value: Any) -> List[int]:
+    """Status codes from a list or a comma-separated string"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = [part for part in value.split(',') if part.strip()]
+    return [int(code) for code in value]
+
+
+class StatusPolicy:
+    """Per-API and per-tag selection of the status codes to generate mappings for"""
+
+    def __init__(self, policy: str = 'full', extras: Optional[Iterable[int]] = None,
+                 config: Optional[Dict[str, Any]] = None):
+        self.default = self._validate({
+            'policy': policy,
+            'extras': list(DEFAULT_EXTRA_STATUS_CODES if extras is None else extras)
+        }, 'command line')
+
+        config = config or {}
+        # Config file entries are overlays: each may set policy, extras or both
+        if config.get('default'):
+            self.default = self._merge(self.default, config['default'], 'default')
+        self.apis = {name: self._overlay(entry, f"apis.{name}") for name, entry in (config.get('apis') or {}).items()}
+        self.tags = {name: self._overlay(entry, f"tags.{name}") for name, entry in (config.get('tags') or {}).items()}
+
+    @classmethod
+    def from_file(cls, config_file: str, policy: str = 'full', extras: Optional[Iterable[int]] = None) -> 'StatusPolicy':
+        """Load a JSON or YAML policy config file"""
+        try:
+            with open(config_file, 'rb') as f:
+                config = parse_spec_content(f.read(), config_file)
+        except Exception as e:
+            raise Exception(f"Failed to load status policy config {config_file}: {e}")
+        if not isinstance(config, dict):
+            raise ValueError(f"Status policy config {config_file} must be a mapping")
+        return cls(policy, extras, config)
+
+    def _overlay(self, entry: Dict[str, Any], where: str) -> Dict[str, Any]:
+        overlay = {}
+        if 'policy' in (entry or {}):
+            overlay['policy'] = entry['policy']
+        if 'extras' in (entry or {}):
+            overlay['extras'] = parse_status_codes(entry['extras'])
+        return self._validate(overlay, where)
+
+    def _merge(self, base: Dict[str, Any], entry: Dict[str, Any], where: str) -> Dict[str, Any]:
+        merged = dict(base)
+        merged.update(self._overlay(entry, where))
+        return merged
+
+    def _validate(self, entry: Dict[str, Any], where: str) -> Dict[str, Any]:
+        if 'policy' in entry and entry['policy'] not in STATUS_POLICIES:
+            raise ValueError(f"Unknown status policy '{entry['policy']}' in {where}, expected one of {STATUS_POLICIES}")
+        return entry
+
+    def resolve(self, api_name: str, operation: Dict[str, Any]) -> Dict[str, Any]:
+        """Effective policy of an operation: tag settings override API settings, which override the default"""
+        effective = dict(self.default)
+        effective.update(self.apis.get(api_name, {}))
+        # The first tag of the operation that has settings wins
+        for tag in operation.get('tags') or []:
+            if tag in self.tags:
+                effective.update(self.tags[tag])
+                break
+        return effective
+
+    def declared_status_codes(self, operation: Dict[str, Any], known_codes: Iterable[int]) -> List[int]:
+        """Status codes declared in an operation's responses (ranges expand to the known codes)"""
+        known_codes = list(known_codes)
+        declared = []
+        for key in (operation.get('responses') or {}):
+            key = str(key).strip()
+            if key.isdigit():
+                declared.append(int(key))
+                continue
+            match = STATUS_RANGE_PATTERN.match(key)
+            if match:
+                status_class = int(match.group(1))
+                declared.extend(code for code in known_codes if code // 100 == status_class)
+            # 'default' describes unexpected errors and doesn't name a status code
+        return declared
+
+    def select(self, api_name: str, operation: Dict[str, Any], known_codes: Iterable[int]) -> List[int]:
+        """Status codes to generate mappings for, in ascending order"""
+        known_codes = list(known_codes)
+        effective = self.resolve(api_name, operation)
+        if effective['policy'] == 'full':
+            return known_codes
+
+        declared = self.declared_status_codes(operation, known_codes)
+        if not declared:
+            # Nothing declared: generating nothing would leave the operation unmocked
+            return known_codes
+
+        codes = set(declared)
+        if effective['policy'] == 'declared-extras':
+            codes.update(effective['extras'])
+        return sorted(codes)
+
+    def describe(self) -> Dict[str, Any]:
+        """Plain representation, used to invalidate incremental results when the policy changes"""
+        return {'default': self.default, 'apis': self.apis, 'tags': self.tags}
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+WireMock Admin Client
+Thin client for the WireMock admin API over a pooled keep-alive session: stub mappings by id,
+bulk import and __files management, with retries and exponential backoff on transient failures
+and an optional circuit breaker that fails fast while the server is down
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+# Try to import requests, but make it optional
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    HAS_REQUESTS = True
+    REQUEST_ERRORS = (requests.RequestException,)
+except ImportError:
+    HAS_REQUESTS = False
+    REQUEST_ERRORS = (OSError,)
+
+DEFAULT_WIREMOCK_URL = 'http://localhost:8080'
+
+# Responses worth retrying: the server (or a proxy in front of it) is briefly unavailable
+RETRY_STATUSES = (502, 503, 504)
+
+
+class WireMockAdminError(Exception):
+    """Raised when the WireMock admin API is unreachable or rejects a call"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        self.status_code = status_code
+        super().__init__(message)
+
+
+class CircuitBreaker:
+    """Stop calling a server after repeated failures, then let a single probe through after reset_timeout.
+
+    closed: calls pass; open: calls fail immediately; half-open: one trial call decides whether
+    the circuit closes again or stays open for another reset_timeout.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may go out now"""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                # A failed trial re-opens the circuit for a full reset_timeout
+                self.opened_at = time.monotonic()
+
+
+class WireMockAdminClient:
+    """Call the WireMock admin API of one server"""
+
+    def __init__(self, base_url: str = DEFAULT_WIREMOCK_URL, timeout: float = 10.0, session=None,
+                 pool_size: int = 10, retries: int = 3, backoff: float = 0.25,
+                 breaker: Optional[CircuitBreaker] = None):
+        if session is None and not HAS_REQUESTS:
+            raise WireMockAdminError("The requests package is required to talk to WireMock")
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.breaker = breaker
+        if session is None:
+            # One connection per concurrent caller, reused across calls
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+
+    def _request(self, method: str, path: str, allowed_statuses: Iterable[int] = (), retry: bool = True, **kwargs):
+        url = f"{self.base_url}/__admin{path}"
+        if self.breaker is not None and not self.breaker.allow():
+            raise WireMockAdminError(f"{method} {url} skipped: WireMock is unavailable (circuit open)")
+        for attempt in range(self.retries + 1 if retry else 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except REQUEST_ERRORS as e:
+                error = WireMockAdminError(f"{method} {url} failed: {e}")
+                continue
+            if response.status_code in RETRY_STATUSES:
+                error = WireMockAdminError(f"{method} {url} returned {response.status_code}", response.status_code)
+                continue
+            break
+        else:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise error
+
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+        if response.status_code >= 400 and response.status_code not in allowed_statuses:
+            raise WireMockAdminError(f"{method} {url} returned {response.status_code}: {response.text[:200]}",
+                                     response.status_code)
+        return response
+
+    def health(self) -> bool:
+        """Whether the server answers its health endpoint"""
+        try:
+            # A probe should answer quickly rather than wait out the backoff
+            return self._request('GET', '/health', retry=False).status_code == 200
+        except WireMockAdminError:
+            return False
+
+    def health_status(self) -> int:
+        """HTTP status of the health endpoint; raises WireMockAdminError only if the server is unreachable"""
+        return self._request('GET', '/health', allowed_statuses=range(400, 600), retry=False).status_code
+
+    def list_mappings(self) -> List[Dict[str, Any]]:
+        """All stub mappings currently registered"""
+        return self._request('GET', '/mappings').json().get('mappings', [])
+
+    def count_mappings(self) -> int:
+        """Number of stub mappings registered, without transferring them"""
+        return self._count('/mappings', 'mappings')
+
+    def count_requests(self) -> int:
+        """Number of requests in the server's journal, without transferring them"""
+        return self._count('/requests', 'requests')
+
+    def _count(self, path: str, key: str) -> int:
+        data = self._request('GET', path, params={'limit': 1}).json()
+        total = (data.get('meta') or {}).get('total')
+        # Servers that don't report a total ignore the limit and return the whole list
+        return total if isinstance(total, int) else len(data.get(key, []))
+
+    def create_mapping(self, mapping: Dict[str, Any]):
+        """Register a new stub mapping (its id is kept)"""
+        self._request('POST', '/mappings', json=mapping)
+
+    def update_mapping(self, mapping: Dict[str, Any]):
+        """Replace the stub mapping with the same id, creating it if the server doesn't know it"""
+        response = self._request('PUT', f"/mappings/{mapping['id']}", allowed_statuses=(404,), json=mapping)
+        if response.status_code == 404:
+            self.create_mapping(mapping)
+
+    def delete_all_mappings(self):
+        """Remove every stub mapping"""
+        self._request('DELETE', '/mappings')
+
+    def delete_mapping(self, mapping_id: str):
+        """Remove a stub mapping; unknown ids are ignored"""
+        self._request('DELETE', f"/mappings/{mapping_id}", allowed_statuses=(404,))
+
+    def import_mappings(self, mappings: List[Dict[str, Any]], delete_all_not_in_import: bool = False):
+        """Register many stub mappings in one call, overwriting mappings with the same id"""
+        self._request('POST', '/mappings/import', json={
+            'mappings': mappings,
+            'importOptions': {
+                'duplicatePolicy': 'OVERWRITE',
+                'deleteAllNotInImport': delete_all_not_in_import
+            }
+        })
+
+    def put_file(self, name: str, content: bytes):
+        """Create or replace a file under the server's __files"""
+        self._request('PUT', f"/files/{quote(name)}", data=content)
+
+    def delete_file(self, name: str):
+        """Remove a file from the server's __files; missing files are ignored"""
+        self._request('DELETE', f"/files/{quote(name)}", allowed_statuses=(404,))
+
+    def close(self):
+        self.session.close()
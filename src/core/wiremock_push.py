@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+WireMock Push
+Loads a generated output directory into a running WireMock: response files are uploaded
+concurrently over the client's connection pool, then mappings are registered through the
+bulk import endpoint in a few large batches instead of one request per stub
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    from .output_backend import DiskBackend
+    from .wiremock_admin import WireMockAdminClient, WireMockAdminError
+except ImportError:
+    from output_backend import DiskBackend
+    from wiremock_admin import WireMockAdminClient, WireMockAdminError
+
+# Failures listed individually in a push summary; the rest are only counted
+MAX_REPORTED_FAILURES = 20
+
+
+def _as_output(output: Union[str, DiskBackend]) -> DiskBackend:
+    return DiskBackend(output) if isinstance(output, str) else output
+
+
+def collect_output(output: Union[str, DiskBackend]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Mappings (from consolidated or single-stub documents) and __files names of an output directory or backend"""
+    output = _as_output(output)
+    mappings = []
+    for name in output.files('mappings'):
+        if not name.endswith('.json'):
+            continue
+        with output.open(name) as f:
+            document = json.load(f)
+        if isinstance(document, dict) and isinstance(document.get('mappings'), list):
+            mappings.extend(document['mappings'])
+        elif isinstance(document, dict):
+            mappings.append(document)
+
+    files = [name[len('__files/'):] for name in output.files('__files')]
+    return mappings, files
+
+
+class MappingPusher:
+    """Push a generated output (directory or backend) to WireMock and summarize the outcome"""
+
+    def __init__(self, client: WireMockAdminClient, file_workers: int = 8, batch_size: int = 1000,
+                 progress_callback: Optional[Callable[[str, int, int], None]] = None):
+        self.client = client
+        self.file_workers = max(1, file_workers)
+        self.batch_size = max(1, batch_size)
+        self.progress_callback = progress_callback
+
+    def _progress(self, stage: str, done: int, total: int):
+        if self.progress_callback is not None:
+            self.progress_callback(stage, done, total)
+
+    def push(self, output: Union[str, DiskBackend], replace: bool = False,
+             response_headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Upload every response file, then import every mapping.
+
+        replace removes all stubs already on the server first; response_headers are merged
+        into each mapping's response (e.g. CORS headers for stubs called from a browser).
+        """
+        started = time.perf_counter()
+        if not self.client.health():
+            raise WireMockAdminError(f"WireMock is not reachable at {self.client.base_url}")
+        output = _as_output(output)
+        mappings, files = collect_output(output)
+        failures = []
+
+        if response_headers:
+            mappings = [self._with_headers(mapping, response_headers) for mapping in mappings]
+
+        # Files first, so no imported stub ever points at a body the server doesn't have yet
+        files_uploaded = self._upload_files(output, files, failures)
+
+        mappings_imported = 0
+        mappings_processed = 0
+        batches = [mappings[index:index + self.batch_size] for index in range(0, len(mappings), self.batch_size)]
+        try:
+            if replace:
+                self.client.delete_all_mappings()
+            for batch in batches:
+                try:
+                    self.client.import_mappings(batch)
+                    mappings_imported += len(batch)
+                except WireMockAdminError as e:
+                    failures.append({'item': f"mappings {mappings_processed + 1}-{mappings_processed + len(batch)}",
+                                     'error': str(e)})
+                mappings_processed += len(batch)
+                self._progress('mappings', mappings_processed, len(mappings))
+        except WireMockAdminError as e:
+            failures.append({'item': 'mappings', 'error': str(e)})
+
+        return {
+            'wiremock_url': self.client.base_url,
+            'success': not failures,
+            'mappings': len(mappings),
+            'mappings_imported': mappings_imported,
+            'mapping_batches': len(batches),
+            'files': len(files),
+            'files_uploaded': files_uploaded,
+            'failure_count': len(failures),
+            'failures': failures[:MAX_REPORTED_FAILURES],
+            'seconds': round(time.perf_counter() - started, 3)
+        }
+
+    def _with_headers(self, mapping: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
+        response = dict(mapping.get('response') or {})
+        response['headers'] = {**(response.get('headers') or {}), **headers}
+        return {**mapping, 'response': response}
+
+    def _upload_file(self, output: DiskBackend, name: str):
+        self.client.put_file(name, output.read(f'__files/{name}'))
+
+    def _upload_files(self, output: DiskBackend, files: List[str], failures: List[Dict[str, str]]) -> int:
+        uploaded = 0
+        processed = 0
+        if not files:
+            return uploaded
+
+        with ThreadPoolExecutor(max_workers=min(self.file_workers, len(files)),
+                                thread_name_prefix='wiremock-push') as executor:
+            futures = {executor.submit(self._upload_file, output, name): name for name in files}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    uploaded += 1
+                except (WireMockAdminError, OSError) as e:
+                    failures.append({'item': futures[future], 'error': str(e)})
+                processed += 1
+                self._progress('files', processed, len(files))
+
+        return uploaded
+
+
+def push_output(output: Union[str, DiskBackend], wiremock_url: str, replace: bool = False, workers: int = 8,
+                batch_size: int = 1000, response_headers: Optional[Dict[str, str]] = None,
+                progress_callback: Optional[Callable[[str, int, int], None]] = None) -> Dict[str, Any]:
+    """Push an output directory or backend with a client whose pool fits the upload concurrency"""
+    client = WireMockAdminClient(wiremock_url, pool_size=workers)
+    try:
+        pusher = MappingPusher(client, file_workers=workers, batch_size=batch_size,
+                               progress_callback=progress_callback)
+        return pusher.push(output, replace=replace, response_headers=response_headers)
+    finally:
+        client.close()
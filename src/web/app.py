@@ -14,6 +14,13 @@ sys.path.insert(0, str(project_root))
 
 from src.web.services.file_service import FileService
 from src.web.services.generation_service import GenerationService
+from src.web.services.metrics_service import MetricsService
+from src.web.services.job_service import JobManager
+from src.web.services.archive_service import ArchiveCache
+from src.web.services.result_cache import ResultCache
+from src.web.services.memory_store import SessionMemoryStore
+from src.web.services.session_janitor import SessionJanitor
+from src.web.services.wiremock_service import WireMockStatusService
 from src.web.routes.main_routes import create_main_blueprint
 from src.web.routes.api_routes import create_api_blueprint
 
@@ -29,11 +36,94 @@ def create_app():
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
     app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
     app.config['TEMP_FOLDER'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'temp')
+    
+    # Generated JSON: 'pretty' (indent=2) or 'compact' (minified; smaller files and ZIPs)
+    app.config['OUTPUT_PROFILE'] = os.environ.get('WIREMOCK_OUTPUT_PROFILE', 'pretty')
+    app.config['FAST_JSON'] = os.environ.get('WIREMOCK_FAST_JSON', '').lower() in ('1', 'true', 'yes')
+    
+    # Stable mapping ids and seeded example data, so re-uploading the same spec yields identical files
+    app.config['DETERMINISTIC'] = os.environ.get('WIREMOCK_DETERMINISTIC', '').lower() in ('1', 'true', 'yes')
+    
+    # Status codes per operation: 'full', 'declared' or 'declared-extras', optionally per API/tag from a config file
+    app.config['STATUS_POLICY'] = os.environ.get('WIREMOCK_STATUS_POLICY', 'full')
+    app.config['STATUS_CONFIG'] = os.environ.get('WIREMOCK_STATUS_CONFIG')
+    
+    # WireMock server that generated sessions are pushed to
+    app.config['WIREMOCK_URL'] = os.environ.get('WIREMOCK_URL', 'http://localhost:8080')
+    
+    # WireMock status polls: seconds a result is reused, request timeout, and the circuit breaker that stops
+    # calling a server after that many consecutive failures until the reset period has passed
+    app.config['WIREMOCK_STATUS_TTL'] = float(os.environ.get('WIREMOCK_STATUS_TTL', '2'))
+    app.config['WIREMOCK_STATUS_TIMEOUT'] = float(os.environ.get('WIREMOCK_STATUS_TIMEOUT', '2'))
+    app.config['WIREMOCK_BREAKER_THRESHOLD'] = int(os.environ.get('WIREMOCK_BREAKER_THRESHOLD', '3'))
+    app.config['WIREMOCK_BREAKER_RESET'] = float(os.environ.get('WIREMOCK_BREAKER_RESET', '30'))
+    
+    # Generation runs as background jobs: concurrent runs per process, queue bound and active jobs per session
+    app.config['GENERATION_WORKERS'] = int(os.environ.get('WIREMOCK_GENERATION_WORKERS', '2'))
+    app.config['MAX_QUEUED_JOBS'] = int(os.environ.get('WIREMOCK_MAX_QUEUED_JOBS', '16'))
+    app.config['MAX_JOBS_PER_SESSION'] = int(os.environ.get('WIREMOCK_MAX_JOBS_PER_SESSION', '1'))
+    
+    # ZIP downloads: deflate level (0 = store only) and memory kept for reusing finished archives (0 disables)
+    app.config['ZIP_COMPRESSION_LEVEL'] = int(os.environ.get('WIREMOCK_ZIP_COMPRESSION_LEVEL', '6'))
+    app.config['ARCHIVE_CACHE_BYTES'] = int(os.environ.get('WIREMOCK_ARCHIVE_CACHE_MB', '64')) * 1024 * 1024
+    
+    # Generated output reused across sessions uploading the same specs with the same options (0 disables)
+    app.config['RESULT_CACHE_BYTES'] = int(os.environ.get('WIREMOCK_RESULT_CACHE_MB', '256')) * 1024 * 1024
+    
+    # Keep generated output in memory instead of temp directories (0 disables); a session spills to disk past the threshold
+    app.config['MEMORY_STORE_BYTES'] = int(os.environ.get('WIREMOCK_MEMORY_STORE_MB', '0')) * 1024 * 1024
+    app.config['MEMORY_SPILL_BYTES'] = int(os.environ.get('WIREMOCK_MEMORY_SPILL_MB', '16')) * 1024 * 1024
+    
+    # Session cleanup runs in the background: idle age limit, total disk quota and per-session cap (0 = unlimited)
+    app.config['SESSION_MAX_AGE'] = int(os.environ.get('WIREMOCK_SESSION_MAX_AGE', '3600'))
+    app.config['SESSION_QUOTA_BYTES'] = int(os.environ.get('WIREMOCK_SESSION_QUOTA_MB', '1024')) * 1024 * 1024
+    app.config['SESSION_MAX_BYTES'] = int(os.environ.get('WIREMOCK_SESSION_MAX_MB', '256')) * 1024 * 1024
+    app.config['JANITOR_INTERVAL'] = float(os.environ.get('WIREMOCK_JANITOR_INTERVAL', '60'))
+    
+    # Prometheus-style /metrics endpoint (set WIREMOCK_METRICS=false to disable)
+    app.config['METRICS_ENABLED'] = os.environ.get('WIREMOCK_METRICS', 'true').lower() not in ('0', 'false', 'no')
 
     # Ensure upload and temp directories exist
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     os.makedirs(app.config['TEMP_FOLDER'], exist_ok=True)
 
+    if app.config['METRICS_ENABLED']:
+        MetricsService(app.config['UPLOAD_FOLDER'], app.config['TEMP_FOLDER']).init_app(app)
+
+    app.extensions['jobs'] = JobManager(max_workers=app.config['GENERATION_WORKERS'],
+                                        max_queued=app.config['MAX_QUEUED_JOBS'],
+                                        max_jobs_per_session=app.config['MAX_JOBS_PER_SESSION'])
+
+    if app.config['ARCHIVE_CACHE_BYTES'] > 0:
+        app.extensions['archive_cache'] = ArchiveCache(app.config['ARCHIVE_CACHE_BYTES'])
+
+    if app.config['RESULT_CACHE_BYTES'] > 0:
+        # Not a session UUID, so session cleanup leaves it alone
+        app.extensions['result_cache'] = ResultCache(os.path.join(app.config['TEMP_FOLDER'], '.result-cache'),
+                                                     app.config['RESULT_CACHE_BYTES'])
+
+    if app.config['MEMORY_STORE_BYTES'] > 0:
+        app.extensions['memory_store'] = SessionMemoryStore(app.config['MEMORY_STORE_BYTES'],
+                                                            app.config['MEMORY_SPILL_BYTES'])
+
+    app.extensions['wiremock'] = WireMockStatusService(app.config['WIREMOCK_URL'],
+                                                       ttl=app.config['WIREMOCK_STATUS_TTL'],
+                                                       timeout=app.config['WIREMOCK_STATUS_TIMEOUT'],
+                                                       failure_threshold=app.config['WIREMOCK_BREAKER_THRESHOLD'],
+                                                       reset_timeout=app.config['WIREMOCK_BREAKER_RESET'],
+                                                       metrics=app.extensions.get('metrics'))
+
+    jobs = app.extensions['jobs']
+    SessionJanitor(app.config['UPLOAD_FOLDER'], app.config['TEMP_FOLDER'],
+                   max_age=app.config['SESSION_MAX_AGE'],
+                   quota_bytes=app.config['SESSION_QUOTA_BYTES'],
+                   max_session_bytes=app.config['SESSION_MAX_BYTES'],
+                   interval=app.config['JANITOR_INTERVAL'],
+                   busy_sessions=lambda: {job.session_id for job in jobs.jobs() if not job.finished},
+                   archive_cache=app.extensions.get('archive_cache'),
+                   memory_store=app.extensions.get('memory_store'),
+                   metrics=app.extensions.get('metrics')).init_app(app)
+
     # Register blueprints
     app.register_blueprint(create_main_blueprint())
     app.register_blueprint(create_api_blueprint(), url_prefix='/api')
@@ -1,12 +1,49 @@
 """API routes for the web application"""
 
-import os
+import json
+import mimetypes
 import uuid
-import requests
-from flask import Blueprint, request, jsonify, send_file, current_app
+from flask import Blueprint, Response, request, jsonify, current_app, send_file, stream_with_context
 from werkzeug.exceptions import RequestEntityTooLarge
 from src.web.services.file_service import FileService
 from src.web.services.generation_service import GenerationService
+from src.web.services.job_service import JobLimitError, FINAL_STATES
+from src.web.services.mapping_service import (DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError, decode_cursor,
+                                              iter_mappings, mapping_page)
+from src.core.wiremock_admin import WireMockAdminError
+from src.core.wiremock_push import push_output
+
+# Added to pushed stubs so the web UI can call them from the browser
+CORS_RESPONSE_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization, Accept'
+}
+
+# Seconds between keep-alive comments on an idle job event stream
+JOB_EVENTS_HEARTBEAT = 15.0
+
+def build_generation_service() -> GenerationService:
+    """Generation service configured from the application config"""
+    return GenerationService(
+        current_app.config['TEMP_FOLDER'],
+        output_profile=current_app.config['OUTPUT_PROFILE'],
+        fast_json=current_app.config['FAST_JSON'],
+        deterministic=current_app.config['DETERMINISTIC'],
+        status_policy=current_app.config['STATUS_POLICY'],
+        status_config=current_app.config['STATUS_CONFIG'],
+        metrics=current_app.extensions.get('metrics'),
+        compression_level=current_app.config['ZIP_COMPRESSION_LEVEL'],
+        archive_cache=current_app.extensions.get('archive_cache'),
+        result_cache=current_app.extensions.get('result_cache'),
+        memory_store=current_app.extensions.get('memory_store')
+    )
+
+def record_wiremock_call(endpoint: str, success: bool):
+    """Count a call to the WireMock admin API when metrics are enabled"""
+    metrics = current_app.extensions.get('metrics')
+    if metrics is not None:
+        metrics.observe_wiremock_call(endpoint, success)
 
 def create_api_blueprint():
     """Create the API routes blueprint"""
@@ -45,6 +82,14 @@ def create_api_blueprint():
                 file_service.cleanup_session_files(session_id)
                 return jsonify({'error': 'No valid OpenAPI files uploaded. Please upload YAML or JSON files.'}), 400
             
+            janitor = current_app.extensions.get('janitor')
+            if janitor is not None:
+                janitor.record(session_id)
+            
+            metrics = current_app.extensions.get('metrics')
+            if metrics is not None:
+                metrics.observe_upload(sum(f['size'] for f in uploaded_files), len(uploaded_files))
+            
             return jsonify({
                 'message': 'Files uploaded successfully',
                 'files': uploaded_files,
@@ -58,7 +103,7 @@ def create_api_blueprint():
     
     @bp.route('/generate', methods=['POST'])
     def generate_mappings():
-        """Generate WireMock mappings"""
+        """Queue a generation job and return its id"""
         try:
             data = request.get_json()
             session_id = data.get('session_id')
@@ -78,27 +123,84 @@ def create_api_blueprint():
                 current_app.config['UPLOAD_FOLDER'],
                 current_app.config['TEMP_FOLDER']
             )
-            generation_service = GenerationService(current_app.config['TEMP_FOLDER'])
+            generation_service = build_generation_service()
             
             # Get spec files
             spec_files = file_service.get_session_spec_files(session_id)
             if not spec_files:
                 return jsonify({'error': 'No valid spec files found'}), 400
             
-            # Generate mappings
-            result = generation_service.generate_mappings(session_id, spec_files, include_java)
+            janitor = current_app.extensions.get('janitor')
+            
+            def run(job, progress_callback):
+                try:
+                    return generation_service.generate_mappings(session_id, spec_files, include_java,
+                                                                progress_callback=progress_callback,
+                                                                cancel_event=job.cancel_event)
+                finally:
+                    if janitor is not None:
+                        janitor.record(session_id)
+            
+            try:
+                job = current_app.extensions['jobs'].submit(session_id, include_java, run)
+            except JobLimitError as e:
+                return jsonify({'error': str(e)}), 429
             
             return jsonify({
-                'message': 'Generation completed',
-                **result
-            })
+                'message': 'Generation queued',
+                'job_id': job.id,
+                'status': job.status,
+                'status_url': f'/api/jobs/{job.id}',
+                'events_url': f'/api/jobs/{job.id}/events'
+            }), 202
             
         except Exception as e:
             return jsonify({'error': f'Generation failed: {str(e)}'}), 500
     
+    @bp.route('/jobs/<job_id>', methods=['GET'])
+    def get_job(job_id):
+        """Status, per-spec progress and (once completed) result of a generation job"""
+        job = current_app.extensions['jobs'].get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify(job.to_dict())
+    
+    @bp.route('/jobs/<job_id>', methods=['DELETE'])
+    def cancel_job(job_id):
+        """Cancel a queued or running generation job"""
+        job = current_app.extensions['jobs'].cancel(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify(job.to_dict()), 202
+    
+    @bp.route('/jobs/<job_id>/events', methods=['GET'])
+    def job_events(job_id):
+        """Server-Sent Events stream of a job's state, one event per change until it finishes"""
+        jobs = current_app.extensions['jobs']
+        job = jobs.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        def stream():
+            version = None
+            while True:
+                state = jobs.wait(job, version, JOB_EVENTS_HEARTBEAT)
+                finished = state['status'] in FINAL_STATES
+                if state['version'] == version and not finished:
+                    # Comment line: keeps proxies from closing an idle connection
+                    yield ': keep-alive\n\n'
+                    continue
+                version = state['version']
+                yield f"event: {'done' if finished else 'progress'}\ndata: {json.dumps(state)}\n\n"
+                if finished:
+                    return
+        
+        return Response(stream_with_context(stream()), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    
     @bp.route('/download/<session_id>')
     def download_package(session_id):
-        """Download generated mappings as ZIP"""
+        """Download generated mappings as a ZIP streamed while it is compressed"""
         try:
             # Validate session ID format
             try:
@@ -106,37 +208,25 @@ def create_api_blueprint():
             except ValueError:
                 return jsonify({'error': 'Invalid session ID format'}), 400
             
-            session_temp_dir = os.path.join(current_app.config['TEMP_FOLDER'], session_id)
-            if not os.path.exists(session_temp_dir):
+            generation_service = build_generation_service()
+            if generation_service.session_output(session_id) is None:
                 return jsonify({'error': 'Session not found or expired'}), 404
             
-            # Initialize services
-            generation_service = GenerationService(current_app.config['TEMP_FOLDER'])
-            file_service = FileService(
-                current_app.config['UPLOAD_FOLDER'],
-                current_app.config['TEMP_FOLDER']
-            )
+            # Optional ?level=0-9 overrides the configured compression (0 = store only)
+            level = request.args.get('level', type=int)
+            if level is not None and not 0 <= level <= 9:
+                return jsonify({'error': 'Compression level must be between 0 and 9'}), 400
             
-            # Create ZIP package
-            zip_path = generation_service.create_download_package(session_id)
-            if not zip_path:
+            package = generation_service.stream_download_package(session_id, level)
+            if package is None:
                 return jsonify({'error': 'No files to download'}), 404
             
-            zip_filename = f'wiremock-mappings-{session_id[:8]}.zip'
+            chunks, content_length = package
+            headers = {'Content-Disposition': f'attachment; filename=wiremock-mappings-{session_id[:8]}.zip'}
+            if content_length is not None:
+                headers['Content-Length'] = str(content_length)
             
-            def remove_file():
-                """Clean up the session after download"""
-                try:
-                    file_service.cleanup_session_files(session_id)
-                except Exception as e:
-                    print(f"Warning: Could not clean up session {session_id}: {e}")
-            
-            return send_file(
-                zip_path,
-                as_attachment=True,
-                download_name=zip_filename,
-                mimetype='application/zip'
-            )
+            return Response(chunks, mimetype='application/zip', headers=headers)
             
         except Exception as e:
             return jsonify({'error': f'Download failed: {str(e)}'}), 500
@@ -159,47 +249,63 @@ def create_api_blueprint():
     @bp.route('/wiremock/status', methods=['GET'])
     def get_wiremock_status():
         """Get WireMock server status"""
-        try:
-            response = requests.get('http://localhost:8080/__admin/health', timeout=5)
-            return jsonify({
-                'status': 'running' if response.status_code == 200 else 'error',
-                'url': 'http://localhost:8080'
-            })
-        except requests.RequestException:
-            return jsonify({
-                'status': 'stopped',
-                'url': 'http://localhost:8080'
-            })
+        wiremock = current_app.extensions['wiremock']
+        return jsonify({'status': wiremock.status(), 'url': wiremock.base_url})
 
     @bp.route('/wiremock/mappings/count', methods=['GET'])
     def get_wiremock_mappings_count():
         """Get count of WireMock mappings"""
-        try:
-            response = requests.get('http://localhost:8080/__admin/mappings', timeout=5)
-            if response.status_code == 200:
-                mappings = response.json().get('mappings', [])
-                return jsonify({'count': len(mappings)})
-            else:
-                return jsonify({'count': 0, 'error': 'Failed to fetch mappings'})
-        except requests.RequestException:
+        count = current_app.extensions['wiremock'].mappings_count()
+        if count is None:
             return jsonify({'count': 0, 'error': 'WireMock server not available'})
+        return jsonify({'count': count})
 
     @bp.route('/wiremock/requests/count', methods=['GET'])
     def get_wiremock_requests_count():
         """Get count of WireMock requests"""
-        try:
-            response = requests.get('http://localhost:8080/__admin/requests', timeout=5)
-            if response.status_code == 200:
-                requests_data = response.json().get('requests', [])
-                return jsonify({'count': len(requests_data)})
-            else:
-                return jsonify({'count': 0, 'error': 'Failed to fetch requests'})
-        except requests.RequestException:
+        count = current_app.extensions['wiremock'].requests_count()
+        if count is None:
             return jsonify({'count': 0, 'error': 'WireMock server not available'})
+        return jsonify({'count': count})
+
+    @bp.route('/wiremock/stats', methods=['GET'])
+    def get_wiremock_stats():
+        """Status, mapping count and request count of WireMock in one call"""
+        return jsonify(current_app.extensions['wiremock'].stats())
+
+    @bp.route('/wiremock/push/<session_id>', methods=['POST'])
+    def push_to_wiremock(session_id):
+        """Push a session's generated mappings and response files to WireMock in bulk"""
+        try:
+            uuid.UUID(session_id)
+        except ValueError:
+            return jsonify({'error': 'Invalid session ID format'}), 400
+        
+        output = build_generation_service().session_output(session_id)
+        if output is None or not output.exists('mappings'):
+            return jsonify({'error': 'No mappings found for session'}), 404
+        
+        data = request.get_json(silent=True) or {}
+        try:
+            summary = push_output(output, current_app.config['WIREMOCK_URL'],
+                                  replace=bool(data.get('replace', False)),
+                                  response_headers=CORS_RESPONSE_HEADERS)
+        except WireMockAdminError as e:
+            record_wiremock_call('push', False)
+            return jsonify({'error': f'Push failed: {str(e)}'}), 502
+        
+        record_wiremock_call('push', summary['success'])
+        return jsonify(summary), 200 if summary['success'] else 502
 
     @bp.route('/mappings/<session_id>', methods=['GET'])
     def get_session_mappings(session_id):
-        """Get generated mappings for a session to upload to WireMock"""
+        """Get generated mappings for a session to upload to WireMock.
+        
+        Without query parameters every mapping document and response file is returned at once.
+        With format=ndjson, limit, cursor or an api/method/status filter, individual stub mappings
+        are returned instead: as a streamed NDJSON body (one mapping per line) or as a JSON page
+        with a next_cursor. Response bodies are then fetched per file from /mappings/<id>/files/<name>.
+        """
         try:
             # Validate session ID format
             try:
@@ -207,45 +313,36 @@ def create_api_blueprint():
             except ValueError:
                 return jsonify({'error': 'Invalid session ID format'}), 400
             
-            session_temp_dir = os.path.join(current_app.config['TEMP_FOLDER'], session_id)
-            if not os.path.exists(session_temp_dir):
+            # Generated output, in memory or in the session's temp directory
+            output = build_generation_service().session_output(session_id)
+            if output is None:
                 return jsonify({'error': 'Session not found or expired'}), 404
             
-            # Look for mappings directory
-            mappings_dir = os.path.join(session_temp_dir, 'mappings')
-            if not os.path.exists(mappings_dir):
+            if not output.exists('mappings'):
                 return jsonify({'error': 'No mappings found for session'}), 404
             
+            if any(name in request.args for name in ('format', 'limit', 'cursor', 'api', 'method', 'status')):
+                return stub_mappings(output)
+            
             mappings = []
             response_files = {}
             
             # Read all mapping files
-            for root, dirs, files in os.walk(mappings_dir):
-                for file in files:
-                    if file.endswith('.json'):
-                        file_path = os.path.join(root, file)
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                import json
-                                mapping_data = json.load(f)
-                                mappings.append(mapping_data)
-                        except Exception as e:
-                            print(f"Warning: Could not read mapping file {file_path}: {e}")
-            
-            # Read response files from __files directory
-            files_dir = os.path.join(session_temp_dir, '__files')
-            if os.path.exists(files_dir):
-                for root, dirs, files in os.walk(files_dir):
-                    for file in files:
-                        if file.endswith('.json'):
-                            file_path = os.path.join(root, file)
-                            try:
-                                with open(file_path, 'r', encoding='utf-8') as f:
-                                    # Get relative path for WireMock
-                                    rel_path = os.path.relpath(file_path, files_dir)
-                                    response_files[rel_path] = f.read()
-                            except Exception as e:
-                                print(f"Warning: Could not read response file {file_path}: {e}")
+            for name in output.files('mappings'):
+                if name.endswith('.json'):
+                    try:
+                        with output.open(name) as f:
+                            mappings.append(json.load(f))
+                    except Exception as e:
+                        print(f"Warning: Could not read mapping file {name}: {e}")
+            
+            # Read response files from __files, keyed by their path relative to it for WireMock
+            for name in output.files('__files'):
+                if name.endswith('.json'):
+                    try:
+                        response_files[name[len('__files/'):]] = output.read(name).decode('utf-8')
+                    except Exception as e:
+                        print(f"Warning: Could not read response file {name}: {e}")
             
             return jsonify({
                 'mappings': mappings,
@@ -256,4 +353,60 @@ def create_api_blueprint():
         except Exception as e:
             return jsonify({'error': f'Failed to retrieve mappings: {str(e)}'}), 500
 
+    def stub_mappings(output):
+        """Filtered stub mappings of a session as an NDJSON stream or a cursor-paginated page"""
+        output_format = request.args.get('format', 'json')
+        if output_format not in ('json', 'ndjson'):
+            return jsonify({'error': "Format must be 'json' or 'ndjson'"}), 400
+        
+        limit = request.args.get('limit', type=int)
+        if 'limit' in request.args and (limit is None or not 1 <= limit <= MAX_PAGE_SIZE):
+            return jsonify({'error': f'Limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+        status = request.args.get('status', type=int)
+        if 'status' in request.args and status is None:
+            return jsonify({'error': 'Status must be an HTTP status code'}), 400
+        
+        filters = {
+            'api': request.args.get('api'),
+            'method': request.args['method'].upper() if 'method' in request.args else None,
+            'status': status
+        }
+        if 'cursor' in request.args:
+            try:
+                filters['after'] = decode_cursor(request.args['cursor'])
+            except InvalidCursorError as e:
+                return jsonify({'error': str(e)}), 400
+        
+        if output_format == 'ndjson' and limit is None:
+            # Unbounded: stream every mapping as it is read
+            def lines():
+                for _, mapping in iter_mappings(output, **filters):
+                    yield json.dumps(mapping, separators=(',', ':')) + '\n'
+            
+            return Response(stream_with_context(lines()), mimetype='application/x-ndjson')
+        
+        mappings, next_cursor = mapping_page(output, limit or DEFAULT_PAGE_SIZE, **filters)
+        if output_format == 'ndjson':
+            headers = {'X-Next-Cursor': next_cursor} if next_cursor else {}
+            return Response(''.join(json.dumps(mapping, separators=(',', ':')) + '\n' for mapping in mappings),
+                            mimetype='application/x-ndjson', headers=headers)
+        return jsonify({'mappings': mappings, 'count': len(mappings), 'next_cursor': next_cursor})
+
+    @bp.route('/mappings/<session_id>/files/<path:name>', methods=['GET'])
+    def get_session_response_file(session_id, name):
+        """One response body file of a session (the target of a mapping's bodyFileName)"""
+        try:
+            uuid.UUID(session_id)
+        except ValueError:
+            return jsonify({'error': 'Invalid session ID format'}), 400
+        
+        output = build_generation_service().session_output(session_id)
+        try:
+            if output is None:
+                raise FileNotFoundError(name)
+            body = output.open(f'__files/{name}')
+        except (FileNotFoundError, IsADirectoryError):
+            return jsonify({'error': 'Response file not found'}), 404
+        return send_file(body, mimetype=mimetypes.guess_type(name)[0] or 'application/octet-stream', max_age=0)
+
     return bp
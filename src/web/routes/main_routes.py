@@ -2,8 +2,7 @@
 
 import uuid
 from datetime import datetime
-from flask import Blueprint, render_template, current_app
-from src.web.services.file_service import FileService
+from flask import Blueprint, render_template, current_app, abort, Response
 
 def create_main_blueprint():
     """Create the main routes blueprint"""
@@ -11,16 +10,7 @@ def create_main_blueprint():
     
     @bp.route('/')
     def index():
-        """Main page"""
-        # Initialize file service
-        file_service = FileService(
-            current_app.config['UPLOAD_FOLDER'],
-            current_app.config['TEMP_FOLDER']
-        )
-        
-        # Clean up old sessions
-        file_service.cleanup_old_sessions()
-        
+        """Main page (old sessions are cleaned up by the background SessionJanitor)"""
         # Generate new session ID
         session_id = str(uuid.uuid4())
         return render_template('index_new.html', session_id=session_id)
@@ -36,4 +26,12 @@ def create_main_blueprint():
             'version': '1.0.0'
         })
     
+    @bp.route('/metrics')
+    def metrics():
+        """Prometheus metrics endpoint"""
+        metrics_service = current_app.extensions.get('metrics')
+        if metrics_service is None:
+            abort(404)
+        return Response(metrics_service.render(), mimetype='text/plain; version=0.0.4')
+    
     return bp
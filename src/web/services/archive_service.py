@@ -0,0 +1,115 @@
+"""Streaming ZIP archives of session output with a bounded in-memory cache"""
+
+import io
+import threading
+import zipfile
+from collections import OrderedDict
+from typing import Iterator, List, Optional
+
+from src.core.output_backend import DiskBackend
+
+# Bytes read from a source file per write into the archive
+READ_CHUNK_SIZE = 64 * 1024
+
+# Below this many buffered bytes the stream keeps writing before yielding to the client
+YIELD_THRESHOLD = 64 * 1024
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink that hands out what was written so far"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._pending = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._pending += len(data)
+        return len(data)
+
+    def pending(self) -> int:
+        return self._pending
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        self._pending = 0
+        return data
+
+
+def stream_zip(source: DiskBackend, entries: List[str], compression_level: int) -> Iterator[bytes]:
+    """Yield a ZIP of the given files of an output backend (on disk or in memory) as it is being compressed.
+
+    Level 0 stores entries uncompressed; 1-9 are deflate levels. The archive is written with
+    data descriptors, so nothing needs to seek back and no temporary file is used.
+    """
+    compression = zipfile.ZIP_STORED if compression_level == 0 else zipfile.ZIP_DEFLATED
+    buffer = _ChunkBuffer()
+
+    with zipfile.ZipFile(buffer, 'w', compression=compression,
+                         compresslevel=None if compression_level == 0 else compression_level) as archive:
+        for arcname in entries:
+            try:
+                entry = source.open(arcname)
+            except OSError:
+                # Removed since the output was listed
+                continue
+            with entry, archive.open(arcname, 'w') as target:
+                for chunk in iter(lambda: entry.read(READ_CHUNK_SIZE), b''):
+                    target.write(chunk)
+                    if buffer.pending() >= YIELD_THRESHOLD:
+                        yield buffer.drain()
+            if buffer.pending() >= YIELD_THRESHOLD:
+                yield buffer.drain()
+
+    # Central directory
+    remainder = buffer.drain()
+    if remainder:
+        yield remainder
+
+
+class ArchiveCache:
+    """Least-recently-used cache of finished archives, bounded by total bytes"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_archive_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max(0, max_bytes)
+        self.max_archive_bytes = min(max(0, max_archive_bytes), self.max_bytes)
+        self._archives = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str, key) -> Optional[bytes]:
+        """Cached archive of a session if it was built from the same inputs"""
+        with self._lock:
+            entry = self._archives.get(session_id)
+            if entry is None:
+                return None
+            if entry[0] != key:
+                # The session's output (or the requested compression) changed
+                self._remove(session_id)
+                return None
+            self._archives.move_to_end(session_id)
+            return entry[1]
+
+    def put(self, session_id: str, key, data: bytes):
+        if len(data) > self.max_archive_bytes:
+            return
+        with self._lock:
+            self._remove(session_id)
+            self._archives[session_id] = (key, data)
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._archives)))
+
+    def discard(self, session_id: str):
+        with self._lock:
+            self._remove(session_id)
+
+    def _remove(self, session_id: str):
+        entry = self._archives.pop(session_id, None)
+        if entry is not None:
+            self._size -= len(entry[1])
@@ -2,8 +2,6 @@
 
 import os
 import shutil
-import uuid
-from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any
 from werkzeug.utils import secure_filename
@@ -32,28 +30,6 @@ class FileService:
                 except Exception as e:
                     print(f"Warning: Could not clean up {directory}: {e}")
     
-    def cleanup_old_sessions(self):
-        """Clean up sessions older than 1 hour"""
-        current_time = datetime.now()
-        cutoff_time = current_time.timestamp() - 3600  # 1 hour ago
-        
-        for folder in [self.upload_folder, self.temp_folder]:
-            if not os.path.exists(folder):
-                continue
-                
-            for item in os.listdir(folder):
-                item_path = os.path.join(folder, item)
-                if os.path.isdir(item_path):
-                    try:
-                        # Check if it's a UUID (session directory)
-                        uuid.UUID(item)
-                        if os.path.getctime(item_path) < cutoff_time:
-                            shutil.rmtree(item_path)
-                            print(f"Cleaned up old session: {item}")
-                    except (ValueError, OSError):
-                        # Not a valid UUID or couldn't access, skip
-                        continue
-    
     def save_uploaded_files(self, files, session_id: str) -> List[Dict[str, Any]]:
         """Save uploaded files and return file info"""
         session_upload_dir = os.path.join(self.upload_folder, session_id)
@@ -1,95 +1,220 @@
 """Generation service for WireMock mappings and Java code"""
 
 import os
+import shutil
 import sys
-import zipfile
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Callable, Iterator, List, Dict, Any, Optional, Tuple
 
 # Add project root to path for imports
 project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.core.multi_spec_wiremock_generator import MultiSpecWireMockGenerator, JavaWireMockGenerator
+from src.core.multi_spec_wiremock_generator import MultiSpecWireMockGenerator, JavaWireMockGenerator, GENERATOR_VERSION
+from src.core.profiling import Profiler
+from src.core.output_backend import DiskBackend
+from src.web.services.archive_service import stream_zip
+from src.web.services.result_cache import file_digest, result_key
 
 class GenerationService:
-    def __init__(self, temp_folder: str):
+    def __init__(self, temp_folder: str, output_profile: str = 'pretty', fast_json: bool = False,
+                 deterministic: bool = False, status_policy: str = 'full', status_config: Optional[str] = None,
+                 metrics=None, compression_level: int = 6, archive_cache=None, result_cache=None,
+                 memory_store=None):
         self.temp_folder = temp_folder
+        self.output_profile = output_profile
+        self.fast_json = fast_json
+        self.deterministic = deterministic
+        self.status_policy = status_policy
+        self.status_config = status_config
+        # Optional MetricsService recording generation and packaging metrics
+        self.metrics = metrics
+        # ZIP downloads: deflate level (0 = store only) and optional ArchiveCache of finished archives
+        self.compression_level = compression_level
+        self.archive_cache = archive_cache
+        # Optional ResultCache: sessions uploading an already generated spec set get its output linked in
+        self.result_cache = result_cache
+        # Optional SessionMemoryStore: output is generated into memory instead of the session's temp dir
+        self.memory_store = memory_store
+        # Parsed specs are cached across sessions; the cache dir is not a session UUID so cleanup skips it
+        self.spec_cache_dir = os.path.join(temp_folder, '.spec-cache')
     
-    def generate_mappings(self, session_id: str, spec_files: List[str], include_java: bool = False) -> Dict[str, Any]:
-        """Generate WireMock mappings and optionally Java code"""
+    def generate_mappings(self, session_id: str, spec_files: List[str], include_java: bool = False,
+                          progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                          cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """Generate WireMock mappings and optionally Java code (progress and cancellation as in generate_all_mappings)"""
+        session_temp_dir = os.path.join(self.temp_folder, session_id)
+        # Start empty: files of an earlier run must not linger, and files linked from the result cache
+        # must be replaced rather than rewritten in place
+        shutil.rmtree(session_temp_dir, ignore_errors=True)
+        if self.memory_store is not None:
+            self.memory_store.discard(session_id)
+        if self.archive_cache is not None:
+            self.archive_cache.discard(session_id)
+        
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = result_key(spec_files, self.generation_options(include_java))
+            cached = self.result_cache.restore(cache_key, session_temp_dir)
+            if self.metrics is not None:
+                self.metrics.observe_result_cache(cached is not None)
+            if cached is not None:
+                if progress_callback is not None:
+                    progress_callback({'event': 'stage', 'stage': 'cached'})
+                return self._session_result(cached, session_id, session_temp_dir, cached=True)
+        
+        if self.memory_store is not None:
+            output = self.memory_store.create(session_id, session_temp_dir)
+        else:
+            output = DiskBackend(session_temp_dir)
+            os.makedirs(session_temp_dir, exist_ok=True)
+        try:
+            return self._generate(session_id, spec_files, include_java, output, cache_key,
+                                  progress_callback, cancel_event)
+        finally:
+            if self.memory_store is not None:
+                self.memory_store.commit(session_id)
+    
+    def _generate(self, session_id: str, spec_files: List[str], include_java: bool, output: DiskBackend,
+                  cache_key: Optional[str], progress_callback: Optional[Callable[[Dict[str, Any]], None]],
+                  cancel_event: Optional[threading.Event]) -> Dict[str, Any]:
+        """Run the mapping (and Java) generators into output and cache a successful result"""
         session_upload_dir = os.path.dirname(spec_files[0]) if spec_files else ""
         session_temp_dir = os.path.join(self.temp_folder, session_id)
-        os.makedirs(session_temp_dir, exist_ok=True)
+        
+        # Stage timings feed the metrics endpoint; per-operation profiling is left to the CLI's --profile
+        profiler = Profiler(enabled=self.metrics is not None, detailed=False)
+        started = time.perf_counter()
         
         # Generate mappings for all specs
-        generator = MultiSpecWireMockGenerator(session_upload_dir, session_temp_dir)
-        generator.generate_all_mappings()
+        generator = MultiSpecWireMockGenerator(session_upload_dir, session_temp_dir,
+                                               spec_cache_dir=self.spec_cache_dir,
+                                               output_profile=self.output_profile,
+                                               fast_json=self.fast_json,
+                                               deterministic=self.deterministic,
+                                               status_policy=self.status_policy,
+                                               status_config=self.status_config,
+                                               profiler=profiler,
+                                               output_backend=output)
+        summary = generator.generate_all_mappings(progress_callback, cancel_event)
         
-        # Count generated mappings
-        mappings_dir = os.path.join(session_temp_dir, 'mappings')
-        mapping_count = 0
-        if os.path.exists(mappings_dir):
-            mapping_count = len([f for f in os.listdir(mappings_dir) if f.endswith('.json')])
+        if self.metrics is not None:
+            self.metrics.observe_generation(time.perf_counter() - started, summary['specs'], profiler.report())
+        
+        # Per-spec mapping counts as reported by the generator
+        spec_results = {spec['filename']: spec for spec in summary['specs']}
         
         # Prepare results
         results = []
         for spec_file in spec_files:
             spec_name = Path(spec_file).stem
+            spec_result = spec_results.get(os.path.basename(spec_file), {})
             result = {
                 'spec_file': os.path.basename(spec_file),
                 'spec_name': spec_name,
-                'mappings_generated': mapping_count // len(spec_files) if len(spec_files) > 0 else 0,
-                'output_dir': session_temp_dir
+                'mappings_generated': spec_result.get('mappings', 0),
+                'stubs_saved': spec_result.get('stubs_saved', 0)
             }
+            if spec_result.get('error'):
+                result['error'] = spec_result['error']
             results.append(result)
         
         # Generate Java code if requested
+        java_failed = False
         if include_java:
+            if progress_callback is not None:
+                progress_callback({'event': 'stage', 'stage': 'java'})
             try:
-                specs = generator.discover_specs()
+                specs = generator.registry.specs
                 if specs:
-                    java_generator = JavaWireMockGenerator()
-                    java_generator.generate_java_code_for_apis(specs, session_temp_dir)
+                    java_generator = JavaWireMockGenerator(output_backend=output)
+                    java_generator.generate_java_code_for_apis(specs, session_temp_dir, registry=generator.registry)
                     
                     for result in results:
                         result['java_generated'] = True
             except Exception as e:
+                java_failed = True
                 print(f"Warning: Java generation failed: {e}")
         
-        return {
+        generated = {
             'results': results,
+            'include_java': include_java,
+            'stubs_saved': summary['stubs_saved']
+        }
+        # Failed runs aren't cached, so a transient error is never served to later sessions
+        if cache_key is not None and not java_failed and not any('error' in result for result in results):
+            self.result_cache.store(cache_key, output, generated)
+        
+        return self._session_result(generated, session_id, session_temp_dir)
+    
+    def generation_options(self, include_java: bool) -> Dict[str, Any]:
+        """Everything besides the specs that shapes the generated files"""
+        return {
+            'generator_version': GENERATOR_VERSION,
+            'include_java': include_java,
+            'output_profile': self.output_profile,
+            'fast_json': self.fast_json,
+            'deterministic': self.deterministic,
+            'status_policy': self.status_policy,
+            'status_config': file_digest(self.status_config) if self.status_config else None
+        }
+    
+    def _session_result(self, generated: Dict[str, Any], session_id: str, session_temp_dir: str,
+                        cached: bool = False) -> Dict[str, Any]:
+        return {
+            'results': [{**result, 'output_dir': session_temp_dir} for result in generated['results']],
             'session_id': session_id,
-            'include_java': include_java
+            'include_java': generated['include_java'],
+            'stubs_saved': generated['stubs_saved'],
+            'cached': cached
         }
     
-    def create_download_package(self, session_id: str) -> str:
-        """Create a ZIP package of all generated files"""
+    def session_output(self, session_id: str) -> Optional[DiskBackend]:
+        """Generated output of a session, in memory or on disk, or None if the session has none"""
+        if self.memory_store is not None:
+            output = self.memory_store.get(session_id)
+            if output is not None:
+                return output
         session_temp_dir = os.path.join(self.temp_folder, session_id)
-        zip_filename = f'wiremock-mappings-{session_id[:8]}.zip'
-        zip_path = os.path.join(session_temp_dir, zip_filename)
+        return DiskBackend(session_temp_dir) if os.path.isdir(session_temp_dir) else None
+    
+    def stream_download_package(self, session_id: str,
+                                compression_level: Optional[int] = None) -> Optional[Tuple[Iterator[bytes], Optional[int]]]:
+        """ZIP of all generated files as (chunks, content length if known), or None if there is nothing to package.
         
-        try:
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                file_count = 0
-                
-                for root, dirs, files in os.walk(session_temp_dir):
-                    # Skip the zip file itself
-                    if zip_path in [os.path.join(root, f) for f in files]:
-                        continue
-                        
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        # Create relative path for ZIP
-                        arcname = os.path.relpath(file_path, session_temp_dir)
-                        zipf.write(file_path, arcname)
-                        file_count += 1
-                
-                if file_count > 0:
-                    return zip_path
-                else:
-                    return None
-                    
-        except Exception as e:
-            print(f"Error creating ZIP package: {e}")
+        The archive is compressed while it is sent; a finished archive is kept in the archive
+        cache and served as-is until the session's files change.
+        """
+        output = self.session_output(session_id)
+        level = self.compression_level if compression_level is None else compression_level
+        fingerprint = output.fingerprint() if output is not None else ()
+        if not fingerprint:
             return None
+        
+        cache_key = (level, fingerprint)
+        if self.archive_cache is not None:
+            cached = self.archive_cache.get(session_id, cache_key)
+            if cached is not None:
+                return iter([cached]), len(cached)
+        
+        def chunks():
+            started = time.perf_counter()
+            size = 0
+            # Kept only while the archive still fits in the cache
+            kept = [] if self.archive_cache is not None else None
+            for chunk in stream_zip(output, [entry[0] for entry in fingerprint], level):
+                size += len(chunk)
+                if kept is not None:
+                    kept.append(chunk)
+                    if size > self.archive_cache.max_archive_bytes:
+                        kept = None
+                yield chunk
+            
+            if kept is not None:
+                self.archive_cache.put(session_id, cache_key, b''.join(kept))
+            if self.metrics is not None:
+                self.metrics.observe_zip(time.perf_counter() - started, size)
+        
+        return chunks(), None
@@ -0,0 +1,199 @@
+"""Background generation jobs for the web application"""
+
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.multi_spec_wiremock_generator import GenerationCancelled
+
+# Job states; the last three are final
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINAL_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobLimitError(Exception):
+    """Raised when a job can't be accepted because a concurrency limit was reached"""
+
+
+class GenerationJob:
+    """State of one generation run, updated by its worker thread and read by request threads"""
+
+    def __init__(self, session_id: str, include_java: bool):
+        self.id = str(uuid.uuid4())
+        self.session_id = session_id
+        self.include_java = include_java
+        self.status = QUEUED
+        self.stage = QUEUED
+        self.specs = {}
+        self.specs_total = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        # Bumped on every change; event streams wait for it to move
+        self.version = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINAL_STATES
+
+    def to_dict(self) -> Dict[str, Any]:
+        specs = list(self.specs.values())
+        done = sum(1 for spec in specs if spec['status'] in (COMPLETED, FAILED))
+        data = {
+            'job_id': self.id,
+            'session_id': self.session_id,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': {
+                'specs_total': self.specs_total,
+                'specs_done': done,
+                'mappings': sum(spec.get('mappings') or 0 for spec in specs),
+                'percent': round(100 * done / self.specs_total) if self.specs_total else (100 if self.finished else 0)
+            },
+            'specs': specs,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'version': self.version
+        }
+        if self.error:
+            data['error'] = self.error
+        if self.result is not None:
+            data['result'] = self.result
+        return data
+
+
+class JobManager:
+    """Run generation jobs on a bounded thread pool.
+
+    max_workers caps concurrent generations for the whole process, max_queued caps jobs
+    waiting for a worker, and max_jobs_per_session keeps a single session from filling the
+    queue. Finished jobs are kept for retention seconds so their results can be fetched.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queued: int = 16, max_jobs_per_session: int = 1,
+                 retention: float = 3600.0):
+        self.max_workers = max(1, max_workers)
+        self.max_queued = max(0, max_queued)
+        self.max_jobs_per_session = max(1, max_jobs_per_session)
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='generation-job')
+        self._jobs = {}
+        self._changed = threading.Condition()
+
+    def submit(self, session_id: str, include_java: bool,
+               run: Callable[[GenerationJob, Callable[[Dict[str, Any]], None]], Dict[str, Any]]) -> GenerationJob:
+        """Queue run(job, progress_callback); raises JobLimitError when a limit is reached"""
+        with self._changed:
+            self._prune()
+            active = [job for job in self._jobs.values() if not job.finished]
+            if sum(1 for job in active if job.session_id == session_id) >= self.max_jobs_per_session:
+                raise JobLimitError('A generation job is already running for this session')
+            if sum(1 for job in active if job.status == QUEUED) >= self.max_queued:
+                raise JobLimitError('Too many generation jobs are queued, try again shortly')
+
+            job = GenerationJob(session_id, include_java)
+            self._jobs[job.id] = job
+
+        self._executor.submit(self._run, job, run)
+        return job
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        with self._changed:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[GenerationJob]:
+        with self._changed:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[GenerationJob]:
+        """Request cancellation; queued jobs never start, running ones stop at the next operation"""
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+            job.cancel_event.set()
+            if job.status == QUEUED:
+                self._finish(job, CANCELLED)
+            return job
+
+    def wait(self, job: GenerationJob, version: int, timeout: float) -> Dict[str, Any]:
+        """Block until the job changes past version (or timeout) and return its state"""
+        with self._changed:
+            self._changed.wait_for(lambda: job.version != version or job.finished, timeout)
+            return job.to_dict()
+
+    def shutdown(self):
+        for job in self.jobs():
+            job.cancel_event.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _finish(self, job: GenerationJob, status: str, **changes):
+        # Caller holds the condition
+        job.status = status
+        job.stage = status
+        job.finished_at = time.time()
+        for name, value in changes.items():
+            setattr(job, name, value)
+        job.version += 1
+        self._changed.notify_all()
+
+    def _progress(self, job: GenerationJob, event: Dict[str, Any]):
+        """Fold a generator progress event into the job"""
+        with self._changed:
+            if event['event'] == 'started':
+                job.specs_total = event['pending']
+                for filename in event['skipped']:
+                    job.specs[filename] = {'filename': filename, 'status': 'skipped', 'mappings': None}
+            elif event['event'] == 'spec_started':
+                job.specs[event['filename']] = {'filename': event['filename'], 'api_name': event['api_name'],
+                                                'status': RUNNING, 'mappings': None}
+            elif event['event'] == 'spec_finished':
+                job.specs[event['filename']].update({
+                    'status': FAILED if event['error'] else COMPLETED,
+                    'mappings': event['mappings'],
+                    'error': event['error']
+                })
+            elif event['event'] == 'stage':
+                job.stage = event['stage']
+            job.version += 1
+            self._changed.notify_all()
+
+    def _run(self, job: GenerationJob, run):
+        with self._changed:
+            if job.finished:
+                return
+            job.status = RUNNING
+            job.stage = 'generating'
+            job.started_at = time.time()
+            job.version += 1
+            self._changed.notify_all()
+
+        try:
+            result = run(job, lambda event: self._progress(job, event))
+        except GenerationCancelled:
+            with self._changed:
+                self._finish(job, CANCELLED)
+        except Exception as e:
+            traceback.print_exc()
+            with self._changed:
+                self._finish(job, FAILED, error=str(e))
+        else:
+            with self._changed:
+                self._finish(job, COMPLETED, result=result)
+
+    def _prune(self):
+        """Forget finished jobs older than the retention period (caller holds the condition)"""
+        cutoff = time.time() - self.retention
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.finished_at < cutoff]:
+            del self._jobs[job_id]
@@ -0,0 +1,94 @@
+"""Lazy iteration over a session's generated stub mappings, with filters and resumable cursors"""
+
+import base64
+import binascii
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.core.output_backend import DiskBackend
+
+# Page size when a cursor is given without a limit, and the largest page a client may ask for
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+# Where iteration stands: mapping file (relative to mappings/) and index of the stub within it
+Position = Tuple[str, int]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor can't be decoded"""
+
+
+def encode_cursor(position: Position) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(position)).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Position:
+    try:
+        relative_path, index = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(relative_path, str) or not isinstance(index, int):
+            raise ValueError(cursor)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+    return relative_path, index
+
+
+def mapping_files(output: DiskBackend) -> List[str]:
+    """Mapping documents of an output, as sorted paths relative to mappings/ (the iteration order)"""
+    return sorted(name[len('mappings/'):] for name in output.files('mappings') if name.endswith('.json'))
+
+
+def _matches(mapping: Dict[str, Any], relative_path: str, api: Optional[str], method: Optional[str],
+             status: Optional[int]) -> bool:
+    if api is not None:
+        api_name = (mapping.get('metadata') or {}).get('api_name') or relative_path.split('/', 1)[0]
+        if api_name != api:
+            return False
+    if method is not None and str((mapping.get('request') or {}).get('method', '')).upper() != method:
+        return False
+    if status is not None and (mapping.get('response') or {}).get('status', 200) != status:
+        return False
+    return True
+
+
+def iter_mappings(output: DiskBackend, api: Optional[str] = None, method: Optional[str] = None,
+                  status: Optional[int] = None, after: Optional[Position] = None) -> Iterator[Tuple[Position, Dict[str, Any]]]:
+    """Yield (position, stub mapping) for every matching stub after the given position.
+
+    Only one mapping document is parsed at a time; consolidated documents and single-stub files
+    are both understood.
+    """
+    for relative_path in mapping_files(output):
+        if after is not None and relative_path < after[0]:
+            continue
+        try:
+            with output.open(f'mappings/{relative_path}') as f:
+                document = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read mapping file {relative_path}: {e}")
+            continue
+
+        if isinstance(document, dict) and isinstance(document.get('mappings'), list):
+            stubs = document['mappings']
+        elif isinstance(document, dict):
+            stubs = [document]
+        else:
+            continue
+
+        for index, mapping in enumerate(stubs):
+            if after is not None and (relative_path, index) <= after:
+                continue
+            if _matches(mapping, relative_path, api, method, status):
+                yield (relative_path, index), mapping
+
+
+def mapping_page(output: DiskBackend, limit: int, **filters) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Up to limit matching mappings and the cursor of the next page (None on the last page)"""
+    page = []
+    for position, mapping in iter_mappings(output, **filters):
+        if len(page) == limit:
+            # One more match exists: resume after the last mapping returned
+            return page, encode_cursor(last_position)
+        page.append(mapping)
+        last_position = position
+    return page, None
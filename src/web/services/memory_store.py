@@ -0,0 +1,61 @@
+"""Bounded in-memory store of generated session output"""
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from src.core.output_backend import MemoryBackend
+
+
+class SessionMemoryStore:
+    """Generated output of recent sessions, held in MemoryBackends instead of temp directories.
+
+    A single session spills to its temp directory once its output exceeds spill_threshold; when all
+    sessions together exceed max_bytes the least recently used ones are spilled. Spilled sessions
+    leave the store and are served from disk like any other session.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, spill_threshold: int = 16 * 1024 * 1024):
+        self.max_bytes = max(0, max_bytes)
+        self.spill_threshold = min(max(0, spill_threshold), self.max_bytes)
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return sum(backend.memory_bytes for backend in self._sessions.values())
+
+    def create(self, session_id: str, root: str) -> MemoryBackend:
+        """Fresh in-memory output for a session (replacing any earlier one); root is where it spills to"""
+        backend = MemoryBackend(root, self.spill_threshold)
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._sessions[session_id] = backend
+        return backend
+
+    def get(self, session_id: str) -> Optional[MemoryBackend]:
+        with self._lock:
+            backend = self._sessions.get(session_id)
+            if backend is not None:
+                self._sessions.move_to_end(session_id)
+            return backend
+
+    def commit(self, session_id: str):
+        """A session finished writing: drop it if it spilled, then bring the store back under max_bytes"""
+        with self._lock:
+            backend = self._sessions.get(session_id)
+            if backend is not None and backend.spilled:
+                del self._sessions[session_id]
+
+            total = sum(backend.memory_bytes for backend in self._sessions.values())
+            for other_id in list(self._sessions):
+                if total <= self.max_bytes:
+                    break
+                backend = self._sessions.pop(other_id)
+                total -= backend.memory_bytes
+                backend.spill()
+
+    def discard(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
@@ -0,0 +1,236 @@
+"""Prometheus-style metrics for the web application"""
+
+import bisect
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from flask import Flask, g, request
+
+# Histogram buckets (upper bounds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1024, 8 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024)
+
+# Walking uploads/ and temp/ is only repeated after this many seconds
+DISK_USAGE_TTL = 15.0
+
+METRIC_PREFIX = 'wiremock_generator_'
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class: a named family of samples keyed by label values"""
+
+    metric_type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = METRIC_PREFIX + name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    metric_type = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    metric_type = 'gauge'
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                # Per-bucket (non-cumulative) counts, sum, count
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        with self._lock:
+            items = sorted((key, [list(entry[0]), entry[1], entry[2]]) for key, entry in self._values.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound) if bound == float("inf") else bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsService:
+    """Application-wide metrics registry with request hooks and a text exposition"""
+
+    def __init__(self, upload_folder: str, temp_folder: str):
+        self.upload_folder = upload_folder
+        self.temp_folder = temp_folder
+        self._disk_checked = 0.0
+        self._disk_lock = threading.Lock()
+
+        self.request_latency = Histogram('http_request_duration_seconds', 'HTTP request latency by route',
+                                         ['method', 'route', 'status'])
+        self.upload_bytes = Histogram('upload_bytes', 'Size of uploaded spec batches in bytes', buckets=SIZE_BUCKETS)
+        self.uploaded_files = Counter('uploaded_files_total', 'Spec files accepted by uploads')
+        self.generation_duration = Histogram('generation_duration_seconds', 'End-to-end mapping generation time')
+        self.generation_stage_seconds = Counter('generation_stage_seconds_total',
+                                                'Time spent in each generation stage (inclusive)', ['stage'])
+        self.specs_generated = Counter('specs_generated_total', 'Specs processed by generation', ['result'])
+        self.mappings_generated = Counter('mappings_generated_total', 'WireMock mappings generated')
+        self.result_cache_lookups = Counter('result_cache_lookups_total',
+                                            'Generation requests looked up in the result cache', ['result'])
+        self.zip_duration = Histogram('zip_build_duration_seconds', 'Time to build a download package')
+        self.zip_bytes = Histogram('zip_bytes', 'Size of download packages in bytes', buckets=SIZE_BUCKETS)
+        self.wiremock_requests = Counter('wiremock_proxy_requests_total', 'Calls to the WireMock admin API', ['endpoint'])
+        self.wiremock_failures = Counter('wiremock_proxy_failures_total', 'Failed calls to the WireMock admin API',
+                                         ['endpoint'])
+        self.sessions_evicted = Counter('sessions_evicted_total', 'Sessions removed by the janitor', ['reason'])
+        self.active_sessions = Gauge('active_sessions', 'Sessions with files on disk')
+        self.disk_bytes = Gauge('disk_bytes', 'Bytes on disk per folder', ['folder'])
+
+        self.metrics = [
+            self.request_latency, self.upload_bytes, self.uploaded_files, self.generation_duration,
+            self.generation_stage_seconds, self.specs_generated, self.mappings_generated, self.result_cache_lookups,
+            self.zip_duration, self.zip_bytes, self.wiremock_requests, self.wiremock_failures, self.sessions_evicted,
+            self.active_sessions, self.disk_bytes
+        ]
+
+    def init_app(self, app: Flask):
+        """Register the request hooks and make the service available as app.extensions['metrics']"""
+        app.extensions['metrics'] = self
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def _before_request(self):
+        g.metrics_started = time.perf_counter()
+
+    def _after_request(self, response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            # Route templates (not raw paths) keep label cardinality bounded
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            self.request_latency.observe(time.perf_counter() - started, method=request.method, route=route,
+                                         status=response.status_code)
+        return response
+
+    def observe_upload(self, total_bytes: int, file_count: int):
+        self.upload_bytes.observe(total_bytes)
+        self.uploaded_files.inc(file_count)
+
+    def observe_generation(self, seconds: float, spec_results: List[Dict[str, Any]],
+                           profile: Optional[Dict[str, Any]] = None):
+        """Record a finished generation run and its per-stage profile"""
+        self.generation_duration.observe(seconds)
+        for spec_result in spec_results:
+            self.specs_generated.inc(result='error' if spec_result.get('error') else 'success')
+            self.mappings_generated.inc(spec_result.get('mappings', 0))
+        for stage, timing in ((profile or {}).get('stages') or {}).items():
+            self.generation_stage_seconds.inc(timing['seconds'], stage=stage)
+
+    def observe_result_cache(self, hit: bool):
+        self.result_cache_lookups.inc(result='hit' if hit else 'miss')
+
+    def observe_zip(self, seconds: float, size: int):
+        self.zip_duration.observe(seconds)
+        self.zip_bytes.observe(size)
+
+    def observe_wiremock_call(self, endpoint: str, success: bool):
+        self.wiremock_requests.inc(endpoint=endpoint)
+        if not success:
+            self.wiremock_failures.inc(endpoint=endpoint)
+
+    def observe_session_eviction(self, reason: str):
+        self.sessions_evicted.inc(reason=reason)
+
+    def _refresh_disk_usage(self):
+        """Update session and disk gauges, at most once per DISK_USAGE_TTL"""
+        with self._disk_lock:
+            now = time.monotonic()
+            if self._disk_checked and now - self._disk_checked < DISK_USAGE_TTL:
+                return
+            self._disk_checked = now
+
+            sessions = set()
+            for folder_name, folder in (('uploads', self.upload_folder), ('temp', self.temp_folder)):
+                total = 0
+                for root, _, files in os.walk(folder):
+                    for name in files:
+                        try:
+                            total += os.path.getsize(os.path.join(root, name))
+                        except OSError:
+                            pass
+                self.disk_bytes.set(total, folder=folder_name)
+
+                try:
+                    entries = os.listdir(folder)
+                except OSError:
+                    entries = []
+                for entry in entries:
+                    try:
+                        uuid.UUID(entry)
+                        sessions.add(entry)
+                    except ValueError:
+                        continue
+
+            self.active_sessions.set(len(sessions))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (0.0.4)"""
+        self._refresh_disk_usage()
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.expose())
+        return '\n'.join(lines) + '\n'
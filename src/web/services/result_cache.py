@@ -0,0 +1,194 @@
+"""Cross-session cache of generation results, addressed by spec content and generation options"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from src.core.output_backend import DiskBackend
+
+# Bump when the layout of a cache entry changes
+CACHE_FORMAT_VERSION = 1
+
+INDEX_FILE = 'index.json'
+RESULT_FILE = 'result.json'
+OUTPUT_DIR = 'output'
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def result_key(spec_files: List[str], options: Dict[str, Any]) -> str:
+    """Cache key of a generation run: spec names and contents plus every option that shapes the output"""
+    specs = sorted((os.path.basename(spec_file), file_digest(spec_file)) for spec_file in spec_files)
+    material = json.dumps({'format': CACHE_FORMAT_VERSION, 'specs': specs, 'options': options}, sort_keys=True)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+def _link_tree(source: str, target: str) -> int:
+    """Hardlink every file below source into target (copying across filesystems); returns bytes linked"""
+    total = 0
+    for root, _, files in os.walk(source):
+        target_root = os.path.join(target, os.path.relpath(root, source))
+        os.makedirs(target_root, exist_ok=True)
+        for name in files:
+            source_path = os.path.join(root, name)
+            target_path = os.path.join(target_root, name)
+            try:
+                os.link(source_path, target_path)
+            except OSError:
+                shutil.copy2(source_path, target_path)
+            total += os.path.getsize(target_path)
+    return total
+
+
+def _write_tree(output: DiskBackend, target: str) -> int:
+    """Write every file of an in-memory output below target; returns bytes written"""
+    total = 0
+    for name in output.files():
+        data = output.read(name)
+        target_path = os.path.join(target, *name.split('/'))
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        with open(target_path, 'wb') as f:
+            f.write(data)
+        total += len(data)
+    return total
+
+
+class ResultCache:
+    """Generated output of earlier sessions, reused by hardlinking it into new session directories.
+
+    Entries live in cache_dir/<key>/ next to an index of their size and last use, so the cache
+    survives restarts. The least recently used entries are evicted once max_bytes is exceeded;
+    sessions that linked an evicted entry keep their files.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max(0, max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = {}
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    @property
+    def size(self) -> int:
+        return sum(entry['bytes'] for entry in self._entries.values())
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def _load_index(self):
+        """Read the persisted index, dropping entries whose files are gone and files no entry owns"""
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            entries = index['entries'] if index.get('version') == CACHE_FORMAT_VERSION else {}
+        except (OSError, ValueError, KeyError, AttributeError):
+            entries = {}
+
+        entries = {key: entry for key, entry in entries.items()
+                   if os.path.isfile(os.path.join(self._entry_dir(key), RESULT_FILE))}
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if os.path.isdir(path) and name not in entries:
+                # Unfinished store or an entry evicted by a process that crashed before saving the index
+                shutil.rmtree(path, ignore_errors=True)
+
+        with self._lock:
+            self._entries = entries
+            self._evict()
+            self._save_index()
+
+    def _save_index(self):
+        # Caller holds the lock
+        index_path = os.path.join(self.cache_dir, INDEX_FILE)
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_FORMAT_VERSION, 'entries': self._entries}, f)
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            print(f"Warning: Could not save result cache index: {e}")
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits (caller holds the lock)"""
+        total = self.size
+        for key in sorted(self._entries, key=lambda key: self._entries[key]['last_used']):
+            if total <= self.max_bytes:
+                break
+            total -= self._entries.pop(key)['bytes']
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+
+    def restore(self, key: str, target_dir: str) -> Optional[Dict[str, Any]]:
+        """Link a cached output into target_dir and return its stored result, or None on a miss"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+            entry_dir = self._entry_dir(key)
+            try:
+                with open(os.path.join(entry_dir, RESULT_FILE), 'r', encoding='utf-8') as f:
+                    result = json.load(f)
+                _link_tree(os.path.join(entry_dir, OUTPUT_DIR), target_dir)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Dropping unreadable result cache entry {key}: {e}")
+                del self._entries[key]
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                self._save_index()
+                self.misses += 1
+                return None
+
+            self._entries[key]['last_used'] = time.time()
+            self._save_index()
+            self.hits += 1
+            return result
+
+    def store(self, key: str, output: DiskBackend, result: Dict[str, Any]):
+        """Keep a freshly generated output and its result under key (files on disk are hardlinked, not copied)"""
+        staging_dir = os.path.join(self.cache_dir, f"{key}.{uuid.uuid4().hex}.tmp")
+        try:
+            if output.on_disk:
+                size = _link_tree(output.root, os.path.join(staging_dir, OUTPUT_DIR))
+            else:
+                size = _write_tree(output, os.path.join(staging_dir, OUTPUT_DIR))
+            if size > self.max_bytes:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                return
+            with open(os.path.join(staging_dir, RESULT_FILE), 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+        except OSError as e:
+            print(f"Warning: Could not cache generation result: {e}")
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            return
+
+        with self._lock:
+            try:
+                os.rename(staging_dir, self._entry_dir(key))
+            except OSError:
+                # Another run stored the same key first
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                return
+            now = time.time()
+            self._entries[key] = {'bytes': size, 'created': now, 'last_used': now}
+            self._evict()
+            self._save_index()
+
+    def discard(self, key: str):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+                self._save_index()
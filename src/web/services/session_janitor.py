@@ -0,0 +1,166 @@
+"""Background eviction of session files by age, per-session size and total disk quota"""
+
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from flask import Flask, request
+
+from src.web.services.file_service import FileService
+
+
+def _tree_size(directory: str) -> int:
+    total = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class SessionJanitor:
+    """Track the size and last access of every session and evict them from a background thread.
+
+    Sizes are measured once per session change (upload, generation) and kept in memory, so a sweep
+    only walks the index. A sweep removes sessions idle for longer than max_age or larger than
+    max_session_bytes, then the least recently used ones until all sessions fit in quota_bytes
+    (0 disables a limit). Sessions with a generation job still running are never evicted.
+    """
+
+    def __init__(self, upload_folder: str, temp_folder: str, max_age: float = 3600.0, quota_bytes: int = 0,
+                 max_session_bytes: int = 0, interval: float = 60.0,
+                 busy_sessions: Optional[Callable[[], set]] = None, archive_cache=None, memory_store=None,
+                 metrics=None):
+        self.file_service = FileService(upload_folder, temp_folder)
+        self.folders = (upload_folder, temp_folder)
+        self.max_age = max_age
+        self.quota_bytes = max(0, quota_bytes)
+        self.max_session_bytes = max(0, max_session_bytes)
+        self.interval = interval
+        self.busy_sessions = busy_sessions
+        self.archive_cache = archive_cache
+        self.memory_store = memory_store
+        self.metrics = metrics
+        # session id -> {'bytes': int, 'last_access': float}
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def init_app(self, app: Flask):
+        """Index existing sessions, follow session requests and start sweeping"""
+        app.extensions['janitor'] = self
+        app.before_request(self._before_request)
+        self.scan()
+        self.start()
+
+    def _before_request(self):
+        session_id = (request.view_args or {}).get('session_id')
+        if session_id:
+            self.touch(session_id)
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(session['bytes'] for session in self._sessions.values())
+
+    def sessions(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {session_id: dict(session) for session_id, session in self._sessions.items()}
+
+    def scan(self):
+        """Build the index from the session directories on disk (once, at startup)"""
+        sessions = {}
+        for folder in self.folders:
+            try:
+                entries = os.listdir(folder)
+            except OSError:
+                continue
+            for entry in entries:
+                path = os.path.join(folder, entry)
+                try:
+                    uuid.UUID(entry)
+                    modified = os.path.getmtime(path)
+                except (ValueError, OSError):
+                    # Not a session (e.g. the spec and result caches)
+                    continue
+                session = sessions.setdefault(entry, {'bytes': 0, 'last_access': 0.0})
+                session['bytes'] += _tree_size(path)
+                session['last_access'] = max(session['last_access'], modified)
+
+        with self._lock:
+            self._sessions = sessions
+
+    def record(self, session_id: str):
+        """Re-measure a session after its files changed and mark it as just used"""
+        size = sum(_tree_size(os.path.join(folder, session_id)) for folder in self.folders)
+        if self.memory_store is not None:
+            output = self.memory_store.get(session_id)
+            size += output.memory_bytes if output is not None else 0
+        with self._lock:
+            self._sessions[session_id] = {'bytes': size, 'last_access': time.time()}
+
+    def touch(self, session_id: str):
+        """Mark a known session as just used"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session['last_access'] = time.time()
+
+    def sweep(self) -> List[str]:
+        """Evict expired, oversized and (over quota) least recently used sessions; returns their ids"""
+        busy = self.busy_sessions() if self.busy_sessions is not None else set()
+        cutoff = time.time() - self.max_age
+        evictions = []
+
+        with self._lock:
+            # Least recently used first
+            candidates = sorted((session_id for session_id in self._sessions if session_id not in busy),
+                                key=lambda session_id: self._sessions[session_id]['last_access'])
+            total = sum(session['bytes'] for session in self._sessions.values())
+            for session_id in candidates:
+                session = self._sessions[session_id]
+                if session['last_access'] < cutoff:
+                    reason = 'expired'
+                elif self.max_session_bytes and session['bytes'] > self.max_session_bytes:
+                    reason = 'oversized'
+                elif self.quota_bytes and total > self.quota_bytes:
+                    reason = 'quota'
+                else:
+                    continue
+                total -= session['bytes']
+                del self._sessions[session_id]
+                evictions.append((session_id, reason))
+
+        for session_id, reason in evictions:
+            self.file_service.cleanup_session_files(session_id)
+            if self.archive_cache is not None:
+                self.archive_cache.discard(session_id)
+            if self.memory_store is not None:
+                self.memory_store.discard(session_id)
+            if self.metrics is not None:
+                self.metrics.observe_session_eviction(reason)
+            print(f"Cleaned up session {session_id} ({reason})")
+        return [session_id for session_id, _ in evictions]
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='session-janitor', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Warning: Session cleanup failed: {e}")
@@ -0,0 +1,88 @@
+"""Cached WireMock status for the web UI, over one pooled admin client guarded by a circuit breaker"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from src.core.wiremock_admin import CircuitBreaker, WireMockAdminClient, WireMockAdminError
+
+
+class WireMockStatusService:
+    """Health and counts of the configured WireMock server, cached for ttl seconds.
+
+    Status polls share one keep-alive connection pool, use a short timeout and no retries, and
+    stop reaching out altogether while the circuit breaker is open, so a stopped WireMock costs
+    request threads nothing.
+    """
+
+    def __init__(self, base_url: str, ttl: float = 2.0, timeout: float = 2.0, failure_threshold: int = 3,
+                 reset_timeout: float = 30.0, metrics=None):
+        self.ttl = ttl
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.client = WireMockAdminClient(base_url, timeout=timeout, pool_size=4, retries=0, breaker=self.breaker)
+        self.metrics = metrics
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return self.client.base_url
+
+    def _cached(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """fetch() result for key, reused for ttl seconds; one caller refreshes while others wait"""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                return entry[1]
+            value = fetch()
+            self._cache[key] = (time.monotonic(), value)
+            return value
+
+    def _call(self, endpoint: str, call: Callable[[], Any]) -> Any:
+        """Result of an admin call, or the error message; circuit-open skips aren't counted as calls"""
+        circuit_open = self.breaker.state == CircuitBreaker.OPEN
+        try:
+            result = call()
+        except (WireMockAdminError, ValueError) as e:
+            if self.metrics is not None and not circuit_open:
+                self.metrics.observe_wiremock_call(endpoint, False)
+            return e if isinstance(e, WireMockAdminError) else WireMockAdminError(str(e))
+        if self.metrics is not None:
+            self.metrics.observe_wiremock_call(endpoint, True)
+        return result
+
+    def _fetch_health(self) -> str:
+        result = self._call('health', self.client.health_status)
+        if isinstance(result, WireMockAdminError):
+            # Answered with a gateway error (e.g. a proxy in front of it) or not at all
+            return 'error' if result.status_code else 'stopped'
+        return 'running' if result == 200 else 'error'
+
+    def status(self) -> str:
+        """'running', 'error' (answered with a failure) or 'stopped' (unreachable)"""
+        return self._cached('health', self._fetch_health)
+
+    def mappings_count(self) -> Optional[int]:
+        """Registered stub mappings, or None if WireMock couldn't be asked"""
+        result = self._cached('mappings', lambda: self._call('mappings', self.client.count_mappings))
+        return None if isinstance(result, WireMockAdminError) else result
+
+    def requests_count(self) -> Optional[int]:
+        """Requests in WireMock's journal, or None if WireMock couldn't be asked"""
+        result = self._cached('requests', lambda: self._call('requests', self.client.count_requests))
+        return None if isinstance(result, WireMockAdminError) else result
+
+    def stats(self) -> Dict[str, Any]:
+        """Status and both counts in one response; counts are skipped while WireMock is down"""
+        status = self.status()
+        running = status == 'running'
+        return {
+            'url': self.base_url,
+            'status': status,
+            'mappings': self.mappings_count() if running else None,
+            'requests': self.requests_count() if running else None,
+            'circuit': self.breaker.state
+        }
+
+    def close(self):
+        self.client.close()
@@ -281,7 +281,9 @@ async function uploadAndGenerate() {
         throw new Error(error.error || 'Generation failed');
     }
     
-    const generateResult = await generateResponse.json();
+    // Generation runs as a background job; follow its progress until it finishes
+    const job = await generateResponse.json();
+    const generateResult = await waitForGenerationJob(job);
     
     // Upload mappings to WireMock server
     updateProgress(75, 'Uploading mappings to WireMock...');
@@ -307,6 +309,105 @@ async function uploadAndGenerate() {
     }, 1000);
 }
 
+// Job currently followed by the progress modal (for cancellation)
+let currentJobId = null;
+
+function describeJobProgress(state) {
+    const progress = state.progress;
+    if (state.stage === 'java') {
+        return 'Generating Java code...';
+    }
+    if (state.stage === 'cached') {
+        return 'Reusing mappings generated for the same specs...';
+    }
+    const running = state.specs.find(spec => spec.status === 'running');
+    const counts = progress.specs_total ? ` (${progress.specs_done}/${progress.specs_total} specs, ${progress.mappings} mappings)` : '';
+    return running ? `Generating ${running.api_name}${counts}...` : `Generating mappings${counts}...`;
+}
+
+function jobResult(state) {
+    if (state.status === 'completed') {
+        return state.result;
+    }
+    if (state.status === 'cancelled') {
+        throw new Error('Generation cancelled');
+    }
+    throw new Error(state.error || 'Generation failed');
+}
+
+// Follow a generation job over Server-Sent Events, falling back to polling its status
+function waitForGenerationJob(job) {
+    currentJobId = job.job_id;
+    document.getElementById('cancelGenerationButton').classList.remove('hidden');
+    
+    const onState = state => {
+        // Generation covers 50-75% of the overall progress bar
+        updateProgress(50 + Math.round((state.progress.percent || 0) / 4), describeJobProgress(state));
+    };
+    const finish = () => {
+        currentJobId = null;
+        document.getElementById('cancelGenerationButton').classList.add('hidden');
+    };
+    
+    return new Promise((resolve, reject) => {
+        const settle = state => {
+            finish();
+            try {
+                resolve(jobResult(state));
+            } catch (error) {
+                reject(error);
+            }
+        };
+        
+        const poll = async () => {
+            try {
+                const response = await fetch(job.status_url);
+                const state = await response.json();
+                if (!response.ok) {
+                    throw new Error(state.error || 'Could not read generation status');
+                }
+                onState(state);
+                if (['completed', 'failed', 'cancelled'].includes(state.status)) {
+                    settle(state);
+                } else {
+                    setTimeout(poll, 1000);
+                }
+            } catch (error) {
+                finish();
+                reject(error);
+            }
+        };
+        
+        if (!window.EventSource) {
+            poll();
+            return;
+        }
+        
+        const events = new EventSource(job.events_url);
+        events.addEventListener('progress', event => onState(JSON.parse(event.data)));
+        events.addEventListener('done', event => {
+            events.close();
+            const state = JSON.parse(event.data);
+            onState(state);
+            settle(state);
+        });
+        events.onerror = () => {
+            // Stream dropped (e.g. by a proxy): continue by polling
+            events.close();
+            poll();
+        };
+    });
+}
+
+async function cancelGeneration() {
+    if (!currentJobId) {
+        return;
+    }
+    updateProgress(parseInt(progressBar.style.width) || 50, 'Cancelling...');
+    await fetch(`/api/jobs/${currentJobId}`, { method: 'DELETE' });
+}
+window.cancelGeneration = cancelGeneration;
+
 function showProgressModal() {
     progressModal.classList.remove('hidden');
 }
@@ -401,75 +502,26 @@ window.uploadMappingsToWireMock = uploadMappingsToWireMock;
 
 // Function to upload generated mappings to WireMock server
 async function uploadMappingsToWireMock(sessionId) {
-    const wiremockUrl = 'http://localhost:8080';
-    
     try {
+        // The backend pushes response files and mappings in bulk over pooled connections
+        const pushResponse = await fetch(`/api/wiremock/push/${sessionId}`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({})
+        });
         
-        // First, get the generated mappings from our Flask backend
-        const mappingsResponse = await fetch(`/api/mappings/${sessionId}`);
-        
-        if (!mappingsResponse.ok) {
-            const errorText = await mappingsResponse.text();
-            console.error(`❌ Failed to get mappings: ${mappingsResponse.status} - ${errorText}`);
-            throw new Error(`Failed to get generated mappings: ${errorText}`);
-        }
-        
-        const mappingsData = await mappingsResponse.json();
-        
-        if (!mappingsData.mappings || mappingsData.mappings.length === 0) {
-            console.warn('⚠️ No mappings found to upload - this might be why WireMock shows 0 mappings');
-            // Continue with response files if they exist
-        } else {
-            // Upload each mapping to WireMock
-            let uploadedCount = 0;
-            let failedCount = 0;
-            
-            for (const [index, mapping] of mappingsData.mappings.entries()) {
-                try {
-                    
-                    const uploadResponse = await fetch(`${wiremockUrl}/__admin/mappings`, {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json'
-                        },
-                        body: JSON.stringify({
-                            ...mapping,
-                            response: {
-                                ...mapping.response,
-                                headers: {
-                                    ...mapping.response.headers,
-                                    "Access-Control-Allow-Origin": "*",
-                                    "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
-                                    "Access-Control-Allow-Headers": "Content-Type, Authorization, Accept"
-                                }
-                            }
-                        })
-                    });
-                    
-                    if (uploadResponse.ok) {
-                        uploadedCount++;
-                        const result = await uploadResponse.json();
-                    } else {
-                        failedCount++;
-                        const errorText = await uploadResponse.text();
-                        console.warn(`⚠️ Failed to upload mapping: ${mapping.request.method} ${mapping.request.url || mapping.request.urlPattern}`);
-                        console.warn(`   Error: ${uploadResponse.status} - ${errorText}`);
-                    }
-                } catch (error) {
-                    failedCount++;
-                    console.warn(`⚠️ Error uploading mapping ${index + 1}: ${error.message}`);
-                }
-            }
-            
-        }
+        const result = await pushResponse.json();
         
-        // Also upload response files if they exist
-        if (mappingsData.responseFiles && Object.keys(mappingsData.responseFiles).length > 0) {
-            await uploadResponseFiles(wiremockUrl, mappingsData.responseFiles);
-        } else {
+        if (!pushResponse.ok) {
+            (result.failures || []).forEach(failure => {
+                console.warn(`⚠️ Failed to upload ${failure.item}: ${failure.error}`);
+            });
+            throw new Error(result.error || `Pushed ${result.mappings_imported} of ${result.mappings} mappings`);
         }
         
-        return mappingsData.mappings?.length || 0;
+        return result.mappings_imported;
         
     } catch (error) {
         console.error('❌ Failed to upload mappings to WireMock:', error);
@@ -477,28 +529,6 @@ async function uploadMappingsToWireMock(sessionId) {
     }
 }
 
-// Helper function to upload response files
-async function uploadResponseFiles(wiremockUrl, responseFiles) {
-    
-    for (const [fileName, content] of Object.entries(responseFiles)) {
-        try {
-            const uploadResponse = await fetch(`${wiremockUrl}/__admin/files/${fileName}`, {
-                method: 'PUT',
-                headers: {
-                    'Content-Type': 'application/json'
-                },
-                body: content
-            });
-            
-            if (uploadResponse.ok) {
-            } else {
-                console.warn(`⚠️ Failed to upload response file: ${fileName}`);
-            }
-        } catch (error) {
-            console.warn(`⚠️ Error uploading response file ${fileName}: ${error.message}`);
-        }
-    }
-}
 window.showAllMappings = showAllMappings;
 
 // Tab management
@@ -692,7 +722,7 @@ function groupMappingsBySpec(mappings) {
 
 function createRealMappingCard(mapping) {
     const method = mapping.request.method || 'GET';
-    const url = mapping.request.url || mapping.request.urlPattern || '/';
+    const url = mapping.request.url || mapping.request.urlPath || mapping.request.urlPathTemplate || mapping.request.urlPathPattern || mapping.request.urlPattern || '/';
     const status = mapping.response.status || 200;
     const id = mapping.id || 'unknown';
     
@@ -935,7 +965,7 @@ async function populateTestEndpoints(summary) {
                     // Get unique endpoints to avoid duplicates
                     const uniqueEndpoints = [...new Map(apiMappings.map(mapping => {
                         const method = mapping.request.method || 'GET';
-                        const url = mapping.request.url || mapping.request.urlPattern || '/';
+                        const url = mapping.request.url || mapping.request.urlPath || mapping.request.urlPathTemplate || mapping.request.urlPathPattern || mapping.request.urlPattern || '/';
                         return [`${method}_${url}`, { method, url }];
                     })).values()];
                     
@@ -0,0 +1,176 @@
+"""Watch mode against a local fake WireMock admin server"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.multi_spec_wiremock_generator import MultiSpecWireMockGenerator
+from src.core.spec_watcher import SpecWatcher
+from src.core.wiremock_admin import WireMockAdminClient
+
+EXAMPLE_SPEC = project_root / 'examples' / 'users-api.yaml'
+
+
+class FakeAdminHandler(BaseHTTPRequestHandler):
+    """The admin endpoints the watcher uses, answering 503 to everything while the server is down"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+    def _send(self, status: int, payload=None):
+        data = json.dumps(payload or {}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method: str):
+        body = self._body()
+        server = self.server
+        if server.down:
+            return self._send(503)
+        path = self.path[len('/__admin'):]
+        if method == 'GET' and path == '/health':
+            return self._send(200, {'status': 'healthy'})
+        if method == 'GET' and path == '/mappings':
+            return self._send(200, {'mappings': list(server.mappings.values())})
+        if method == 'POST' and path == '/mappings/import':
+            for mapping in json.loads(body)['mappings']:
+                server.mappings[mapping['id']] = mapping
+            return self._send(200)
+        if method == 'POST' and path == '/mappings':
+            mapping = json.loads(body)
+            server.mappings[mapping['id']] = mapping
+            return self._send(201, mapping)
+        if path.startswith('/mappings/'):
+            mapping_id = path[len('/mappings/'):]
+            if method == 'PUT':
+                if mapping_id not in server.mappings:
+                    return self._send(404)
+                server.mappings[mapping_id] = json.loads(body)
+                return self._send(200)
+            if method == 'DELETE':
+                return self._send(200 if server.mappings.pop(mapping_id, None) else 404)
+        if path.startswith('/files/'):
+            name = path[len('/files/'):]
+            if method == 'PUT':
+                server.files[name] = body
+                return self._send(200)
+            if method == 'DELETE':
+                return self._send(200 if server.files.pop(name, None) is not None else 404)
+        self._send(404)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+@pytest.fixture
+def admin_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeAdminHandler)
+    server.down = False
+    server.mappings = {}
+    server.files = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def watcher(tmp_path, admin_server):
+    spec_dir = tmp_path / 'specs'
+    spec_dir.mkdir()
+    shutil.copy(EXAMPLE_SPEC, spec_dir / 'users-api.yaml')
+    generator = MultiSpecWireMockGenerator(str(spec_dir), str(tmp_path / 'output'), deterministic=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = generator.generate_all_mappings()
+    client = WireMockAdminClient(f"http://127.0.0.1:{admin_server.server_address[1]}", retries=0)
+    watcher = SpecWatcher(generator, client, debounce=0.01)
+    watcher.summary = summary
+    yield watcher
+    generator.writer.close()
+    client.close()
+
+
+def local_mappings(watcher: SpecWatcher):
+    return {mapping_id: mapping for spec in watcher.state.values() for mapping_id, mapping in spec['mappings'].items()}
+
+
+def edit_spec(watcher: SpecWatcher, old: str, new: str):
+    spec_file = os.path.join(watcher.generator.spec_dir, 'users-api.yaml')
+    with open(spec_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    assert old in content
+    # Make sure the edit is seen even on filesystems with coarse timestamps
+    time.sleep(0.01)
+    with open(spec_file, 'w', encoding='utf-8') as f:
+        f.write(content.replace(old, new, 1))
+
+
+def test_failed_push_is_retried_on_next_poll(watcher, admin_server):
+    with contextlib.redirect_stdout(io.StringIO()):
+        watcher.start(watcher.summary)
+    assert admin_server.mappings == local_mappings(watcher)
+    before = dict(admin_server.mappings)
+
+    admin_server.down = True
+    edit_spec(watcher, '/users:', '/members:')
+    with contextlib.redirect_stdout(io.StringIO()):
+        diffs = watcher.poll()
+    assert len(diffs) == 1
+    assert diffs[0]['added'] and diffs[0]['removed']
+    assert not diffs[0]['pushed'] and diffs[0]['push_error']
+    assert admin_server.mappings == before
+
+    # No further spec change: the pending diff alone is pushed once WireMock answers again
+    admin_server.down = False
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert watcher.poll() == []
+    assert admin_server.mappings == local_mappings(watcher)
+    assert not watcher.unpushed
+
+
+def test_failed_initial_sync_is_repeated(watcher, admin_server):
+    admin_server.down = True
+    with contextlib.redirect_stdout(io.StringIO()):
+        watcher.start(watcher.summary)
+    assert watcher.needs_sync and not admin_server.mappings
+
+    edit_spec(watcher, '/users:', '/members:')
+    with contextlib.redirect_stdout(io.StringIO()):
+        diffs = watcher.poll()
+    assert not diffs[0]['pushed']
+
+    admin_server.down = False
+    with contextlib.redirect_stdout(io.StringIO()):
+        watcher.poll()
+    assert not watcher.needs_sync
+    assert admin_server.mappings == local_mappings(watcher)